@@ -0,0 +1,92 @@
+import time
+import numpy as np
+
+"""
+Time-sliced enemy AI.
+
+Ship decisions ("thinking") are separate from movement. Each fixed
+simulation step the ThinkScheduler lets the most overdue ships think, in
+order, up to a fixed number of decisions; the rest wait for a later step.
+Capping decisions rather than wall-clock time keeps the simulation the same
+on any machine; the trade-off is that THINKS_PER_STEP alone bounds the cost
+of AI per step (the time spent thinking is only measured, for the debug
+overlay, and never cuts a step short). All ships thinking in a step share one
+Perception snapshot, which holds the distance from every ship to the player
+worked out once by the fleet.
+Weapons fired while thinking are collected as fire requests and handed to
+the combat manager in one batch.
+"""
+
+# Most ship decisions made per simulation step
+THINKS_PER_STEP = 8
+
+# Seconds between decisions for each ship
+THINK_INTERVAL = 0.1
+
+class Perception:
+    """What the ships in a system know during one think tick"""
+    def __init__(self, fleet, player, fire_requests):
+        self.fleet = fleet
+        self.player = player
+        self.player_distance = fleet.player_distance
+        self.fire_requests = fire_requests  # (ship, weapon) pairs fired this tick
+    
+    def distance_to_player(self, ship):
+        """Distance from a ship to the player (infinite without a player)"""
+        return float(self.player_distance[ship.index])
+    
+    def request_fire(self, ship, weapon):
+        """Queue a weapon to be fired by the combat manager after the tick"""
+        self.fire_requests.append((ship, weapon))
+
+class ThinkScheduler:
+    """Spreads ship decisions across simulation steps, a fixed number per step"""
+    def __init__(self, fleet, max_thinks=THINKS_PER_STEP, interval=THINK_INTERVAL):
+        self.fleet = fleet
+        self.max_thinks = max_thinks
+        self.interval = interval
+        
+        # Weapons fired during the last tick, as (ship, weapon) pairs
+        self.fire_requests = []
+        
+        # Per-step counters
+        self.stats = {'thinks': 0, 'waiting': 0, 'think_ms': 0.0}
+    
+    def update(self, delta_time, player=None):
+        """Let the most overdue ships think, up to the step's number of decisions"""
+        fleet = self.fleet
+        n = fleet.count
+        
+        # Requests from the previous tick have been handled (or were left behind in this system)
+        self.fire_requests.clear()
+        
+        if n == 0:
+            self.stats = {'thinks': 0, 'waiting': 0, 'think_ms': 0.0}
+            return
+        
+        think_elapsed = fleet.think_elapsed[:n]
+        think_elapsed += delta_time
+        
+        # Most overdue ships go first
+        due = np.nonzero(think_elapsed >= self.interval)[0]
+        order = due[np.argsort(-think_elapsed[due], kind='stable')]
+        
+        # Time is only measured for the debug overlay, it never decides who thinks
+        start = time.perf_counter()
+        perception = Perception(fleet, player, self.fire_requests)
+        
+        thinks = 0
+        ships = fleet.ships
+        attacking = fleet.attacking
+        for i in order[:self.max_thinks].tolist():
+            ship = ships[i]
+            ship.think(float(think_elapsed[i]), player, perception)
+            attacking[i] = ship.state == "ATTACK"
+            think_elapsed[i] = 0
+            thinks += 1
+        
+        self.stats = {
+            'thinks': thinks,
+            'waiting': len(order) - thinks,
+            'think_ms': (time.perf_counter() - start) * 1000
+        }
@@ -0,0 +1,50 @@
+import math
+
+"""
+Precomputed looping animations.
+
+Effects that repeat identically (gate pulses, mine cores, etc.) are rendered
+once into a strip of frames and shared by every object that shows them.
+At draw time the current frame is picked from the object's timer, so no
+per-frame surface copies or draw calls are needed.
+"""
+
+# Shared animations by key
+_animations = {}
+
+class LoopingAnimation:
+    """A looping animation stored as a strip of precomputed frames"""
+    def __init__(self, frames, period):
+        self.frames = frames
+        self.period = period  # Seconds per loop
+        self.frame_count = len(frames)
+
+    def frame_index(self, time):
+        """Get the index of the frame shown at the given time"""
+        phase = (time % self.period) / self.period
+        return int(phase * self.frame_count) % self.frame_count
+
+    def frame_at(self, time):
+        """Get the frame shown at the given time"""
+        return self.frames[self.frame_index(time)]
+
+def build_animation(frame_count, period, draw_frame):
+    """Render a looping animation
+
+    draw_frame is called with the loop phase (0 to 1) of each frame and
+    must return that frame's surface.
+    """
+    frames = [draw_frame(i / frame_count) for i in range(frame_count)]
+    return LoopingAnimation(frames, period)
+
+def get_animation(key, frame_count, period, draw_frame):
+    """Get a shared animation, building it the first time it is requested"""
+    animation = _animations.get(key)
+    if animation is None:
+        animation = build_animation(frame_count, period, draw_frame)
+        _animations[key] = animation
+    return animation
+
+def pulse(phase):
+    """Pulse intensity (0 to 1) at a loop phase, matching abs(sin) pulsing"""
+    return abs(math.sin(phase * math.pi))
@@ -0,0 +1,279 @@
+import pygame
+import math
+import random
+import numpy as np
+import sprites
+from renderer import LAYER_ASTEROIDS
+
+"""
+Struct-of-arrays asteroid field.
+
+All asteroids in a system live in one AsteroidField that keeps positions,
+velocities, rotations, sizes and types in NumPy arrays. The whole field is
+updated with a handful of vectorized operations and drawn through sprites
+shared by every asteroid with the same look, so systems can hold belts of
+thousands of asteroids. Individual asteroids are still addressable by index.
+"""
+
+# Asteroid types and their colors (indexed by type code)
+ASTEROID_TYPES = ["Iron", "Ice", "Carbon", "Precious"]
+ASTEROID_COLORS = [
+    (150, 100, 50),   # Iron
+    (200, 200, 255),  # Ice
+    (50, 50, 50),     # Carbon
+    (212, 175, 55)    # Precious (gold-ish)
+]
+
+# Number of pre-generated shape variants for each (type, size)
+SHAPE_VARIANTS = 8
+
+# Number of cached rotation angles per shape
+ROTATION_STEPS = 36
+
+# System bounds asteroids wrap around (crude method, would use better in full implementation)
+WRAP_MIN = -500
+WRAP_MAX = 1500
+
+def draw_shape_sprite(type_code, size, variant):
+    """Draw the unrotated sprite for one asteroid shape variant"""
+    # Seed from the look so every variant is drawn the same way each time
+    rng = random.Random(hash((type_code, size, variant)))
+    color = ASTEROID_COLORS[type_code]
+    
+    # Create asteroid shape (irregular polygon)
+    points = []
+    num_points = rng.randint(6, 10)
+    for i in range(num_points):
+        angle = i * 2 * math.pi / num_points
+        # Random distance from center
+        dist = size * rng.uniform(0.7, 1.3)
+        points.append((math.cos(angle) * dist, math.sin(angle) * dist))
+    
+    # Create surface
+    surface = pygame.Surface((size * 3, size * 3), pygame.SRCALPHA)
+    
+    # Convert points to surface coordinates
+    surface_points = [(size * 3 // 2 + pt[0], size * 3 // 2 + pt[1]) for pt in points]
+    
+    # Draw asteroid
+    pygame.draw.polygon(surface, color, surface_points)
+    
+    # Add some craters or details
+    for _ in range(rng.randint(2, 5)):
+        crater_x = rng.randint(size * 3 // 4, size * 9 // 4)
+        crater_y = rng.randint(size * 3 // 4, size * 9 // 4)
+        crater_size = rng.randint(size // 6, size // 3)
+        
+        # Slightly darker color for craters
+        crater_color = (
+            max(0, color[0] - 30),
+            max(0, color[1] - 30),
+            max(0, color[2] - 30)
+        )
+        
+        pygame.draw.circle(surface, crater_color, (crater_x, crater_y), crater_size)
+    
+    return surface
+
+def get_asteroid_sprite(type_code, size, variant, rotation_step):
+    """Get the shared sprite for an asteroid look at a quantized rotation"""
+    return sprites.get_rotated_step(("Asteroid", type_code, size, variant), rotation_step, ROTATION_STEPS,
+                                    draw_shape_sprite, type_code, size, variant)
+
+class Asteroid:
+    """Handle to one asteroid in a field, addressed by index"""
+    __slots__ = ('field', 'index')
+    
+    entity_type = "Asteroid"
+    
+    def __init__(self, field, index):
+        self.field = field
+        self.index = index
+    
+    @property
+    def x(self):
+        return float(self.field.x[self.index])
+    
+    @property
+    def y(self):
+        return float(self.field.y[self.index])
+    
+    @property
+    def size(self):
+        return int(self.field.size[self.index])
+    
+    @property
+    def rotation(self):
+        return float(self.field.rotation[self.index])
+    
+    @property
+    def asteroid_type(self):
+        return ASTEROID_TYPES[self.field.type_code[self.index]]
+    
+    @property
+    def color(self):
+        return ASTEROID_COLORS[self.field.type_code[self.index]]
+
+class AsteroidField:
+    """Struct-of-arrays store for all asteroids in a system"""
+    def __init__(self, capacity=64):
+        self.count = 0
+        self.allocate(capacity)
+    
+    def allocate(self, capacity):
+        """Create (or grow) the backing arrays, keeping existing asteroids"""
+        old = getattr(self, 'x', None)
+        fields = {
+            'x': np.float64, 'y': np.float64,
+            'vx': np.float64, 'vy': np.float64,
+            'rotation': np.float64, 'rotation_speed': np.float64,
+            'prev_x': np.float64, 'prev_y': np.float64, 'prev_rotation': np.float64,
+            'size': np.int32, 'type_code': np.int8, 'variant': np.int16
+        }
+        for name, dtype in fields.items():
+            array = np.zeros(capacity, dtype=dtype)
+            if old is not None:
+                array[:self.count] = getattr(self, name)[:self.count]
+            setattr(self, name, array)
+        self.capacity = capacity
+    
+    def __len__(self):
+        return self.count
+    
+    def __getitem__(self, index):
+        """Get a handle to the asteroid at an index"""
+        if not 0 <= index < self.count:
+            raise IndexError("asteroid index out of range")
+        return Asteroid(self, index)
+    
+    def add_many(self, xs, ys, sizes, rotations, type_codes, rng=None):
+        """Add several asteroids at once and return their indices"""
+        if rng is None:
+            rng = np.random.default_rng(random.getrandbits(32))
+        
+        n = len(xs)
+        start = self.count
+        end = start + n
+        
+        # Grow the arrays if needed
+        if end > self.capacity:
+            self.allocate(max(end, self.capacity * 2))
+        
+        self.x[start:end] = xs
+        self.y[start:end] = ys
+        self.size[start:end] = sizes
+        self.rotation[start:end] = rotations
+        self.type_code[start:end] = type_codes
+        self.prev_x[start:end] = xs
+        self.prev_y[start:end] = ys
+        self.prev_rotation[start:end] = rotations
+        
+        # Random drift, spin and look
+        self.rotation_speed[start:end] = rng.uniform(-0.5, 0.5, n)
+        self.vx[start:end] = rng.uniform(-5, 5, n)
+        self.vy[start:end] = rng.uniform(-5, 5, n)
+        self.variant[start:end] = rng.integers(0, SHAPE_VARIANTS, n)
+        
+        self.count = end
+        return np.arange(start, end)
+    
+    def add(self, x, y, size, rotation, asteroid_type):
+        """Add a single asteroid and return its index"""
+        type_code = ASTEROID_TYPES.index(asteroid_type)
+        return int(self.add_many([x], [y], [size], [rotation], [type_code])[0])
+    
+    def remove(self, index):
+        """Remove an asteroid (the last asteroid takes over its index)"""
+        last = self.count - 1
+        if index != last:
+            for name in ('x', 'y', 'vx', 'vy', 'rotation', 'rotation_speed',
+                         'prev_x', 'prev_y', 'prev_rotation', 'size', 'type_code', 'variant'):
+                array = getattr(self, name)
+                array[index] = array[last]
+        self.count = last
+    
+    def update(self, delta_time):
+        """Update every asteroid in the field"""
+        n = self.count
+        if n == 0:
+            return
+        
+        # Where each asteroid starts this step, to draw it between steps
+        self.prev_x[:n] = self.x[:n]
+        self.prev_y[:n] = self.y[:n]
+        self.prev_rotation[:n] = self.rotation[:n]
+        
+        # Rotate, keeping rotation within 0 to 2π
+        rotation = self.rotation[:n]
+        rotation += self.rotation_speed[:n] * delta_time
+        np.mod(rotation, 2 * math.pi, out=rotation)
+        
+        # Move
+        x = self.x[:n]
+        y = self.y[:n]
+        x += self.vx[:n] * delta_time
+        y += self.vy[:n] * delta_time
+        
+        # Wrap around edges of system
+        wrapped = (x < WRAP_MIN) | (x > WRAP_MAX) | (y < WRAP_MIN) | (y > WRAP_MAX)
+        x[x < WRAP_MIN] = WRAP_MAX
+        x[x > WRAP_MAX] = WRAP_MIN
+        y[y < WRAP_MIN] = WRAP_MAX
+        y[y > WRAP_MAX] = WRAP_MIN
+        
+        # Wrapped asteroids are drawn on their new side straight away, not swept across the system
+        self.prev_x[:n][wrapped] = x[wrapped]
+        self.prev_y[:n][wrapped] = y[wrapped]
+    
+    def query_rect(self, left, top, right, bottom):
+        """Get indices of asteroids whose center lies inside a rectangle"""
+        n = self.count
+        x = self.x[:n]
+        y = self.y[:n]
+        mask = (x >= left) & (x <= right) & (y >= top) & (y <= bottom)
+        return np.nonzero(mask)[0]
+    
+    def query_radius(self, x, y, radius):
+        """Get indices of asteroids whose center lies within a radius of a point"""
+        n = self.count
+        dx = self.x[:n] - x
+        dy = self.y[:n] - y
+        return np.nonzero(dx * dx + dy * dy <= radius * radius)[0]
+    
+    def render(self, render_queue, player_x, player_y, alpha=1.0):
+        """Submit visible asteroids to the render queue using shared sprites
+        
+        Asteroids are drawn a fraction alpha of the way through their last step.
+        """
+        half_width = render_queue.get_width() // 2
+        half_height = render_queue.get_height() // 2
+        
+        # Asteroids on screen (with some margin)
+        visible = self.query_rect(player_x - half_width - 100, player_y - half_height - 100,
+                                  player_x + half_width + 100, player_y + half_height + 100)
+        if len(visible) == 0:
+            return
+        
+        # Screen positions and quantized rotations for the visible asteroids
+        prev_x = self.prev_x[visible]
+        prev_y = self.prev_y[visible]
+        screen_x = (half_width + (prev_x + (self.x[visible] - prev_x) * alpha - player_x)).astype(np.int32)
+        screen_y = (half_height + (prev_y + (self.y[visible] - prev_y) * alpha - player_y)).astype(np.int32)
+        
+        # Spin turns the short way round, across 0 if need be
+        prev_rotation = self.prev_rotation[visible]
+        turn = np.mod(self.rotation[visible] - prev_rotation + math.pi, 2 * math.pi) - math.pi
+        rotation = prev_rotation + turn * alpha
+        
+        # Asteroids turn clockwise on screen, so the cached counterclockwise step is negated
+        steps = np.rint(-rotation * (ROTATION_STEPS / (2 * math.pi))).astype(np.int32) % ROTATION_STEPS
+        
+        blits = []
+        for type_code, size, variant, step, sx, sy in zip(
+                self.type_code[visible].tolist(), self.size[visible].tolist(),
+                self.variant[visible].tolist(), steps.tolist(),
+                screen_x.tolist(), screen_y.tolist()):
+            sprite = get_asteroid_sprite(type_code, size, variant, step)
+            blits.append((sprite, (sx - sprite.get_width() // 2, sy - sprite.get_height() // 2)))
+        
+        render_queue.submit_many(LAYER_ASTEROIDS, blits)
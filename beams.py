@@ -0,0 +1,87 @@
+import pygame
+import numpy as np
+from renderer import LAYER_PROJECTILES
+
+"""
+Hitscan beam visuals.
+
+Beam weapons hit instantly (see CombatManager.fire_beams), so all that is
+left of a shot afterwards is a short-lived line from the muzzle to the point
+of impact. The lines are kept in a small fixed pool of arrays and fade out.
+"""
+
+# Longest distance a beam reaches (a laser bolt travels the same in its lifetime)
+BEAM_RANGE = 600
+
+# Seconds a beam stays visible
+BEAM_LIFETIME = 0.1
+
+# Beam appearance
+BEAM_COLOR = (255, 60, 60)
+BEAM_WIDTH = 2
+
+# Most beams visible at once
+BEAM_CAPACITY = 64
+
+# Per-beam arrays
+BEAM_FIELDS = ('x0', 'y0', 'x1', 'y1', 'lifetime')
+
+def draw_beam(screen, start, end, fade):
+    """Draw one beam, dimmed by fade (1 when fresh)"""
+    color = tuple(int(channel * fade) for channel in BEAM_COLOR)
+    pygame.draw.line(screen, color, start, end, BEAM_WIDTH)
+    
+    # Bright core
+    pygame.draw.line(screen, (int(255 * fade),) * 3, start, end, 1)
+
+class BeamEffects:
+    """Fixed pool of fading beam lines"""
+    def __init__(self, capacity=BEAM_CAPACITY):
+        self.capacity = capacity
+        self.count = 0
+        for name in BEAM_FIELDS:
+            setattr(self, name, np.zeros(capacity))
+    
+    def __len__(self):
+        return self.count
+    
+    def add(self, x0, y0, x1, y1):
+        """Show a batch of beams from matching arrays (extra beams are not shown)"""
+        count = min(len(x0), self.capacity - self.count)
+        if count <= 0:
+            return
+        
+        start = self.count
+        end = start + count
+        self.x0[start:end] = x0[:count]
+        self.y0[start:end] = y0[:count]
+        self.x1[start:end] = x1[:count]
+        self.y1[start:end] = y1[:count]
+        self.lifetime[start:end] = BEAM_LIFETIME
+        self.count = end
+    
+    def update(self, delta_time):
+        """Fade beams and drop the ones that are gone"""
+        n = self.count
+        if n == 0:
+            return
+        
+        lifetime = self.lifetime[:n]
+        lifetime -= delta_time
+        keep = np.nonzero(lifetime > 0)[0]
+        if len(keep) == n:
+            return
+        for name in BEAM_FIELDS:
+            array = getattr(self, name)
+            array[:len(keep)] = array[keep]
+        self.count = len(keep)
+    
+    def render(self, render_queue, player_x, player_y):
+        """Submit every beam to the render queue relative to player position"""
+        offset_x = render_queue.get_width() // 2 - player_x
+        offset_y = render_queue.get_height() // 2 - player_y
+        for i in range(self.count):
+            render_queue.submit_draw(LAYER_PROJECTILES, draw_beam,
+                                     (self.x0[i] + offset_x, self.y0[i] + offset_y),
+                                     (self.x1[i] + offset_x, self.y1[i] + offset_y),
+                                     self.lifetime[i] / BEAM_LIFETIME)
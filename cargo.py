@@ -0,0 +1,101 @@
+"""
+Cargo holds.
+
+A hold keeps its goods indexed by commodity id (the commodity's name) and
+keeps a running total of the units it holds, so asking how full it is never
+walks the goods. Goods move between holds, markets and space in manifests
+(commodity id -> units) that either move completely or not at all.
+"""
+
+class CargoHold:
+    """Goods carried by a ship, with a fixed capacity in units"""
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.items = {}  # Commodity id -> units held (never 0)
+        self.used = 0  # Total units held, kept in step with items
+    
+    def __len__(self):
+        return len(self.items)
+    
+    def __contains__(self, commodity_id):
+        return commodity_id in self.items
+    
+    def __getitem__(self, commodity_id):
+        return self.items[commodity_id]
+    
+    def __iter__(self):
+        return iter(self.items)
+    
+    def get(self, commodity_id, default=0):
+        """Get the units held of a commodity"""
+        return self.items.get(commodity_id, default)
+    
+    def space_remaining(self):
+        """Get the units of free space"""
+        return self.capacity - self.used
+    
+    def can_add(self, manifest):
+        """Check if every unit of a manifest fits (manifests must list positive units)"""
+        if any(units <= 0 for units in manifest.values()):
+            return False
+        return sum(manifest.values()) <= self.capacity - self.used
+    
+    def can_remove(self, manifest):
+        """Check if every unit of a manifest is held (manifests must list positive units)"""
+        if any(units <= 0 for units in manifest.values()):
+            return False
+        return all(self.items.get(commodity_id, 0) >= units for commodity_id, units in manifest.items())
+    
+    def add(self, commodity_id, units):
+        """Add units of one commodity if there's space"""
+        return self.add_many({commodity_id: units})
+    
+    def remove(self, commodity_id, units):
+        """Remove units of one commodity if enough are held"""
+        return self.remove_many({commodity_id: units})
+    
+    def add_many(self, manifest):
+        """Add a whole manifest, or nothing if it doesn't fit"""
+        if not self.can_add(manifest):
+            return False
+        
+        items = self.items
+        for commodity_id, units in manifest.items():
+            items[commodity_id] = items.get(commodity_id, 0) + units
+            self.used += units
+        return True
+    
+    def remove_many(self, manifest):
+        """Remove a whole manifest, or nothing if any of it is missing"""
+        if not self.can_remove(manifest):
+            return False
+        
+        items = self.items
+        for commodity_id, units in manifest.items():
+            left = items[commodity_id] - units
+            
+            # Remove item completely if quantity is 0
+            if left:
+                items[commodity_id] = left
+            else:
+                del items[commodity_id]
+            self.used -= units
+        return True
+    
+    def transfer_to(self, other, manifest):
+        """Move a manifest into another hold, or nothing if either side can't take part"""
+        if not self.can_remove(manifest) or not other.can_add(manifest):
+            return False
+        self.remove_many(manifest)
+        other.add_many(manifest)
+        return True
+    
+    def jettison(self, manifest=None):
+        """Dump a manifest (or everything) into space and return what went"""
+        if manifest is None:
+            manifest = dict(self.items)
+        if not manifest:
+            return {}
+        if not self.remove_many(manifest):
+            return {}
+        return manifest
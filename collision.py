@@ -0,0 +1,321 @@
+import numpy as np
+from projectile import OWNER_PLAYER, OWNER_ENEMY, KIND_MINE, MINE_ARM_TIME, MINE_TRIGGER_RADIUS
+
+"""
+Batched collision detection.
+
+Objects are tested as circles in two groups at a time (for example
+projectiles against enemy ships). The broadphase buckets the second group
+into a uniform grid by sorting their cell keys, then looks up the 3x3 cells
+around every object of the first group with binary searches, so the cost
+grows roughly linearly with the number of objects. The narrowphase compares
+squared distances. Every contact found in a frame is reported as arrays of
+index pairs, which the caller resolves after the whole pass.
+
+Projectiles are tested along the whole segment they swept during the frame
+rather than at their end point, so fast shots cannot tunnel through small
+targets on a slow frame. Each shot is stopped by the first thing on its path.
+Mines do not collide; once armed they are triggered by a hostile target
+coming within their trigger radius, and blasts find what they damage with the
+same grid queries.
+"""
+
+# Default grid cell size in world pixels (grown when objects are larger)
+DEFAULT_CELL_SIZE = 64
+
+# Offset that keeps cell rows positive when packed into a single key
+ROW_OFFSET = 1 << 31
+
+EMPTY_PAIRS = (np.zeros(0, dtype=np.intp), np.zeros(0, dtype=np.intp))
+
+def cell_keys(cell_x, cell_y):
+    """Pack grid cell coordinates into sortable integer keys"""
+    return cell_x * (1 << 32) + (cell_y + ROW_OFFSET)
+
+def find_overlaps(ax, ay, ar, bx, by, br, cell_size=DEFAULT_CELL_SIZE):
+    """Find every overlapping pair between two groups of circles
+    
+    Returns (a_indices, b_indices) arrays, one entry per overlapping pair.
+    """
+    if len(ax) == 0 or len(bx) == 0:
+        return EMPTY_PAIRS
+    
+    # Cells must be at least as large as the largest possible contact distance,
+    # so any overlapping pair is at most one cell apart
+    cell_size = max(cell_size, float(ar.max() + br.max()))
+    
+    # Bucket the second group by sorting its cell keys
+    b_keys = cell_keys(np.floor(bx / cell_size).astype(np.int64), np.floor(by / cell_size).astype(np.int64))
+    order = np.argsort(b_keys, kind='stable')
+    sorted_keys = b_keys[order]
+    
+    a_cell_x = np.floor(ax / cell_size).astype(np.int64)
+    a_cell_y = np.floor(ay / cell_size).astype(np.int64)
+    a_count = len(ax)
+    
+    a_parts = []
+    b_parts = []
+    for offset_x in (-1, 0, 1):
+        for offset_y in (-1, 0, 1):
+            keys = cell_keys(a_cell_x + offset_x, a_cell_y + offset_y)
+            start = np.searchsorted(sorted_keys, keys, side='left')
+            counts = np.searchsorted(sorted_keys, keys, side='right') - start
+            total = int(counts.sum())
+            if total == 0:
+                continue
+            
+            # Expand each (start, count) run into candidate pairs
+            a_indices = np.repeat(np.arange(a_count), counts)
+            run_starts = np.repeat(np.cumsum(counts) - counts, counts)
+            b_positions = np.repeat(start, counts) + (np.arange(total) - run_starts)
+            a_parts.append(a_indices)
+            b_parts.append(order[b_positions])
+    
+    if not a_parts:
+        return EMPTY_PAIRS
+    
+    a_indices = np.concatenate(a_parts)
+    b_indices = np.concatenate(b_parts)
+    
+    # Narrowphase with squared distances
+    dx = ax[a_indices] - bx[b_indices]
+    dy = ay[a_indices] - by[b_indices]
+    reach = ar[a_indices] + br[b_indices]
+    hits = dx * dx + dy * dy < reach * reach
+    return a_indices[hits], b_indices[hits]
+
+def sweep_circles(x0, y0, x1, y1, radius, bx, by, br, cell_size=DEFAULT_CELL_SIZE):
+    """Find every circle hit by a group of moving circles along their paths
+    
+    The first group moves from (x0, y0) to (x1, y1) during the frame; the
+    second group is treated as standing still. Returns (a_indices, b_indices,
+    times), where time is the fraction of the path travelled at first contact.
+    """
+    if len(x0) == 0 or len(bx) == 0:
+        return EMPTY_PAIRS + (np.zeros(0),)
+    
+    # Broadphase on circles enclosing each whole path
+    dx = x1 - x0
+    dy = y1 - y0
+    reach = np.hypot(dx, dy) * 0.5 + radius
+    a_indices, b_indices = find_overlaps((x0 + x1) * 0.5, (y0 + y1) * 0.5, reach, bx, by, br, cell_size)
+    if len(a_indices) == 0:
+        return EMPTY_PAIRS + (np.zeros(0),)
+    
+    # Solve |start + t * path - center| = combined radius for the entry time t
+    dx = dx[a_indices]
+    dy = dy[a_indices]
+    fx = x0[a_indices] - bx[b_indices]
+    fy = y0[a_indices] - by[b_indices]
+    combined = radius[a_indices] + br[b_indices]
+    a = dx * dx + dy * dy
+    b = 2 * (fx * dx + fy * dy)
+    c = fx * fx + fy * fy - combined * combined
+    discriminant = b * b - 4 * a * c
+    
+    moving = a > 0
+    safe_a = np.where(moving, a, 1.0)
+    times = (-b - np.sqrt(np.maximum(discriminant, 0.0))) / (2 * safe_a)
+    
+    # Paths starting inside a circle hit at once; others must enter before the path ends
+    starts_inside = c <= 0
+    enters = moving & (discriminant >= 0) & (times >= 0) & (times <= 1)
+    hits = starts_inside | enters
+    times = np.where(starts_inside, 0.0, times)
+    return a_indices[hits], b_indices[hits], times[hits]
+
+def first_per_object(a_indices, b_indices):
+    """Keep only the first pair for each object of the first group"""
+    if len(a_indices) == 0:
+        return a_indices, b_indices
+    _, first = np.unique(a_indices, return_index=True)
+    return a_indices[first], b_indices[first]
+
+def first_hits(sweeps):
+    """Keep the earliest contact of each moving object across several sweeps
+    
+    sweeps is a sequence of (a_indices, b_indices, times) results from
+    sweep_circles. Returns (a_indices, b_indices, groups, times), where group
+    is the position in sweeps of the sweep each kept contact came from.
+    """
+    a_indices = np.concatenate([found[0] for found in sweeps])
+    b_indices = np.concatenate([found[1] for found in sweeps])
+    times = np.concatenate([found[2] for found in sweeps])
+    groups = np.repeat(np.arange(len(sweeps)), [len(found[0]) for found in sweeps])
+    if len(a_indices) == 0:
+        return a_indices, b_indices, groups, times
+    
+    order = np.lexsort((times, a_indices))
+    _, first = np.unique(a_indices[order], return_index=True)
+    first = order[first]
+    return a_indices[first], b_indices[first], groups[first], times[first]
+
+def separate(x, y, vx, vy, radius, other_x, other_y, other_radius, restitution=0.5):
+    """Push circles out of the (immovable) circles they overlap and bounce them off
+    
+    Works on matching arrays of contacts and returns the new
+    (x, y, vx, vy) along with the speed of each impact.
+    """
+    dx = x - other_x
+    dy = y - other_y
+    distance = np.hypot(dx, dy)
+    
+    # Contact normal (pointing away from the other circle)
+    safe_distance = np.where(distance > 0, distance, 1.0)
+    normal_x = np.where(distance > 0, dx / safe_distance, 1.0)
+    normal_y = np.where(distance > 0, dy / safe_distance, 0.0)
+    
+    # Move out of the overlap
+    overlap = radius + other_radius - distance
+    x = x + normal_x * overlap
+    y = y + normal_y * overlap
+    
+    # Reflect the velocity heading into the other circle
+    approach = np.minimum(vx * normal_x + vy * normal_y, 0.0)
+    vx = vx - (1 + restitution) * approach * normal_x
+    vy = vy - (1 + restitution) * approach * normal_y
+    
+    return x, y, vx, vy, -approach
+
+class CollisionSystem:
+    """Finds the contacts between projectiles, ships, asteroids and the player"""
+    def __init__(self, cell_size=DEFAULT_CELL_SIZE):
+        self.cell_size = cell_size
+        
+        # Counters for the last pass
+        self.stats = {'contacts': 0}
+    
+    def detect(self, projectiles, fleet, asteroid_field, player):
+        """Find every contact this frame, as batches of index pairs
+        
+        Returns a dict of:
+            'shot_ship': (projectile indices, fleet indices), player shots hitting enemy ships
+            'shot_player': projectile indices, enemy shots hitting the player
+            'shot_asteroid': (projectile indices, asteroid indices), shots hitting asteroids
+            'ship_asteroid': (fleet indices, asteroid indices), enemy ships touching asteroids
+            'player_asteroid': asteroid indices the player is touching
+            'shot_impact': (x, y) arrays, where each projectile first made contact
+            'mine_trigger': indices of armed mines with a hostile target in range
+        
+        Each projectile appears in at most one of the shot entries, for the
+        first target along its path.
+        """
+        cell_size = self.cell_size
+        n = projectiles.count
+        shot_x0 = projectiles.prev_x[:n]
+        shot_y0 = projectiles.prev_y[:n]
+        shot_x1 = projectiles.x[:n]
+        shot_y1 = projectiles.y[:n]
+        shot_size = projectiles.size[:n]
+        
+        ships = fleet.count
+        ship_x = fleet.x[:ships]
+        ship_y = fleet.y[:ships]
+        ship_size = fleet.size[:ships]
+        
+        rocks = asteroid_field.count
+        rock_x = asteroid_field.x[:rocks]
+        rock_y = asteroid_field.y[:rocks]
+        rock_size = asteroid_field.size[:rocks].astype(np.float64)
+        
+        player_x = np.array([player.x])
+        player_y = np.array([player.y])
+        player_size = np.array([float(player.hit_radius)])
+        
+        def sweep(shots, bx, by, br):
+            shot, target, times = sweep_circles(shot_x0[shots], shot_y0[shots], shot_x1[shots], shot_y1[shots],
+                                                shot_size[shots], bx, by, br, cell_size)
+            return shots[shot], target, times
+        
+        # Player shots against enemy ships, enemy shots against the player, and every
+        # shot against asteroids (mines stay put and are handled below)
+        owner = projectiles.owner[:n]
+        moving = projectiles.speed[:n] > 0
+        player_shots = np.nonzero(moving & (owner == OWNER_PLAYER))[0]
+        enemy_shots = np.nonzero(moving & (owner == OWNER_ENEMY))[0]
+        moving = np.nonzero(moving)[0]
+        sweeps = (
+            sweep(player_shots, ship_x, ship_y, ship_size),
+            sweep(enemy_shots, player_x, player_y, player_size),
+            sweep(moving, rock_x, rock_y, rock_size)
+        )
+        
+        # Only the first target along each path is hit
+        shots, targets, groups, times = first_hits(sweeps)
+        
+        # Where each hit shot made contact
+        impact_x = np.zeros(n)
+        impact_y = np.zeros(n)
+        impact_x[shots] = shot_x0[shots] + (shot_x1[shots] - shot_x0[shots]) * times
+        impact_y[shots] = shot_y0[shots] + (shot_y1[shots] - shot_y0[shots]) * times
+        
+        shot_ship = (shots[groups == 0], targets[groups == 0])
+        shot_player = shots[groups == 1]
+        shot_asteroid = (shots[groups == 2], targets[groups == 2])
+        
+        # Armed mines with a hostile target in range (targets are looked up in the mines' grid)
+        age = projectiles.max_lifetime[:n] - projectiles.lifetime[:n]
+        armed = (projectiles.kind[:n] == KIND_MINE) & (age >= MINE_ARM_TIME)
+        mine_trigger = []
+        for mine_owner, (target_x, target_y, target_size) in ((OWNER_PLAYER, (ship_x, ship_y, ship_size)),
+                                                             (OWNER_ENEMY, (player_x, player_y, player_size))):
+            mines = np.nonzero(armed & (owner == mine_owner))[0]
+            reach = np.full(len(mines), float(MINE_TRIGGER_RADIUS))
+            _, in_range = find_overlaps(target_x, target_y, target_size,
+                                        shot_x1[mines], shot_y1[mines], reach, cell_size)
+            mine_trigger.append(mines[np.unique(in_range)])
+        mine_trigger = np.concatenate(mine_trigger)
+        
+        # Ships against asteroids
+        ship_asteroid = find_overlaps(ship_x, ship_y, ship_size, rock_x, rock_y, rock_size, cell_size)
+        player_asteroid = find_overlaps(player_x, player_y, player_size, rock_x, rock_y, rock_size, cell_size)[1]
+        
+        contacts = {
+            'shot_ship': shot_ship,
+            'shot_player': shot_player,
+            'shot_asteroid': shot_asteroid,
+            'ship_asteroid': ship_asteroid,
+            'player_asteroid': player_asteroid,
+            'shot_impact': (impact_x, impact_y),
+            'mine_trigger': mine_trigger
+        }
+        self.stats = {
+            'contacts': len(shots) + len(ship_asteroid[0]) + len(player_asteroid) + len(mine_trigger)
+        }
+        return contacts
+    
+    def raycast(self, x0, y0, x1, y1, target_groups):
+        """Find the first circle hit by each of a batch of rays
+        
+        target_groups is a sequence of (x, y, radius) arrays. Returns
+        (ray indices, target indices, groups, times) for the rays that hit
+        something, where time is the fraction of the ray's length.
+        """
+        no_radius = np.zeros(len(x0))
+        return first_hits([sweep_circles(x0, y0, x1, y1, no_radius, bx, by, br, self.cell_size)
+                           for bx, by, br in target_groups])
+    
+    def query_blasts(self, x, y, radius, fleet, player):
+        """Find the ships and player caught in a batch of blasts (asteroids take no damage, so aren't searched)
+        
+        Returns a dict of:
+            'ship': (blast indices, fleet indices, distances)
+            'player': (blast indices, distances)
+        where distance runs from the blast center to the nearest edge of the target.
+        """
+        ships = fleet.count
+        ship_x = fleet.x[:ships]
+        ship_y = fleet.y[:ships]
+        ship_size = fleet.size[:ships]
+        blast, ship = find_overlaps(x, y, radius, ship_x, ship_y, ship_size, self.cell_size)
+        ship_distance = np.maximum(np.hypot(x[blast] - ship_x[ship], y[blast] - ship_y[ship]) - ship_size[ship], 0)
+        
+        player_blast, _ = find_overlaps(x, y, radius, np.array([player.x]), np.array([player.y]),
+                                        np.array([float(player.hit_radius)]), self.cell_size)
+        player_distance = np.hypot(x[player_blast] - player.x, y[player_blast] - player.y)
+        player_distance = np.maximum(player_distance - player.hit_radius, 0)
+        
+        return {
+            'ship': (blast, ship, ship_distance),
+            'player': (player_blast, player_distance)
+        }
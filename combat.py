@@ -1,16 +1,28 @@
-import pygame
 import math
-import random
-from projectile import Laser, Missile, Mine
+import numpy as np
+from projectile import OWNER_ENEMY, OWNER_PLAYER, KIND_BLAST_RADIUS
+from collision import CollisionSystem, first_per_object, separate
+from particles import ParticleSystem
+from damage_numbers import DamageNumbers
+from beams import BeamEffects, BEAM_RANGE
+from registry import PLAYER_HANDLE
+
+# Impact speed above which hitting an asteroid damages the player
+ASTEROID_DAMAGE_SPEED = 60
+
+# Damage per unit of impact speed
+ASTEROID_DAMAGE_FACTOR = 0.1
 
 class CombatManager:
     """Manages combat interactions between player and enemies"""
     def __init__(self, player, universe):
         self.player = player
         self.universe = universe
-        self.enemy_projectiles = []  # List of projectiles fired by enemies
-        self.explosion_particles = []  # List of explosion particles
-        self.damage_numbers = []  # List of damage number displays
+        self.projectiles = player.projectiles  # Every projectile in flight, player and enemy
+        self.collisions = CollisionSystem()
+        self.particles = ParticleSystem()  # Explosion particles
+        self.damage_numbers = DamageNumbers()  # Floating damage number displays
+        self.beams = BeamEffects()  # Visible hitscan beams
     
     def update(self, delta_time):
         """Update combat state"""
@@ -18,151 +30,266 @@ class CombatManager:
         if not self.player.current_system:
             return
         
-        # Update enemy projectiles
-        for projectile in self.enemy_projectiles[:]:
-            projectile.update(delta_time)
-            
-            # Check if projectile has expired
-            if projectile.lifetime <= 0:
-                self.enemy_projectiles.remove(projectile)
-                continue
-            
-            # Check for collision with player
-            if projectile.check_collision(self.player):
-                # Apply damage to player
-                player_destroyed = self.player.take_damage(projectile.damage)
-                
-                # Create damage number
-                self.create_damage_number(self.player.x, self.player.y, projectile.damage)
-                
-                # Create explosion
-                self.create_explosion(projectile.x, projectile.y, 10)
-                
-                # Remove projectile
-                self.enemy_projectiles.remove(projectile)
-                
-                # Handle player destruction
-                if player_destroyed:
-                    # In a full implementation, would trigger game over
-                    pass
-        
-        # Check player projectiles against enemies
-        for projectile in self.player.projectiles[:]:
-            for entity in self.player.current_system.entities:
-                # Only check enemy ships
-                if entity.entity_type == "EnemyShip":
-                    if projectile.check_collision(entity):
-                        # Apply damage to enemy
-                        entity.health -= projectile.damage
-                        
-                        # Create damage number
-                        self.create_damage_number(entity.x, entity.y, projectile.damage)
-                        
-                        # Create explosion
-                        self.create_explosion(projectile.x, projectile.y, 10)
-                        
-                        # Remove projectile
-                        if projectile in self.player.projectiles:
-                            self.player.projectiles.remove(projectile)
-                        
-                        # Check if enemy is destroyed
-                        if entity.health <= 0:
-                            # Create larger explosion
-                            self.create_explosion(entity.x, entity.y, 20)
-                            
-                            # Remove enemy from system
-                            self.player.current_system.entities.remove(entity)
-                            
-                            # In a full implementation, would add rewards, etc.
-                            break
-        
-        # Update explosions
-        for particle in self.explosion_particles[:]:
-            particle['lifetime'] -= delta_time
-            if particle['lifetime'] <= 0:
-                self.explosion_particles.remove(particle)
-            else:
-                # Move particle
-                particle['x'] += particle['vx'] * delta_time
-                particle['y'] += particle['vy'] * delta_time
+        # Fire the weapons enemies chose during the last AI tick
+        self.fire_enemy_weapons(self.player.current_system.think_scheduler.fire_requests)
+        
+        # Resolve the beams the player fired since the last frame
+        system = self.player.current_system
+        self.fire_beams(self.player.beam_shots, OWNER_PLAYER, system)
+        
+        # Move every projectile in flight
+        projectiles = self.projectiles
+        projectiles.update(delta_time, self.resolve_target)
+        
+        # Find every contact this frame, then resolve them together
+        contacts = self.collisions.detect(projectiles, system.fleet, system.asteroid_field, self.player)
+        self.resolve_shot_hits(contacts, system)
+        self.resolve_asteroid_contacts(contacts, system)
+        
+        # Drop the projectiles that hit something
+        projectiles.compact()
+        
+        # Update explosions and beams
+        self.particles.update(delta_time)
+        self.beams.update(delta_time)
         
         # Update damage numbers
-        for damage in self.damage_numbers[:]:
-            damage['lifetime'] -= delta_time
-            if damage['lifetime'] <= 0:
-                self.damage_numbers.remove(damage)
-            else:
-                # Float upward
-                damage['y'] -= 30 * delta_time
+        self.damage_numbers.update(delta_time)
+    
+    def resolve_target(self, handle):
+        """Get the player or entity a target handle refers to (None once it is gone)"""
+        if handle == PLAYER_HANDLE:
+            return self.player
+        return self.player.current_system.entities.get(handle)
     
-    def render(self, screen):
-        """Render combat effects"""
-        # Render enemy projectiles
-        for projectile in self.enemy_projectiles:
-            projectile.render(screen)
+    def resolve_shot_hits(self, contacts, system):
+        """Apply the damage from projectiles that hit ships, the player or asteroids"""
+        projectiles = self.projectiles
+        fleet = system.fleet
         
-        # Render explosions
-        for particle in self.explosion_particles:
-            # Calculate alpha based on remaining lifetime
-            alpha = min(255, int(255 * particle['lifetime'] / particle['max_lifetime']))
-            
-            # Calculate color with alpha
-            if particle['type'] == 'fire':
-                color = (255, 100 + int(155 * particle['lifetime'] / particle['max_lifetime']), 0, alpha)
-            else:  # smoke
-                gray = 150 + int(105 * particle['lifetime'] / particle['max_lifetime'])
-                color = (gray, gray, gray, alpha)
+        impact_x, impact_y = contacts['shot_impact']
+        
+        # Missiles and mines go off in a blast instead of hitting directly
+        n = projectiles.count
+        blast_radius = KIND_BLAST_RADIUS[projectiles.kind[:n]]
+        blasts = []
+        
+        def split(shot_indices):
+            """Queue the blasts among some shots and return the direct hits"""
+            exploding = blast_radius[shot_indices] > 0
+            for i in shot_indices[exploding].tolist():
+                blasts.append((float(impact_x[i]), float(impact_y[i]),
+                               float(blast_radius[i]), float(projectiles.damage[i])))
+            projectiles.kill(shot_indices)
+            return ~exploding
+        
+        # Each projectile hits at most one ship (the first on its path)
+        shot_indices, ship_indices = contacts['shot_ship']
+        direct = split(shot_indices)
+        self.damage_ships([(fleet.ships[j], float(projectiles.damage[i]), float(impact_x[i]), float(impact_y[i]))
+                           for i, j in zip(shot_indices[direct].tolist(), ship_indices[direct].tolist())], system)
+        
+        # Enemy projectiles that hit the player
+        shot_indices = contacts['shot_player']
+        direct = split(shot_indices)
+        self.damage_player([(float(projectiles.damage[i]), float(impact_x[i]), float(impact_y[i]))
+                            for i in shot_indices[direct].tolist()])
+        
+        # Shots that hit an asteroid first are absorbed by it
+        shot_indices = contacts['shot_asteroid'][0]
+        direct = split(shot_indices)
+        for i in shot_indices[direct].tolist():
+            self.create_explosion(float(impact_x[i]), float(impact_y[i]), 5)
+        
+        # Every mine triggered this frame goes off where it lies
+        mine_indices = contacts['mine_trigger']
+        impact_x[mine_indices] = projectiles.x[mine_indices]
+        impact_y[mine_indices] = projectiles.y[mine_indices]
+        split(mine_indices)
+        
+        self.detonate(blasts, system)
+    
+    def detonate(self, blasts, system):
+        """Apply area damage from blasts, given as (x, y, radius, damage) tuples, in one batch
+        
+        Ships and the player caught in a blast take damage that falls off
+        linearly from the full amount at the center to nothing at the edge.
+        Asteroids have no health (a shot that hits one is simply absorbed), so
+        blasts leave them alone.
+        """
+        if not blasts:
+            return
+        
+        x, y, radius, damage = (np.array(values, dtype=np.float64) for values in zip(*blasts))
+        for blast_x, blast_y, blast_radius in zip(x.tolist(), y.tolist(), radius.tolist()):
+            self.create_explosion(blast_x, blast_y, int(blast_radius // 4))
+        
+        caught = self.collisions.query_blasts(x, y, radius, system.fleet, self.player)
+        
+        # Whole points of damage, like asteroid impacts (grazes that round to nothing do no harm)
+        blast, ship, distance = caught['ship']
+        amount = (damage[blast] * (1 - distance / radius[blast])).astype(int)
+        ships = [system.fleet.ships[j] for j in ship.tolist()]
+        self.damage_ships([(target, hit, target.x, target.y)
+                           for target, hit in zip(ships, amount.tolist()) if hit > 0], system)
+        
+        blast, distance = caught['player']
+        amount = (damage[blast] * (1 - distance / radius[blast])).astype(int)
+        self.damage_player([(hit, self.player.x, self.player.y) for hit in amount.tolist() if hit > 0])
+    
+    def damage_ships(self, hits, system):
+        """Apply hits to enemy ships, given as (ship, damage, impact_x, impact_y) tuples"""
+        destroyed = []
+        for ship, damage, impact_x, impact_y in hits:
+            # Ships destroyed earlier this tick stay in the system until it ends
+            if ship.health <= 0:
+                continue
             
-            # Create a temporary surface for the particle with alpha
-            particle_surface = pygame.Surface((int(particle['size'] * 2), int(particle['size'] * 2)), 
-                                            pygame.SRCALPHA)
+            # Apply damage to enemy
+            ship.health -= damage
             
-            # Draw the particle
-            pygame.draw.circle(particle_surface, color, 
-                             (int(particle['size']), int(particle['size'])), 
-                             int(particle['size'] * (0.5 + 0.5 * particle['lifetime'] / particle['max_lifetime'])))
+            # Create damage number
+            self.create_damage_number(ship.x, ship.y, damage)
             
-            # Calculate screen position relative to player
-            screen_x = screen.get_width() // 2 + (particle['x'] - self.player.x)
-            screen_y = screen.get_height() // 2 + (particle['y'] - self.player.y)
+            # Create explosion
+            self.create_explosion(impact_x, impact_y, 10)
             
-            # Blit the particle surface to the screen
-            screen.blit(particle_surface, 
-                      (int(screen_x - particle['size']), int(screen_y - particle['size'])))
+            # Check if enemy is destroyed
+            if ship.health <= 0:
+                destroyed.append(ship)
         
-        # Render damage numbers
-        for damage in self.damage_numbers:
-            # Calculate alpha based on remaining lifetime
-            alpha = min(255, int(255 * damage['lifetime'] / damage['max_lifetime']))
-            
-            # Calculate screen position relative to player
-            screen_x = screen.get_width() // 2 + (damage['x'] - self.player.x)
-            screen_y = screen.get_height() // 2 + (damage['y'] - self.player.y)
+        for ship in destroyed:
+            # Create larger explosion
+            self.create_explosion(ship.x, ship.y, 20)
             
-            # Render text with alpha
-            font = pygame.font.SysFont(None, 20)
+            # Remove enemy from system
+            system.remove_entity(ship)
             
-            # Different colors based on damage amount
-            if damage['amount'] >= 20:
-                color = (255, 0, 0)  # Red for high damage
-            elif damage['amount'] >= 10:
-                color = (255, 150, 0)  # Orange for medium damage
-            else:
-                color = (255, 255, 0)  # Yellow for low damage
+            # In a full implementation, would add rewards, etc.
+    
+    def damage_player(self, hits):
+        """Apply hits to the player, given as (damage, impact_x, impact_y) tuples"""
+        for damage, impact_x, impact_y in hits:
+            # Apply damage to player
+            player_destroyed = self.player.take_damage(damage)
             
-            text = font.render(str(int(damage['amount'])), True, color)
+            # Create damage number
+            self.create_damage_number(self.player.x, self.player.y, damage)
             
-            # Create a surface with alpha for the text
-            text_surface = pygame.Surface(text.get_size(), pygame.SRCALPHA)
-            text_surface.fill((0, 0, 0, 0))  # Fill with transparent
-            text_surface.blit(text, (0, 0))
+            # Create explosion
+            self.create_explosion(impact_x, impact_y, 10)
             
-            # Apply alpha to the entire surface
-            text_surface.set_alpha(alpha)
+            # Handle player destruction
+            if player_destroyed:
+                # In a full implementation, would trigger game over
+                pass
+    
+    def fire_beams(self, beam_shots, owner, system):
+        """Resolve hitscan shots, given as (x, y, angle, damage) tuples, the moment they are fired
+        
+        Each beam is cast as a ray against its targets and the system's
+        asteroids, hits the first one in its path and leaves only a short-lived
+        visual behind.
+        """
+        if not beam_shots:
+            return
+        
+        x0, y0, angle, damage = (np.array(values, dtype=np.float64) for values in zip(*beam_shots))
+        beam_shots.clear()
+        x1 = x0 + np.cos(angle) * BEAM_RANGE
+        y1 = y0 + np.sin(angle) * BEAM_RANGE
+        
+        # Player beams hit enemy ships, enemy beams hit the player
+        if owner == OWNER_PLAYER:
+            fleet = system.fleet
+            targets = (fleet.x[:fleet.count], fleet.y[:fleet.count], fleet.size[:fleet.count])
+        else:
+            targets = (np.array([self.player.x]), np.array([self.player.y]),
+                       np.array([float(self.player.hit_radius)]))
+        field = system.asteroid_field
+        rocks = (field.x[:field.count], field.y[:field.count], field.size[:field.count].astype(np.float64))
+        beams, hit, group, times = self.collisions.raycast(x0, y0, x1, y1, (targets, rocks))
+        
+        # Beams stop where they hit something
+        x1[beams] = x0[beams] + (x1[beams] - x0[beams]) * times
+        y1[beams] = y0[beams] + (y1[beams] - y0[beams]) * times
+        self.beams.add(x0, y0, x1, y1)
+        
+        target_hits = group == 0
+        if owner == OWNER_PLAYER:
+            self.damage_ships([(fleet.ships[j], float(damage[i]), float(x1[i]), float(y1[i]))
+                               for i, j in zip(beams[target_hits].tolist(), hit[target_hits].tolist())], system)
+        else:
+            self.damage_player([(float(damage[i]), float(x1[i]), float(y1[i]))
+                                for i in beams[target_hits].tolist()])
+        
+        for i in beams[~target_hits].tolist():
+            self.create_explosion(float(x1[i]), float(y1[i]), 5)
+    
+    def resolve_asteroid_contacts(self, contacts, system):
+        """Push ships out of asteroids they touch and bounce them off"""
+        field = system.asteroid_field
+        
+        # Enemy ships (one asteroid per ship per frame)
+        ship_indices, rock_indices = first_per_object(*contacts['ship_asteroid'])
+        if len(ship_indices):
+            fleet = system.fleet
+            x, y, vx, vy, _ = separate(
+                fleet.x[ship_indices], fleet.y[ship_indices],
+                fleet.vx[ship_indices], fleet.vy[ship_indices], fleet.size[ship_indices],
+                field.x[rock_indices], field.y[rock_indices], field.size[rock_indices])
+            fleet.x[ship_indices] = x
+            fleet.y[ship_indices] = y
+            fleet.vx[ship_indices] = vx
+            fleet.vy[ship_indices] = vy
+        
+        # The player, who is hurt by hard impacts
+        player = self.player
+        for j in contacts['player_asteroid'][:1].tolist():
+            x, y, vx, vy, impact = separate(
+                player.x, player.y, player.vx, player.vy, player.hit_radius,
+                field.x[j], field.y[j], field.size[j])
+            player.x = float(x)
+            player.y = float(y)
+            player.vx = float(vx)
+            player.vy = float(vy)
             
-            # Draw the text
-            screen.blit(text_surface, 
-                      (screen_x - text.get_width() // 2, screen_y - text.get_height() // 2))
+            if impact > ASTEROID_DAMAGE_SPEED:
+                damage = int(impact * ASTEROID_DAMAGE_FACTOR)
+                player.take_damage(damage)
+                self.create_damage_number(player.x, player.y, damage)
+    
+    def render(self, render_queue, alpha=1.0):
+        """Submit combat effects to the render queue
+        
+        alpha is how far the frame is between the last two simulation steps.
+        """
+        camera_x = self.player.view_x
+        camera_y = self.player.view_y
+        
+        # Render all projectiles relative to the player
+        self.projectiles.render(render_queue, camera_x, camera_y, alpha)
+        
+        # Render beams
+        self.beams.render(render_queue, camera_x, camera_y)
+        
+        # Render explosions
+        self.particles.render(render_queue, camera_x, camera_y)
+        
+        # Render damage numbers
+        self.damage_numbers.render(render_queue, camera_x, camera_y)
+    
+    def fire_enemy_weapons(self, fire_requests):
+        """Fire a batch of (enemy, weapon) requests made by the AI"""
+        for enemy, weapon in fire_requests:
+            if weapon == "missile":
+                self.enemy_fire_missile(enemy, self.player)
+            elif weapon == "mine":
+                self.enemy_deploy_mine(enemy)
+            else:
+                self.enemy_fire_laser(enemy, self.player.x, self.player.y)
+        
+        fire_requests.clear()
     
     def enemy_fire_laser(self, enemy, target_x, target_y):
         """Create a laser projectile fired by an enemy"""
@@ -174,10 +301,7 @@ class CombatManager:
         spawn_y = enemy.y + math.sin(angle) * enemy.size
         
         # Create laser
-        laser = Laser(spawn_x, spawn_y, angle, enemy.damage)
-        
-        # Add to enemy projectiles list
-        self.enemy_projectiles.append(laser)
+        self.projectiles.fire_laser(spawn_x, spawn_y, angle, enemy.damage, OWNER_ENEMY)
         
         # In full implementation, would play sound
     
@@ -188,72 +312,24 @@ class CombatManager:
         spawn_y = enemy.y + math.sin(enemy.rotation) * enemy.size
         
         # Create missile
-        missile = Missile(spawn_x, spawn_y, enemy.rotation, enemy.damage * 1.5, target)
-        
-        # Add to enemy projectiles list
-        self.enemy_projectiles.append(missile)
+        self.projectiles.fire_missile(spawn_x, spawn_y, enemy.rotation, enemy.damage * 1.5, OWNER_ENEMY, target.handle)
         
         # In full implementation, would play sound
     
     def enemy_deploy_mine(self, enemy):
         """Deploy a mine at an enemy's position"""
         # Create mine
-        mine = Mine(enemy.x, enemy.y, enemy.damage * 2)
-        
-        # Add to enemy projectiles list
-        self.enemy_projectiles.append(mine)
+        self.projectiles.deploy_mine(enemy.x, enemy.y, enemy.damage * 2, OWNER_ENEMY)
         
         # In full implementation, would play sound
     
     def create_explosion(self, x, y, size):
         """Create an explosion effect at the given position"""
-        # Number of particles based on size
-        num_particles = size * 2
-        
         # Create explosion particles
-        for _ in range(num_particles):
-            # Random velocity
-            angle = random.uniform(0, 2 * math.pi)
-            speed = random.uniform(50, 150)
-            vx = math.cos(angle) * speed
-            vy = math.sin(angle) * speed
-            
-            # Random size
-            particle_size = random.uniform(size * 0.2, size * 0.6)
-            
-            # Random lifetime
-            lifetime = random.uniform(0.3, 0.8)
-            
-            # Determine particle type (fire or smoke)
-            particle_type = 'fire' if random.random() < 0.7 else 'smoke'
-            
-            # Create particle
-            particle = {
-                'x': x + random.uniform(-size * 0.2, size * 0.2),
-                'y': y + random.uniform(-size * 0.2, size * 0.2),
-                'vx': vx,
-                'vy': vy,
-                'size': particle_size,
-                'lifetime': lifetime,
-                'max_lifetime': lifetime,
-                'type': particle_type
-            }
-            
-            # Add to explosion particles list
-            self.explosion_particles.append(particle)
+        self.particles.explode(x, y, size)
         
         # In full implementation, would play sound
     
     def create_damage_number(self, x, y, amount):
         """Create a floating damage number at the given position"""
-        # Create damage number
-        damage = {
-            'x': x + random.uniform(-10, 10),
-            'y': y - 10,
-            'amount': amount,
-            'lifetime': 1.0,
-            'max_lifetime': 1.0
-        }
-        
-        # Add to damage numbers list
-        self.damage_numbers.append(damage)
+        self.damage_numbers.add(x, y, amount)
@@ -0,0 +1,142 @@
+import random
+import numpy as np
+import fonts
+from renderer import LAYER_LABELS
+from soa import compact_fields
+
+"""
+Floating damage numbers.
+
+Numbers live in a fixed pool of NumPy arrays and are aged and moved in bulk.
+They are drawn from a digit atlas: for each color tier the digit glyphs are
+pre-rasterized once at a few fade levels, so a number is just a short run of
+glyph blits queued with all the others in one batch.
+"""
+
+# Most damage numbers on screen at once
+DAMAGE_NUMBER_CAPACITY = 256
+
+# Seconds a number stays on screen
+DAMAGE_NUMBER_LIFETIME = 1.0
+
+# How fast numbers float upward (pixels per second)
+DAMAGE_NUMBER_RISE = 30
+
+# Font size of the numbers
+DAMAGE_NUMBER_SIZE = 20
+
+# Damage where the orange and red tiers start
+TIER_THRESHOLDS = np.array([10, 20])
+
+# Colors of the tiers, from low to high damage
+TIER_COLORS = (
+    (255, 255, 0),  # Yellow for low damage
+    (255, 150, 0),  # Orange for medium damage
+    (255, 0, 0)  # Red for high damage
+)
+
+# Number of pre-rendered fade steps per tier
+ALPHA_LEVELS = 8
+
+# Per-number arrays
+DAMAGE_NUMBER_FIELDS = {
+    'x': np.float64, 'y': np.float64,
+    'lifetime': np.float64,
+    'amount': np.int32, 'tier': np.int8
+}
+
+class DigitAtlas:
+    """Digit glyphs for every color tier at every fade level"""
+    def __init__(self, size=DAMAGE_NUMBER_SIZE, colors=TIER_COLORS, levels=ALPHA_LEVELS):
+        self.levels = levels
+        
+        # glyphs[tier][level][char], level 0 is nearly faded and the last is fully opaque
+        self.glyphs = []
+        self.widths = []  # widths[tier][char]
+        self.height = 0
+        for color in colors:
+            base = fonts.text_cache.get_glyphs(size, color)
+            faded = []
+            for level in range(levels):
+                glyphs = {}
+                for char, glyph in base.items():
+                    glyph = glyph.copy()
+                    glyph.set_alpha(255 * (level + 1) // levels)
+                    glyphs[char] = glyph
+                faded.append(glyphs)
+            self.glyphs.append(faded)
+            self.widths.append({char: glyph.get_width() for char, glyph in base.items()})
+            self.height = max(self.height, max(glyph.get_height() for glyph in base.values()))
+
+class DamageNumbers:
+    """Pooled, array-backed floating damage numbers"""
+    def __init__(self, capacity=DAMAGE_NUMBER_CAPACITY):
+        self.capacity = capacity
+        self.count = 0
+        for name, dtype in DAMAGE_NUMBER_FIELDS.items():
+            setattr(self, name, np.zeros(capacity, dtype=dtype))
+        
+        # Glyphs are rasterized the first time they are needed (after pygame is up)
+        self.atlas = None
+    
+    def __len__(self):
+        return self.count
+    
+    def add(self, x, y, amount):
+        """Show a damage number at the given position (ignored when the pool is full)"""
+        if self.count == self.capacity:
+            return
+        
+        i = self.count
+        self.x[i] = x + random.uniform(-10, 10)
+        self.y[i] = y - 10
+        self.lifetime[i] = DAMAGE_NUMBER_LIFETIME
+        self.amount[i] = int(amount)
+        
+        # Different colors based on damage amount
+        self.tier[i] = np.searchsorted(TIER_THRESHOLDS, amount, side='right')
+        self.count += 1
+    
+    def update(self, delta_time):
+        """Float every number upward and drop the faded ones"""
+        n = self.count
+        if n == 0:
+            return
+        
+        lifetime = self.lifetime[:n]
+        lifetime -= delta_time
+        self.y[:n] -= DAMAGE_NUMBER_RISE * delta_time
+        
+        # Live numbers from the end fill the slots of faded ones
+        compact_fields(self, DAMAGE_NUMBER_FIELDS, lifetime > 0)
+    
+    def render(self, render_queue, player_x, player_y):
+        """Queue the glyphs of every number as one batch of blits"""
+        n = self.count
+        if n == 0:
+            return
+        if self.atlas is None:
+            self.atlas = DigitAtlas()
+        atlas = self.atlas
+        
+        # Calculate alpha level based on remaining lifetime
+        level = np.clip((self.lifetime[:n] / DAMAGE_NUMBER_LIFETIME * atlas.levels).astype(np.intp),
+                        0, atlas.levels - 1)
+        
+        # Calculate screen position relative to player
+        screen_x = (render_queue.get_width() // 2 + (self.x[:n] - player_x)).astype(np.intp)
+        top = (render_queue.get_height() // 2 + (self.y[:n] - player_y)).astype(np.intp) - atlas.height // 2
+        
+        blits = []
+        for amount, tier, fade, x, y in zip(self.amount[:n].tolist(), self.tier[:n].tolist(), level.tolist(),
+                                            screen_x.tolist(), top.tolist()):
+            text = str(amount)
+            widths = atlas.widths[tier]
+            glyphs = atlas.glyphs[tier][fade]
+            
+            # Center the number on its position
+            x -= sum(widths[char] for char in text) // 2
+            for char in text:
+                blits.append((glyphs[char], (x, y)))
+                x += widths[char]
+        render_queue.submit_many(LAYER_LABELS, blits)
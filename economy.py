@@ -43,6 +43,16 @@ class Commodity:
             "Frontier": {"Raw": 0.3, "Manufactured": -0.5, "Luxury": -0.4, "Contraband": 0.5}
         }
     
+    def get_trend(self):
+        """Get price trend indicator"""
+        # Use price_state to determine trend
+        if self.price_state > 0.2:
+            return "↑"  # Rising
+        elif self.price_state < -0.2:
+            return "↓"  # Falling
+        else:
+            return "→"  # Stable
+    
     def get_system_price(self, system):
         """Calculate the price of this commodity in a specific system"""
         # Base modifiers from system type and faction
@@ -108,6 +118,7 @@ class Economy:
         self.universe = universe
         self.commodities = []
         self.system_markets = {}  # Cache of market data by system
+        self.market_version = 0  # Bumped whenever any market's prices or stock change
         self.market_update_time = 300  # Seconds between market updates
         self.last_update = 0
         
@@ -169,6 +180,7 @@ class Economy:
         
         # Clear market cache to force recalculation
         self.system_markets = {}
+        self.market_version += 1
     
     def get_system_market(self, system):
         """Get market data for a specific system"""
@@ -200,79 +212,76 @@ class Economy:
     
     def buy_commodity(self, player, system, commodity_name, quantity):
         """Player buys a commodity from the system"""
-        # Get market data
-        market = self.get_system_market(system)
-        
-        # Find the commodity
-        for item in market:
-            if item['commodity'].name == commodity_name:
-                # Check if enough in stock
-                if item['quantity'] >= quantity:
-                    # Calculate total cost
-                    total_cost = item['buy_price'] * quantity
-                    
-                    # Check if player has enough credits
-                    if player.credits >= total_cost:
-                        # Check if player has enough cargo space
-                        if player.get_cargo_space_remaining() >= quantity:
-                            # Deduct credits
-                            player.credits -= total_cost
-                            
-                            # Add to player's cargo
-                            player.add_cargo(commodity_name, quantity)
-                            
-                            # Reduce quantity in market
-                            item['quantity'] -= quantity
-                            
-                            return True, "Purchase successful"
-                        else:
-                            return False, "Not enough cargo space"
-                    else:
-                        return False, "Not enough credits"
-                else:
-                    return False, "Not enough stock available"
-        
-        return False, "Commodity not found"
+        return self.buy_manifest(player, system, {commodity_name: quantity})
+    
+    def buy_manifest(self, player, system, manifest):
+        """Player buys several commodities from the system at once, all or nothing"""
+        if any(quantity <= 0 for quantity in manifest.values()):
+            return False, "Invalid quantity"
+        
+        # Find the market entry of every commodity
+        market = {item['commodity'].name: item for item in self.get_system_market(system)}
+        if any(commodity_name not in market for commodity_name in manifest):
+            return False, "Commodity not found"
+        
+        # Check if enough in stock
+        if any(market[commodity_name]['quantity'] < quantity for commodity_name, quantity in manifest.items()):
+            return False, "Not enough stock available"
+        
+        # Check if player has enough credits
+        total_cost = sum(market[commodity_name]['buy_price'] * quantity
+                         for commodity_name, quantity in manifest.items())
+        if player.credits < total_cost:
+            return False, "Not enough credits"
+        
+        # Add to player's cargo (nothing is added unless all of it fits)
+        if not player.cargo.add_many(manifest):
+            return False, "Not enough cargo space"
+        
+        # Deduct credits
+        player.credits -= total_cost
+        
+        # Reduce quantity in market
+        for commodity_name, quantity in manifest.items():
+            market[commodity_name]['quantity'] -= quantity
+        self.market_version += 1
+        
+        return True, "Purchase successful"
     
     def sell_commodity(self, player, system, commodity_name, quantity):
         """Player sells a commodity to the system"""
-        # Get market data
-        market = self.get_system_market(system)
-        
-        # Find the commodity
-        for item in market:
-            if item['commodity'].name == commodity_name:
-                # Check if player has enough in cargo
-                if commodity_name in player.cargo and player.cargo[commodity_name] >= quantity:
-                    # Calculate total value
-                    total_value = item['sell_price'] * quantity
-                    
-                    # Add credits to player
-                    player.credits += total_value
-                    
-                    # Remove from player's cargo
-                    player.remove_cargo(commodity_name, quantity)
-                    
-                    # Increase quantity in market
-                    item['quantity'] += quantity
-                    
-                    return True, "Sale successful"
-                else:
-                    return False, "Not enough in cargo"
-        
-        return False, "Commodity not found"
+        return self.sell_manifest(player, system, {commodity_name: quantity})
+    
+    def sell_manifest(self, player, system, manifest):
+        """Player sells several commodities to the system at once, all or nothing"""
+        if any(quantity <= 0 for quantity in manifest.values()):
+            return False, "Invalid quantity"
+        
+        # Find the market entry of every commodity
+        market = {item['commodity'].name: item for item in self.get_system_market(system)}
+        if any(commodity_name not in market for commodity_name in manifest):
+            return False, "Commodity not found"
+        
+        # Remove from player's cargo (nothing is removed unless all of it is there)
+        if not player.cargo.remove_many(manifest):
+            return False, "Not enough in cargo"
+        
+        # Add credits to player
+        player.credits += sum(market[commodity_name]['sell_price'] * quantity
+                              for commodity_name, quantity in manifest.items())
+        
+        # Increase quantity in market
+        for commodity_name, quantity in manifest.items():
+            market[commodity_name]['quantity'] += quantity
+        self.market_version += 1
+        
+        return True, "Sale successful"
     
     def get_price_trend(self, commodity_name):
         """Get price trend indicator for a commodity"""
         for commodity in self.commodities:
             if commodity.name == commodity_name:
-                # Use price_state to determine trend
-                if commodity.price_state > 0.2:
-                    return "↑"  # Rising
-                elif commodity.price_state < -0.2:
-                    return "↓"  # Falling
-                else:
-                    return "→"  # Stable
+                return commodity.get_trend()
         
         return "?"  # Unknown
     
@@ -431,5 +440,6 @@ class Economy:
             # Clear cached market data for the system
             if event['system'] in self.system_markets:
                 del self.system_markets[event['system']]
+        self.market_version += 1
         
         # In a full implementation, would need to persist these effects for the event duration
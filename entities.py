@@ -1,9 +1,22 @@
 import pygame
 import math
 import random
+import fonts
+import animation
+import sprites
+import textures
+from fleet import Fleet, fleet_property
+from registry import NO_HANDLE
+from renderer import LAYER_BODIES, LAYER_GATES, LAYER_SHIPS, LAYER_LABELS
 
 class Entity:
-    """Base class for all game entities"""
+    """Base class for all game entities
+    
+    x, y, size and rotation are declared by the subclasses that store them,
+    since enemy ships keep theirs in their fleet's arrays instead.
+    """
+    __slots__ = ('entity_type', 'rotation_speed', 'handle')
+    
     def __init__(self, x, y, size, entity_type):
         self.x = x
         self.y = y
@@ -11,6 +24,7 @@ class Entity:
         self.entity_type = entity_type
         self.rotation = 0  # In radians
         self.rotation_speed = 0  # Rotation speed in radians per second
+        self.handle = NO_HANDLE  # Set when registered in a star system
     
     def update(self, delta_time, player=None):
         """Update entity state"""
@@ -20,16 +34,17 @@ class Entity:
         # Keep rotation within 0 to 2π
         self.rotation %= 2 * math.pi
     
-    def render(self, screen, player_x, player_y):
-        """Render the entity relative to player position"""
+    def render(self, render_queue, player_x, player_y):
+        """Submit the entity to the render queue relative to player position"""
         # Calculate screen position relative to player
-        screen_x = screen.get_width() // 2 + (self.x - player_x)
-        screen_y = screen.get_height() // 2 + (self.y - player_y)
+        screen_x = render_queue.get_width() // 2 + (self.x - player_x)
+        screen_y = render_queue.get_height() // 2 + (self.y - player_y)
         
         # Check if entity is on screen (with some margin)
-        if -100 <= screen_x <= screen.get_width() + 100 and -100 <= screen_y <= screen.get_height() + 100:
+        if -100 <= screen_x <= render_queue.get_width() + 100 and -100 <= screen_y <= render_queue.get_height() + 100:
             # Draw a simple circle for now
-            pygame.draw.circle(screen, (200, 200, 200), (int(screen_x), int(screen_y)), self.size)
+            render_queue.submit_draw(LAYER_BODIES, pygame.draw.circle, (200, 200, 200),
+                                     (int(screen_x), int(screen_y)), self.size)
     
     def check_collision(self, other):
         """Check if this entity collides with another entity"""
@@ -38,6 +53,8 @@ class Entity:
 
 class Planet(Entity):
     """A planet that can be traded with"""
+    __slots__ = ('x', 'y', 'size', 'rotation', 'planet_type', 'name', 'tech_level', 'color', 'can_trade', 'seed')
+    
     def __init__(self, x, y, size, planet_type, name, tech_level):
         super().__init__(x, y, size, "Planet")
         self.planet_type = planet_type
@@ -64,73 +81,114 @@ class Planet(Entity):
         # Trading properties
         self.can_trade = True
         
-        # Create surface for better performance
-        self.surface = pygame.Surface((size * 2, size * 2), pygame.SRCALPHA)
-        pygame.draw.circle(self.surface, self.color, (size, size), size)
-        
-        # Add some details based on planet type
-        if planet_type == "Terrestrial" or planet_type == "Jungle":
-            # Add landmasses
-            for _ in range(5):
-                land_x = random.randint(size//3, size*5//3)
-                land_y = random.randint(size//3, size*5//3)
-                land_size = random.randint(size//5, size//2)
-                land_color = (0, random.randint(90, 160), 0)
-                pygame.draw.circle(self.surface, land_color, (land_x, land_y), land_size)
-        
-        elif planet_type == "Gas Giant":
-            # Add bands
-            for i in range(3):
-                band_y = size // 2 + (i - 1) * size // 3
-                band_height = size // 5
-                band_color = (random.randint(180, 220), random.randint(130, 170), random.randint(30, 70))
-                pygame.draw.rect(self.surface, band_color, (0, band_y, size * 2, band_height))
-        
-        elif planet_type == "Ice World":
-            # Add ice caps
-            cap_color = (255, 255, 255)
-            pygame.draw.circle(self.surface, cap_color, (size, size//3), size//2)
-            pygame.draw.circle(self.surface, cap_color, (size, size*5//3), size//2)
-        
-        elif planet_type == "Desert":
-            # Add craters
-            for _ in range(3):
-                crater_x = random.randint(size//3, size*5//3)
-                crater_y = random.randint(size//3, size*5//3)
-                crater_size = random.randint(size//6, size//3)
-                crater_color = (180, 150, 120)
-                pygame.draw.circle(self.surface, crater_color, (crater_x, crater_y), crater_size)
-        
-        elif planet_type == "Ocean":
-            # Add small islands
-            for _ in range(3):
-                island_x = random.randint(size//3, size*5//3)
-                island_y = random.randint(size//3, size*5//3)
-                island_size = random.randint(size//8, size//4)
-                island_color = (0, 150, 0)
-                pygame.draw.circle(self.surface, island_color, (island_x, island_y), island_size)
-    
-    def render(self, screen, player_x, player_y):
+        # Texture variant, generated (or loaded from the texture cache) when first needed
+        self.seed = random.randrange(textures.TEXTURE_VARIANTS)
+    
+    @property
+    def surface(self):
+        """The planet's shared textured sprite"""
+        return sprites.get_sprite(("Planet", self.planet_type, self.size, self.seed),
+                                  textures.get_planet_surface, self.seed, self.planet_type, self.size, self.color)
+    
+    def render(self, render_queue, player_x, player_y):
         """Render the planet"""
         # Calculate screen position relative to player
-        screen_x = screen.get_width() // 2 + (self.x - player_x)
-        screen_y = screen.get_height() // 2 + (self.y - player_y)
+        screen_x = render_queue.get_width() // 2 + (self.x - player_x)
+        screen_y = render_queue.get_height() // 2 + (self.y - player_y)
         
         # Check if planet is on screen (with some margin)
-        if -100 <= screen_x <= screen.get_width() + 100 and -100 <= screen_y <= screen.get_height() + 100:
+        if -100 <= screen_x <= render_queue.get_width() + 100 and -100 <= screen_y <= render_queue.get_height() + 100:
             # Get the rect for positioning
             planet_rect = self.surface.get_rect(center=(screen_x, screen_y))
             
             # Draw the planet
-            screen.blit(self.surface, planet_rect)
+            render_queue.submit(self.surface, planet_rect, LAYER_BODIES)
             
             # Draw name above planet
-            font = pygame.font.SysFont(None, 20)
-            name_text = font.render(f"{self.name} ({self.planet_type})", True, (200, 200, 255))
-            screen.blit(name_text, (screen_x - name_text.get_width() // 2, screen_y - self.size - 25))
+            name_text = fonts.render_text(f"{self.name} ({self.planet_type})", 20, (200, 200, 255))
+            render_queue.submit(name_text, (screen_x - name_text.get_width() // 2, screen_y - self.size - 25), LAYER_LABELS)
+
+def draw_station_surface(station_type, size, color):
+    """Draw a space station's surface"""
+    surface = pygame.Surface((size * 3, size * 3), pygame.SRCALPHA)
+    
+    # Draw station - varies by type
+    if station_type == "Trading Post":
+        # Central hub with extending arms
+        pygame.draw.circle(surface, color, (size * 3 // 2, size * 3 // 2), size // 2)
+        
+        # Draw extending arms
+        arm_width = size // 3
+        for i in range(4):
+            angle = i * math.pi / 2
+            arm_x = size * 3 // 2 + math.cos(angle) * size
+            arm_y = size * 3 // 2 + math.sin(angle) * size
+            
+            pygame.draw.line(surface, color, 
+                           (size * 3 // 2, size * 3 // 2),
+                           (int(arm_x), int(arm_y)), arm_width)
+            
+            # Add a "pod" at the end of each arm
+            pygame.draw.circle(surface, color, (int(arm_x), int(arm_y)), size // 3)
+    
+    elif station_type == "Military Base":
+        # Central structure with defensive emplacements
+        pygame.draw.rect(surface, color, 
+                       (size * 3 // 2 - size // 2, size * 3 // 2 - size // 2, 
+                        size, size))
+        
+        # Add defensive turrets
+        for i in range(4):
+            angle = i * math.pi / 2 + math.pi / 4
+            turret_x = size * 3 // 2 + math.cos(angle) * size * 0.8
+            turret_y = size * 3 // 2 + math.sin(angle) * size * 0.8
+            
+            pygame.draw.circle(surface, (200, 50, 50), 
+                             (int(turret_x), int(turret_y)), size // 5)
+    
+    elif station_type == "Research Facility":
+        # Ring structure with central lab
+        pygame.draw.circle(surface, color, (size * 3 // 2, size * 3 // 2), size, 4)
+        pygame.draw.circle(surface, color, (size * 3 // 2, size * 3 // 2), size // 3)
+        
+        # Add sensor dishes
+        for i in range(3):
+            angle = i * 2 * math.pi / 3
+            sensor_x = size * 3 // 2 + math.cos(angle) * size
+            sensor_y = size * 3 // 2 + math.sin(angle) * size
+            
+            pygame.draw.circle(surface, (200, 100, 200), 
+                             (int(sensor_x), int(sensor_y)), size // 4)
+    
+    elif station_type == "Mining Outpost":
+        # Asymmetric structure with mining arms
+        pygame.draw.rect(surface, color, 
+                       (size * 3 // 2 - size // 3, size * 3 // 2 - size // 3, 
+                        size * 2 // 3, size * 2 // 3))
+        
+        # Add mining arms
+        for i in range(2):
+            angle = i * math.pi
+            arm_length = size * 1.2
+            arm_x = size * 3 // 2 + math.cos(angle) * arm_length
+            arm_y = size * 3 // 2 + math.sin(angle) * arm_length
+            
+            pygame.draw.line(surface, color, 
+                           (size * 3 // 2, size * 3 // 2),
+                           (int(arm_x), int(arm_y)), size // 4)
+            
+            # Add drill
+            pygame.draw.polygon(surface, (100, 100, 50), 
+                              [(int(arm_x), int(arm_y)),
+                               (int(arm_x + size//4), int(arm_y + size//4)),
+                               (int(arm_x - size//4), int(arm_y + size//4))])
+    
+    return surface
 
 class SpaceStation(Entity):
     """A space station that can be traded with"""
+    __slots__ = ('x', 'y', 'size', 'rotation', 'station_type', 'name', 'tech_level', 'color', 'can_trade', 'seed')
+    
     def __init__(self, x, y, size, station_type, name, tech_level):
         super().__init__(x, y, size, "SpaceStation")
         self.station_type = station_type
@@ -153,105 +211,80 @@ class SpaceStation(Entity):
         else:
             self.color = (150, 150, 150)  # Gray default
         
-        # Create surface for better performance
-        self.surface = pygame.Surface((size * 3, size * 3), pygame.SRCALPHA)
-        
-        # Draw station - varies by type
-        if station_type == "Trading Post":
-            # Central hub with extending arms
-            pygame.draw.circle(self.surface, self.color, (size * 3 // 2, size * 3 // 2), size // 2)
-            
-            # Draw extending arms
-            arm_width = size // 3
-            for i in range(4):
-                angle = i * math.pi / 2
-                arm_x = size * 3 // 2 + math.cos(angle) * size
-                arm_y = size * 3 // 2 + math.sin(angle) * size
-                
-                pygame.draw.line(self.surface, self.color, 
-                               (size * 3 // 2, size * 3 // 2),
-                               (int(arm_x), int(arm_y)), arm_width)
-                
-                # Add a "pod" at the end of each arm
-                pygame.draw.circle(self.surface, self.color, (int(arm_x), int(arm_y)), size // 3)
-        
-        elif station_type == "Military Base":
-            # Central structure with defensive emplacements
-            pygame.draw.rect(self.surface, self.color, 
-                           (size * 3 // 2 - size // 2, size * 3 // 2 - size // 2, 
-                            size, size))
-            
-            # Add defensive turrets
-            for i in range(4):
-                angle = i * math.pi / 2 + math.pi / 4
-                turret_x = size * 3 // 2 + math.cos(angle) * size * 0.8
-                turret_y = size * 3 // 2 + math.sin(angle) * size * 0.8
-                
-                pygame.draw.circle(self.surface, (200, 50, 50), 
-                                 (int(turret_x), int(turret_y)), size // 5)
-        
-        elif station_type == "Research Facility":
-            # Ring structure with central lab
-            pygame.draw.circle(self.surface, self.color, (size * 3 // 2, size * 3 // 2), size, 4)
-            pygame.draw.circle(self.surface, self.color, (size * 3 // 2, size * 3 // 2), size // 3)
-            
-            # Add sensor dishes
-            for i in range(3):
-                angle = i * 2 * math.pi / 3
-                sensor_x = size * 3 // 2 + math.cos(angle) * size
-                sensor_y = size * 3 // 2 + math.sin(angle) * size
-                
-                pygame.draw.circle(self.surface, (200, 100, 200), 
-                                 (int(sensor_x), int(sensor_y)), size // 4)
-        
-        elif station_type == "Mining Outpost":
-            # Asymmetric structure with mining arms
-            pygame.draw.rect(self.surface, self.color, 
-                           (size * 3 // 2 - size // 3, size * 3 // 2 - size // 3, 
-                            size * 2 // 3, size * 2 // 3))
-            
-            # Add mining arms
-            for i in range(2):
-                angle = i * math.pi
-                arm_length = size * 1.2
-                arm_x = size * 3 // 2 + math.cos(angle) * arm_length
-                arm_y = size * 3 // 2 + math.sin(angle) * arm_length
-                
-                pygame.draw.line(self.surface, self.color, 
-                               (size * 3 // 2, size * 3 // 2),
-                               (int(arm_x), int(arm_y)), size // 4)
-                
-                # Add drill
-                pygame.draw.polygon(self.surface, (100, 100, 50), 
-                                  [(int(arm_x), int(arm_y)),
-                                   (int(arm_x + size//4), int(arm_y + size//4)),
-                                   (int(arm_x - size//4), int(arm_y + size//4))])
+        # Hull texture variant
+        self.seed = random.randrange(textures.TEXTURE_VARIANTS)
+    
+    def sprite_args(self):
+        """Get the key, builder and builder arguments of the station's shared textured sprite"""
+        return (("SpaceStation", self.station_type, self.size, self.seed), textures.get_station_surface,
+                self.seed, self.station_type, self.size, self.color, draw_station_surface)
+    
+    @property
+    def surface(self):
+        """The station's shared textured sprite"""
+        return sprites.get_sprite(*self.sprite_args())
     
-    def render(self, screen, player_x, player_y):
+    def render(self, render_queue, player_x, player_y):
         """Render the space station"""
         # Calculate screen position relative to player
-        screen_x = screen.get_width() // 2 + (self.x - player_x)
-        screen_y = screen.get_height() // 2 + (self.y - player_y)
+        screen_x = render_queue.get_width() // 2 + (self.x - player_x)
+        screen_y = render_queue.get_height() // 2 + (self.y - player_y)
         
         # Check if station is on screen (with some margin)
-        if -100 <= screen_x <= screen.get_width() + 100 and -100 <= screen_y <= screen.get_height() + 100:
-            # Create a rotated copy of the station surface
+        if -100 <= screen_x <= render_queue.get_width() + 100 and -100 <= screen_y <= render_queue.get_height() + 100:
+            # Get the shared rotated copy of the station surface
             angle_degrees = math.degrees(self.rotation)
-            rotated_station = pygame.transform.rotate(self.surface, -angle_degrees)
+            key, *builder = self.sprite_args()
+            rotated_station = sprites.get_rotated(key, -angle_degrees, *builder)
             
             # Get the rect for positioning
             station_rect = rotated_station.get_rect(center=(screen_x, screen_y))
             
             # Draw the station
-            screen.blit(rotated_station, station_rect)
+            render_queue.submit(rotated_station, station_rect, LAYER_BODIES)
             
             # Draw name above station
-            font = pygame.font.SysFont(None, 20)
-            name_text = font.render(f"{self.name} ({self.station_type})", True, (200, 200, 255))
-            screen.blit(name_text, (screen_x - name_text.get_width() // 2, screen_y - self.size - 25))
+            name_text = fonts.render_text(f"{self.name} ({self.station_type})", 20, (200, 200, 255))
+            render_queue.submit(name_text, (screen_x - name_text.get_width() // 2, screen_y - self.size - 25), LAYER_LABELS)
+
+# Number of precomputed frames in the warp gate pulse animation
+GATE_PULSE_FRAMES = 32
+
+def draw_gate_frame(phase):
+    """Draw one frame of the warp gate pulse animation"""
+    surface = pygame.Surface((100, 100), pygame.SRCALPHA)
+    
+    # Draw gate structure
+    pygame.draw.circle(surface, (50, 100, 200), (50, 50), 30, 5)
+    
+    # Add some details
+    # Struts
+    for i in range(4):
+        angle = i * math.pi / 2
+        x1 = 50 + math.cos(angle) * 15
+        y1 = 50 + math.sin(angle) * 15
+        x2 = 50 + math.cos(angle) * 30
+        y2 = 50 + math.sin(angle) * 30
+        
+        pygame.draw.line(surface, (100, 150, 200), (x1, y1), (x2, y2), 3)
+    
+    # Calculate pulse effect (energy core pulsates)
+    pulse_factor = animation.pulse(phase)
+    pulse_color = (
+        int(100 + 155 * pulse_factor),
+        int(150 + 105 * pulse_factor),
+        255
+    )
+    
+    # Draw pulsing energy core
+    pygame.draw.circle(surface, pulse_color, (50, 50), 15)
+    
+    return surface
 
 class WarpGate(Entity):
     """A warp gate that connects star systems"""
+    __slots__ = ('x', 'y', 'size', 'rotation', 'direction', 'destination', 'active', 'pulse_time', 'pulse_max', 'animation')
+    
     def __init__(self, x, y, direction, destination):
         super().__init__(x, y, 30, "WarpGate")
         self.direction = direction  # N, E, S, W
@@ -270,25 +303,9 @@ class WarpGate(Entity):
         elif direction == "West":
             self.rotation = 3 * math.pi / 2
         
-        # Create surface for better performance
-        self.surface = pygame.Surface((100, 100), pygame.SRCALPHA)
-        
-        # Draw gate structure
-        pygame.draw.circle(self.surface, (50, 100, 200), (50, 50), 30, 5)
-        
-        # Add some details
-        # Struts
-        for i in range(4):
-            angle = i * math.pi / 2
-            x1 = 50 + math.cos(angle) * 15
-            y1 = 50 + math.sin(angle) * 15
-            x2 = 50 + math.cos(angle) * 30
-            y2 = 50 + math.sin(angle) * 30
-            
-            pygame.draw.line(self.surface, (100, 150, 200), (x1, y1), (x2, y2), 3)
-        
-        # Energy core
-        pygame.draw.circle(self.surface, (150, 200, 255), (50, 50), 15)
+        # Pulse animation is precomputed once and shared by all gates
+        self.animation = animation.get_animation(
+            ("WarpGate", self.pulse_max), GATE_PULSE_FRAMES, self.pulse_max, draw_gate_frame)
     
     def update(self, delta_time, player=None):
         """Update gate state"""
@@ -299,146 +316,128 @@ class WarpGate(Entity):
         if self.pulse_time > self.pulse_max:
             self.pulse_time = 0
     
-    def render(self, screen, player_x, player_y):
+    def render(self, render_queue, player_x, player_y):
         """Render the warp gate"""
         # Calculate screen position relative to player
-        screen_x = screen.get_width() // 2 + (self.x - player_x)
-        screen_y = screen.get_height() // 2 + (self.y - player_y)
+        screen_x = render_queue.get_width() // 2 + (self.x - player_x)
+        screen_y = render_queue.get_height() // 2 + (self.y - player_y)
         
         # Check if gate is on screen (with some margin)
-        if -100 <= screen_x <= screen.get_width() + 100 and -100 <= screen_y <= screen.get_height() + 100:
-            # Create a copy of the gate surface with pulsing effect
-            gate_surface = self.surface.copy()
-            
-            # Calculate pulse effect (energy core pulsates)
-            pulse_factor = abs(math.sin(self.pulse_time * math.pi / self.pulse_max))
-            pulse_color = (
-                int(100 + 155 * pulse_factor),
-                int(150 + 105 * pulse_factor),
-                255
-            )
-            
-            # Draw pulsing energy core
-            pygame.draw.circle(gate_surface, pulse_color, (50, 50), 15)
+        if -100 <= screen_x <= render_queue.get_width() + 100 and -100 <= screen_y <= render_queue.get_height() + 100:
+            # Pick the precomputed frame for the current pulse time
+            gate_surface = self.animation.frame_at(self.pulse_time)
             
             # Get the rect for positioning
             gate_rect = gate_surface.get_rect(center=(screen_x, screen_y))
             
             # Draw the gate
-            screen.blit(gate_surface, gate_rect)
+            render_queue.submit(gate_surface, gate_rect, LAYER_GATES)
             
             # Draw direction text
-            font = pygame.font.SysFont(None, 20)
-            text = font.render(f"{self.direction} Gate", True, (200, 200, 255))
-            screen.blit(text, (screen_x - text.get_width() // 2, screen_y - self.size - 15))
+            text = fonts.render_text(f"{self.direction} Gate", 20, (200, 200, 255))
+            render_queue.submit(text, (screen_x - text.get_width() // 2, screen_y - self.size - 15), LAYER_LABELS)
             
             # If destination is known, show it
             if self.destination:
-                dest_text = font.render(f"To: {self.destination.name}", True, (200, 200, 255))
-                screen.blit(dest_text, (screen_x - dest_text.get_width() // 2, screen_y - self.size - 35))
-    
-    def check_collision(self, player):
-        """Check if player has entered the gate"""
-        distance = math.sqrt((self.x - player.x)**2 + (self.y - player.y)**2)
-        return distance < 20  # Smaller than visual size to require deliberate entry
+                dest_text = fonts.render_text(f"To: {self.destination.name}", 20, (200, 200, 255))
+                render_queue.submit(dest_text, (screen_x - dest_text.get_width() // 2, screen_y - self.size - 35), LAYER_LABELS)
 
-class Asteroid(Entity):
-    """An asteroid that can be mined or is an obstacle"""
-    def __init__(self, x, y, size, rotation, asteroid_type):
-        super().__init__(x, y, size, "Asteroid")
-        self.rotation = rotation
-        self.rotation_speed = random.uniform(-0.5, 0.5)
-        self.vx = random.uniform(-5, 5)
-        self.vy = random.uniform(-5, 5)
-        self.asteroid_type = asteroid_type
-        
-        # Determine color based on type
-        if asteroid_type == "Iron":
-            self.color = (150, 100, 50)
-        elif asteroid_type == "Ice":
-            self.color = (200, 200, 255)
-        elif asteroid_type == "Carbon":
-            self.color = (50, 50, 50)
-        elif asteroid_type == "Precious":
-            self.color = (212, 175, 55)  # Gold-ish
-        else:
-            self.color = (150, 150, 150)
-        
-        # Create asteroid shape (irregular polygon)
-        self.points = []
-        num_points = random.randint(6, 10)
-        for i in range(num_points):
-            angle = i * 2 * math.pi / num_points
-            # Random distance from center
-            dist = size * random.uniform(0.7, 1.3)
-            x = math.cos(angle) * dist
-            y = math.sin(angle) * dist
-            self.points.append((x, y))
-        
-        # Create surface
-        self.surface = pygame.Surface((size * 3, size * 3), pygame.SRCALPHA)
-        
-        # Convert points to surface coordinates
-        surface_points = [(size * 3 // 2 + pt[0], size * 3 // 2 + pt[1]) for pt in self.points]
-        
-        # Draw asteroid
-        pygame.draw.polygon(self.surface, self.color, surface_points)
-        
-        # Add some craters or details
-        for _ in range(random.randint(2, 5)):
-            crater_x = random.randint(size * 3 // 4, size * 9 // 4)
-            crater_y = random.randint(size * 3 // 4, size * 9 // 4)
-            crater_size = random.randint(size // 6, size // 3)
-            
-            # Slightly darker color for craters
-            crater_color = (
-                max(0, self.color[0] - 30),
-                max(0, self.color[1] - 30),
-                max(0, self.color[2] - 30)
-            )
-            
-            pygame.draw.circle(self.surface, crater_color, (crater_x, crater_y), crater_size)
+def draw_ship_surface(ship_type, size, color):
+    """Draw an enemy ship's surface"""
+    surface = pygame.Surface((size * 3, size * 3), pygame.SRCALPHA)
     
-    def update(self, delta_time, player=None):
-        """Update asteroid state"""
-        super().update(delta_time)
-        
-        # Move asteroid
-        self.x += self.vx * delta_time
-        self.y += self.vy * delta_time
-        
-        # Wrap around edges of system (crude method, would use better in full implementation)
-        if self.x < -500:
-            self.x = 1500
-        elif self.x > 1500:
-            self.x = -500
-            
-        if self.y < -500:
-            self.y = 1500
-        elif self.y > 1500:
-            self.y = -500
+    # Ship shape varies by type
+    if ship_type == "Pirate":
+        # Sleek, asymmetric design
+        points = [
+            (size * 3 // 2, size * 3 // 2 - size),  # Front
+            (size * 3 // 2 + size * 0.7, size * 3 // 2 + size * 0.5),  # Right
+            (size * 3 // 2, size * 3 // 2 + size * 0.3),  # Back middle
+            (size * 3 // 2 - size * 0.7, size * 3 // 2 + size * 0.5)   # Left
+        ]
+        pygame.draw.polygon(surface, color, points)
+        
+        # Add details (engine glow, etc)
+        pygame.draw.circle(surface, (255, 150, 0), 
+                         (size * 3 // 2, size * 3 // 2 + size * 0.3), size // 3)
     
-    def render(self, screen, player_x, player_y):
-        """Render the asteroid"""
-        # Calculate screen position relative to player
-        screen_x = screen.get_width() // 2 + (self.x - player_x)
-        screen_y = screen.get_height() // 2 + (self.y - player_y)
-        
-        # Check if asteroid is on screen (with some margin)
-        if -100 <= screen_x <= screen.get_width() + 100 and -100 <= screen_y <= screen.get_height() + 100:
-            # Create a rotated copy of the asteroid surface
-            angle_degrees = math.degrees(self.rotation)
-            rotated_asteroid = pygame.transform.rotate(self.surface, -angle_degrees)
-            
-            # Get the rect for positioning
-            asteroid_rect = rotated_asteroid.get_rect(center=(screen_x, screen_y))
-            
-            # Draw the asteroid
-            screen.blit(rotated_asteroid, asteroid_rect)
+    elif ship_type == "Trader":
+        # Bulky, symmetric design
+        pygame.draw.rect(surface, color, 
+                       (size * 3 // 2 - size * 0.5, size * 3 // 2 - size * 0.8, 
+                        size, size * 1.6))
+        
+        # Cargo containers on sides
+        pygame.draw.rect(surface, (color[0], color[1], max(0, color[2] - 50)), 
+                       (size * 3 // 2 - size * 1.2, size * 3 // 2 - size * 0.5, 
+                        size * 0.6, size))
+        pygame.draw.rect(surface, (color[0], color[1], max(0, color[2] - 50)), 
+                       (size * 3 // 2 + size * 0.6, size * 3 // 2 - size * 0.5, 
+                        size * 0.6, size))
+        
+        # Engine
+        pygame.draw.rect(surface, (100, 100, 150), 
+                       (size * 3 // 2 - size * 0.3, size * 3 // 2 + size * 0.8, 
+                        size * 0.6, size * 0.3))
+    
+    elif ship_type == "Police" or ship_type == "Military":
+        # Angular, symmetric design
+        points = [
+            (size * 3 // 2, size * 3 // 2 - size),  # Front
+            (size * 3 // 2 + size, size * 3 // 2),  # Right
+            (size * 3 // 2 + size * 0.5, size * 3 // 2 + size),  # Right back
+            (size * 3 // 2 - size * 0.5, size * 3 // 2 + size),  # Left back
+            (size * 3 // 2 - size, size * 3 // 2)   # Left
+        ]
+        pygame.draw.polygon(surface, color, points)
+        
+        # Add details
+        if ship_type == "Police":
+            # Police lights
+            pygame.draw.circle(surface, (255, 0, 0), 
+                             (size * 3 // 2 - size * 0.3, size * 3 // 2 - size * 0.3), 
+                             size * 0.2)
+            pygame.draw.circle(surface, (0, 0, 255), 
+                             (size * 3 // 2 + size * 0.3, size * 3 // 2 - size * 0.3), 
+                             size * 0.2)
+        else:  # Military
+            # Weapon hardpoints
+            pygame.draw.rect(surface, (100, 100, 100), 
+                           (int(size * 3 // 2 - size * 0.7), int(size * 3 // 2 - size * 0.3), 
+                            int(size * 0.3), int(size * 0.6)))
+            pygame.draw.rect(surface, (100, 100, 100), 
+                           (int(size * 3 // 2 + size * 0.4), int(size * 3 // 2 - size * 0.3), 
+                            int(size * 0.3), int(size * 0.6)))
+    
+    return surface
 
 class EnemyShip(Entity):
     """An enemy ship that can attack or trade with the player"""
+    __slots__ = ('ship_type', 'level', 'max_speed',
+                 'health', 'max_health', 'damage', 'fire_rate', 'fire_timer', 'aggression',
+                 'state', 'waypoint_timer', 'detection_range',
+                 'color', 'surface', 'fleet', 'index')
+    
+    # Kinematic state lives in the fleet's arrays so the fleet can steer every ship at once
+    x = fleet_property('x')
+    y = fleet_property('y')
+    vx = fleet_property('vx')
+    vy = fleet_property('vy')
+    rotation = fleet_property('rotation')
+    thrust = fleet_property('thrust')
+    target_x = fleet_property('target_x')
+    target_y = fleet_property('target_y')
+    size = fleet_property('size')
+    
+    # Where the ship is drawn, between its last two steps (see Fleet.interpolate)
+    view_x = fleet_property('view_x')
+    view_y = fleet_property('view_y')
+    view_rotation = fleet_property('view_rotation')
+    
     def __init__(self, x, y, ship_type, level):
+        # Ships start in a fleet of their own until added to a system
+        Fleet(1).add(self)
+        
         size = 10 + level * 2  # Bigger ships for higher levels
         super().__init__(x, y, size, "EnemyShip")
         self.ship_type = ship_type
@@ -486,80 +485,21 @@ class EnemyShip(Entity):
         self.create_ship_surface()
     
     def create_ship_surface(self):
-        """Create the ship's visual appearance"""
-        self.surface = pygame.Surface((self.size * 3, self.size * 3), pygame.SRCALPHA)
-        
-        # Ship shape varies by type
-        if self.ship_type == "Pirate":
-            # Sleek, asymmetric design
-            points = [
-                (self.size * 3 // 2, self.size * 3 // 2 - self.size),  # Front
-                (self.size * 3 // 2 + self.size * 0.7, self.size * 3 // 2 + self.size * 0.5),  # Right
-                (self.size * 3 // 2, self.size * 3 // 2 + self.size * 0.3),  # Back middle
-                (self.size * 3 // 2 - self.size * 0.7, self.size * 3 // 2 + self.size * 0.5)   # Left
-            ]
-            pygame.draw.polygon(self.surface, self.color, points)
-            
-            # Add details (engine glow, etc)
-            pygame.draw.circle(self.surface, (255, 150, 0), 
-                             (self.size * 3 // 2, self.size * 3 // 2 + self.size * 0.3), self.size // 3)
-        
-        elif self.ship_type == "Trader":
-            # Bulky, symmetric design
-            pygame.draw.rect(self.surface, self.color, 
-                           (self.size * 3 // 2 - self.size * 0.5, self.size * 3 // 2 - self.size * 0.8, 
-                            self.size, self.size * 1.6))
-            
-            # Cargo containers on sides
-            pygame.draw.rect(self.surface, (self.color[0], self.color[1], max(0, self.color[2] - 50)), 
-                           (self.size * 3 // 2 - self.size * 1.2, self.size * 3 // 2 - self.size * 0.5, 
-                            self.size * 0.6, self.size))
-            pygame.draw.rect(self.surface, (self.color[0], self.color[1], max(0, self.color[2] - 50)), 
-                           (self.size * 3 // 2 + self.size * 0.6, self.size * 3 // 2 - self.size * 0.5, 
-                            self.size * 0.6, self.size))
-            
-            # Engine
-            pygame.draw.rect(self.surface, (100, 100, 150), 
-                           (self.size * 3 // 2 - self.size * 0.3, self.size * 3 // 2 + self.size * 0.8, 
-                            self.size * 0.6, self.size * 0.3))
-        
-        elif self.ship_type == "Police" or self.ship_type == "Military":
-            # Angular, symmetric design
-            points = [
-                (self.size * 3 // 2, self.size * 3 // 2 - self.size),  # Front
-                (self.size * 3 // 2 + self.size, self.size * 3 // 2),  # Right
-                (self.size * 3 // 2 + self.size * 0.5, self.size * 3 // 2 + self.size),  # Right back
-                (self.size * 3 // 2 - self.size * 0.5, self.size * 3 // 2 + self.size),  # Left back
-                (self.size * 3 // 2 - self.size, self.size * 3 // 2)   # Left
-            ]
-            pygame.draw.polygon(self.surface, self.color, points)
-            
-            # Add details
-            if self.ship_type == "Police":
-                # Police lights
-                pygame.draw.circle(self.surface, (255, 0, 0), 
-                                 (self.size * 3 // 2 - self.size * 0.3, self.size * 3 // 2 - self.size * 0.3), 
-                                 self.size * 0.2)
-                pygame.draw.circle(self.surface, (0, 0, 255), 
-                                 (self.size * 3 // 2 + self.size * 0.3, self.size * 3 // 2 - self.size * 0.3), 
-                                 self.size * 0.2)
-            else:  # Military
-                # Weapon hardpoints
-                pygame.draw.rect(self.surface, (100, 100, 100), 
-                               (int(self.size * 3 // 2 - self.size * 0.7), int(self.size * 3 // 2 - self.size * 0.3), 
-                                int(self.size * 0.3), int(self.size * 0.6)))
-                pygame.draw.rect(self.surface, (100, 100, 100), 
-                               (int(self.size * 3 // 2 + self.size * 0.4), int(self.size * 3 // 2 - self.size * 0.3), 
-                                int(self.size * 0.3), int(self.size * 0.6)))
+        """Look up the ship's shared visual appearance"""
+        # Ships of the same type and level are pixel-identical, so they share one sprite
+        self.surface = sprites.get_sprite(("EnemyShip", self.ship_type, self.level),
+                                          draw_ship_surface, self.ship_type, int(self.size), self.color)
     
-    def update(self, delta_time, player=None):
-        """Update enemy ship state"""
-        super().update(delta_time)
+    def think(self, delta_time, player, perception):
+        """Update enemy ship decisions (movement is done by the system's fleet)
         
+        Called by the system's think scheduler with the time since this
+        ship last thought and the perception shared by this think tick.
+        """
         # AI behavior
         if player:
             # Check if player is within detection range
-            distance_to_player = math.sqrt((self.x - player.x)**2 + (self.y - player.y)**2)
+            distance_to_player = perception.distance_to_player(self)
             
             if distance_to_player < self.detection_range:
                 # Check aggression to determine behavior
@@ -584,7 +524,7 @@ class EnemyShip(Entity):
                     self.fire_timer += delta_time
                     if self.fire_timer >= 1.0 / self.fire_rate:
                         self.fire_timer = 0
-                        # Would fire a projectile here in full implementation
+                        perception.request_fire(self, self.choose_weapon())
         
         # Patrol behavior
         if self.state == "PATROL":
@@ -594,56 +534,45 @@ class EnemyShip(Entity):
                 # Pick a new random waypoint
                 self.target_x = self.x + random.uniform(-200, 200)
                 self.target_y = self.y + random.uniform(-200, 200)
-        
-        # Move toward target
-        angle_to_target = math.atan2(self.target_y - self.y, self.target_x - self.x)
-        
-        # Gradually rotate toward target angle
-        angle_diff = ((angle_to_target - self.rotation + math.pi) % (2 * math.pi)) - math.pi
-        self.rotation += angle_diff * 2 * delta_time  # Adjust rotation speed as needed
-        
-        # Apply thrust in current direction
-        thrust_factor = min(1.0, distance_to_player / 100) if self.state == "ATTACK" else 1.0
-        self.vx += math.cos(self.rotation) * self.thrust * thrust_factor * delta_time
-        self.vy += math.sin(self.rotation) * self.thrust * thrust_factor * delta_time
-        
-        # Apply drag (more when close to target to avoid overshooting)
-        distance_to_target = math.sqrt((self.x - self.target_x)**2 + (self.y - self.target_y)**2)
-        drag_factor = 0.1 + 0.9 * max(0, 1 - distance_to_target / 100)
-        self.vx *= (1 - drag_factor * delta_time)
-        self.vy *= (1 - drag_factor * delta_time)
-        
-        # Apply movement
-        self.x += self.vx * delta_time
-        self.y += self.vy * delta_time
     
-    def render(self, screen, player_x, player_y):
-        """Render the enemy ship"""
+    def choose_weapon(self):
+        """Pick the weapon for the next shot ("laser", "missile" or "mine")"""
+        roll = random.random()
+        if self.ship_type == "Military" and self.level >= 3 and roll < 0.25:
+            return "missile"  # Military ships carry guided missiles
+        if self.ship_type == "Pirate" and roll < 0.1:
+            return "mine"  # Pirates drop mines to cover themselves
+        return "laser"
+    
+    def render(self, render_queue, player_x, player_y):
+        """Render the enemy ship at its interpolated position"""
         # Calculate screen position relative to player
-        screen_x = screen.get_width() // 2 + (self.x - player_x)
-        screen_y = screen.get_height() // 2 + (self.y - player_y)
+        screen_x = render_queue.get_width() // 2 + (self.view_x - player_x)
+        screen_y = render_queue.get_height() // 2 + (self.view_y - player_y)
+        rotation = self.view_rotation
         
         # Check if ship is on screen (with some margin)
-        if -100 <= screen_x <= screen.get_width() + 100 and -100 <= screen_y <= screen.get_height() + 100:
-            # Create a rotated copy of the ship surface
-            angle_degrees = math.degrees(self.rotation)
-            rotated_ship = pygame.transform.rotate(self.surface, -angle_degrees)
+        if -100 <= screen_x <= render_queue.get_width() + 100 and -100 <= screen_y <= render_queue.get_height() + 100:
+            # Get the shared rotated copy of the ship surface
+            angle_degrees = math.degrees(rotation)
+            rotated_ship = sprites.get_rotated(("EnemyShip", self.ship_type, self.level), -angle_degrees,
+                                               draw_ship_surface, self.ship_type, int(self.size), self.color)
             
             # Get the rect for positioning
             ship_rect = rotated_ship.get_rect(center=(screen_x, screen_y))
             
             # Draw the ship
-            screen.blit(rotated_ship, ship_rect)
+            render_queue.submit(rotated_ship, ship_rect, LAYER_SHIPS)
             
             # Draw engine glow if moving
             if abs(self.vx) > 5 or abs(self.vy) > 5:
                 # Calculate engine position
-                engine_x = screen_x - math.cos(self.rotation) * self.size
-                engine_y = screen_y - math.sin(self.rotation) * self.size
+                engine_x = screen_x - math.cos(rotation) * self.size
+                engine_y = screen_y - math.sin(rotation) * self.size
                 
                 # Draw engine glow
-                pygame.draw.circle(screen, (255, 165, 0), 
-                                 (int(engine_x), int(engine_y)), self.size // 3)
+                render_queue.submit_draw(LAYER_SHIPS, pygame.draw.circle, (255, 165, 0), 
+                                         (int(engine_x), int(engine_y)), self.size // 3)
             
             # Draw health bar if damaged
             if self.health < self.max_health:
@@ -651,11 +580,11 @@ class EnemyShip(Entity):
                 health_percentage = self.health / self.max_health
                 
                 # Background bar (red)
-                pygame.draw.rect(screen, (200, 0, 0), 
-                               (screen_x - bar_width // 2, screen_y - self.size - 10, 
-                                bar_width, 5))
+                render_queue.submit_draw(LAYER_LABELS, pygame.draw.rect, (200, 0, 0), 
+                                         (screen_x - bar_width // 2, screen_y - self.size - 10, 
+                                          bar_width, 5))
                 
                 # Health bar (green)
-                pygame.draw.rect(screen, (0, 200, 0), 
-                               (screen_x - bar_width // 2, screen_y - self.size - 10, 
-                                int(bar_width * health_percentage), 5))
+                render_queue.submit_draw(LAYER_LABELS, pygame.draw.rect, (0, 200, 0), 
+                                         (screen_x - bar_width // 2, screen_y - self.size - 10, 
+                                          int(bar_width * health_percentage), 5))
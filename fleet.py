@@ -0,0 +1,205 @@
+import math
+import numpy as np
+
+"""
+Vectorized fleet steering with AI level of detail.
+
+Every enemy ship in a system keeps its kinematic state (position, velocity,
+heading, thrust and steering target) in the system's Fleet arrays, and the
+fleet steers all ships due for an update in one vectorized pass. Ships far
+from the player are updated less often, with the skipped time folded into
+their next step, so large battles stay cheap. Decisions are made separately
+by the AI think scheduler (see ai.py).
+"""
+
+# Distances from the player where the near and mid LOD tiers end
+LOD_DISTANCES = (800, 2000)
+
+# Frames between updates in each LOD tier (near, mid, far)
+LOD_INTERVALS = np.array([1, 4, 16])
+
+# Longest time step a ship takes in one update (keeps slow tiers stable)
+MAX_STEP = 0.25
+
+# Per-ship kinematic arrays (size is the collision radius)
+FLEET_FIELDS = ('x', 'y', 'vx', 'vy', 'rotation', 'thrust', 'target_x', 'target_y', 'size')
+
+# Per-ship bookkeeping arrays (moved along with the kinematics)
+STATE_FIELDS = ('attacking', 'elapsed', 'think_elapsed')
+
+# Per-ship state at the start of the last step, and as drawn between it and the current one
+VIEW_FIELDS = ('prev_x', 'prev_y', 'prev_rotation', 'view_x', 'view_y', 'view_rotation')
+
+def fleet_property(name):
+    """A ship attribute stored in its fleet's arrays"""
+    def getter(ship):
+        return float(getattr(ship.fleet, name)[ship.index])
+    
+    def setter(ship, value):
+        getattr(ship.fleet, name)[ship.index] = value
+    
+    return property(getter, setter)
+
+class Fleet:
+    """Struct-of-arrays store and steering for the enemy ships in a system"""
+    def __init__(self, capacity=16):
+        self.count = 0
+        self.ships = []  # Ship at each index
+        self.frame = 0
+        self.allocate(capacity)
+        
+        # Distance from each ship to the player, refreshed every update
+        self.player_distance = np.zeros(0)
+        
+        # Per-frame counters
+        self.stats = {'ships': 0, 'tier_ships': [0, 0, 0], 'tier_ticks': [0, 0, 0]}
+    
+    def allocate(self, capacity):
+        """Create (or grow) the backing arrays, keeping existing ships"""
+        old = getattr(self, 'x', None)
+        arrays = {name: np.float64 for name in FLEET_FIELDS + VIEW_FIELDS}
+        arrays['attacking'] = np.bool_
+        arrays['elapsed'] = np.float64
+        arrays['think_elapsed'] = np.float64
+        for name, dtype in arrays.items():
+            array = np.zeros(capacity, dtype=dtype)
+            if old is not None:
+                array[:self.count] = getattr(self, name)[:self.count]
+            setattr(self, name, array)
+        self.capacity = capacity
+    
+    def __len__(self):
+        return self.count
+    
+    def add(self, ship):
+        """Move a ship into this fleet, keeping its current state"""
+        if self.count == self.capacity:
+            self.allocate(self.capacity * 2)
+        
+        index = self.count
+        old_fleet = getattr(ship, 'fleet', None)
+        if old_fleet is not None:
+            for name in FLEET_FIELDS + STATE_FIELDS:
+                getattr(self, name)[index] = getattr(old_fleet, name)[ship.index]
+            old_fleet.release(ship.index)
+        
+        # A ship joining a fleet is drawn where it is until its next step
+        self.prev_x[index] = self.view_x[index] = self.x[index]
+        self.prev_y[index] = self.view_y[index] = self.y[index]
+        self.prev_rotation[index] = self.view_rotation[index] = self.rotation[index]
+        
+        self.ships.append(ship)
+        self.count += 1
+        ship.fleet = self
+        ship.index = index
+    
+    def remove(self, ship):
+        """Take a ship out of this fleet (it keeps its state in a fleet of its own)"""
+        if ship.fleet is self:
+            Fleet(1).add(ship)
+    
+    def release(self, index):
+        """Free an index (the last ship takes it over)"""
+        last = self.count - 1
+        if index != last:
+            for name in FLEET_FIELDS + STATE_FIELDS + VIEW_FIELDS:
+                array = getattr(self, name)
+                array[index] = array[last]
+            moved = self.ships[last]
+            self.ships[index] = moved
+            moved.index = index
+        self.ships.pop()
+        self.count = last
+    
+    def update(self, delta_time, player=None):
+        """Steer every ship whose LOD tier is due this frame"""
+        n = self.count
+        self.frame += 1
+        if n == 0:
+            self.player_distance = np.zeros(0)
+            self.stats = {'ships': 0, 'tier_ships': [0, 0, 0], 'tier_ticks': [0, 0, 0]}
+            return
+        
+        # Where each ship starts this step, to draw it between steps
+        self.prev_x[:n] = self.x[:n]
+        self.prev_y[:n] = self.y[:n]
+        self.prev_rotation[:n] = self.rotation[:n]
+        
+        elapsed = self.elapsed[:n]
+        elapsed += delta_time
+        
+        # Distance to the player picks each ship's LOD tier
+        if player is not None:
+            distance = np.hypot(self.x[:n] - player.x, self.y[:n] - player.y)
+            tier = np.searchsorted(LOD_DISTANCES, distance, side='right')
+        else:
+            # Nobody to see the ships, so there is nothing to scale against
+            distance = np.full(n, math.inf)
+            tier = np.zeros(n, dtype=np.intp)
+        self.player_distance = distance
+        
+        # Ships in a tier are staggered across its interval
+        due = (self.frame + np.arange(n)) % LOD_INTERVALS[tier] == 0
+        ticking = np.nonzero(due)[0]
+        step = np.minimum(elapsed[ticking], MAX_STEP)
+        
+        # Movement for all of them at once
+        self.steer(ticking, step, distance[ticking])
+        elapsed[ticking] = 0
+        
+        self.stats = {
+            'ships': n,
+            'tier_ships': np.bincount(tier, minlength=3).tolist(),
+            'tier_ticks': np.bincount(tier[ticking], minlength=3).tolist()
+        }
+    
+    def interpolate(self, alpha):
+        """Set the drawn state a fraction alpha of the way from the previous step to the current one"""
+        n = self.count
+        prev_x = self.prev_x[:n]
+        prev_y = self.prev_y[:n]
+        prev_rotation = self.prev_rotation[:n]
+        self.view_x[:n] = prev_x + (self.x[:n] - prev_x) * alpha
+        self.view_y[:n] = prev_y + (self.y[:n] - prev_y) * alpha
+        
+        # Headings turn the short way round, across 0 if need be
+        turn = np.mod(self.rotation[:n] - prev_rotation + math.pi, 2 * math.pi) - math.pi
+        self.view_rotation[:n] = prev_rotation + turn * alpha
+    
+    def steer(self, indices, delta_time, distance_to_player):
+        """Turn, thrust, drag and move the ships at the given indices"""
+        if len(indices) == 0:
+            return
+        
+        x = self.x[indices]
+        y = self.y[indices]
+        vx = self.vx[indices]
+        vy = self.vy[indices]
+        rotation = self.rotation[indices]
+        dx = self.target_x[indices] - x
+        dy = self.target_y[indices] - y
+        
+        # Gradually rotate toward target angle
+        angle_to_target = np.arctan2(dy, dx)
+        angle_diff = np.mod(angle_to_target - rotation + math.pi, 2 * math.pi) - math.pi
+        rotation = np.mod(rotation + angle_diff * 2 * delta_time, 2 * math.pi)
+        
+        # Apply thrust in current direction (attackers ease off near the player)
+        thrust_factor = np.where(self.attacking[indices], np.minimum(1.0, distance_to_player / 100), 1.0)
+        thrust = self.thrust[indices] * thrust_factor * delta_time
+        vx += np.cos(rotation) * thrust
+        vy += np.sin(rotation) * thrust
+        
+        # Apply drag (more when close to target to avoid overshooting)
+        distance_to_target = np.hypot(dx, dy)
+        drag_factor = 0.1 + 0.9 * np.maximum(0, 1 - distance_to_target / 100)
+        drag = 1 - drag_factor * delta_time
+        vx *= drag
+        vy *= drag
+        
+        # Apply movement
+        self.x[indices] = x + vx * delta_time
+        self.y[indices] = y + vy * delta_time
+        self.vx[indices] = vx
+        self.vy[indices] = vy
+        self.rotation[indices] = rotation
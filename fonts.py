@@ -0,0 +1,127 @@
+import pygame
+from collections import OrderedDict
+
+"""
+Shared font and rendered-text cache.
+
+Fonts are created once per (face, size) and rendered text surfaces are kept
+in a bounded LRU keyed by (text, size, color, antialias, face), so labels that
+are drawn every frame are only rasterized the first time they appear.
+"""
+
+# Maximum number of rendered text surfaces kept in the cache
+MAX_CACHED_SURFACES = 512
+
+# Characters pre-rendered for the numeric fast path
+NUMBER_GLYPHS = "0123456789-+.,/:% "
+
+# Font sizes used by the game (preloaded so no font is built mid-frame)
+GAME_FONT_SIZES = (16, 18, 20, 24, 32, 48)
+
+class TextCache:
+    """Caches font objects and rendered text surfaces"""
+    def __init__(self, max_surfaces=MAX_CACHED_SURFACES):
+        self.fonts = {}  # (face, size) -> pygame.font.Font
+        self.surfaces = OrderedDict()  # (text, size, color, antialias, face) -> Surface
+        self.glyphs = {}  # (size, color, face) -> {char: Surface}
+        self.max_surfaces = max_surfaces
+
+        # Cache statistics
+        self.hits = 0
+        self.misses = 0
+
+    def get_font(self, size, face=None):
+        """Get a font, creating it only the first time it is requested"""
+        key = (face, size)
+        font = self.fonts.get(key)
+        if font is None:
+            font = pygame.font.SysFont(face, size)
+            self.fonts[key] = font
+        return font
+
+    def preload(self, sizes=GAME_FONT_SIZES, face=None):
+        """Create fonts ahead of time so they are never built during a frame"""
+        for size in sizes:
+            self.get_font(size, face)
+
+    def render(self, text, size, color, antialias=True, face=None):
+        """Get a rendered text surface, rasterizing it only on a cache miss"""
+        key = (text, size, tuple(color), antialias, face)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            # Mark as most recently used
+            self.surfaces.move_to_end(key)
+            self.hits += 1
+            return surface
+
+        self.misses += 1
+        surface = self.get_font(size, face).render(text, antialias, color)
+        self.surfaces[key] = surface
+
+        # Evict least recently used surfaces
+        while len(self.surfaces) > self.max_surfaces:
+            self.surfaces.popitem(last=False)
+
+        return surface
+
+    def get_glyphs(self, size, color, face=None):
+        """Get the pre-rendered numeric glyphs for a size and color"""
+        key = (size, tuple(color), face)
+        glyphs = self.glyphs.get(key)
+        if glyphs is None:
+            font = self.get_font(size, face)
+            glyphs = {char: font.render(char, True, color) for char in NUMBER_GLYPHS}
+            self.glyphs[key] = glyphs
+        return glyphs
+
+    def number_size(self, text, size, color, face=None):
+        """Get the (width, height) a numeric string occupies when drawn from glyphs"""
+        glyphs = self.get_glyphs(size, color, face)
+        width = 0
+        height = 0
+        for char in text:
+            glyph = glyphs[char]
+            width += glyph.get_width()
+            height = max(height, glyph.get_height())
+        return width, height
+
+    def blit_number(self, screen, value, pos, size, color, face=None, center=False):
+        """Draw a frequently changing number by composing cached glyphs
+
+        Returns the width drawn. Unlike render(), this never rasterizes or
+        caches a surface per distinct value.
+        """
+        text = value if isinstance(value, str) else str(value)
+        glyphs = self.get_glyphs(size, color, face)
+
+        x, y = pos
+        if center:
+            width, height = self.number_size(text, size, color, face)
+            x -= width // 2
+            y -= height // 2
+
+        # Build the glyph sequence and draw it in one call
+        start_x = x
+        blits = []
+        for char in text:
+            glyph = glyphs[char]
+            blits.append((glyph, (x, y)))
+            x += glyph.get_width()
+        screen.blits(blits, doreturn=False)
+
+        return x - start_x
+
+# Shared cache used by the whole game
+text_cache = TextCache()
+
+def get_font(size, face=None):
+    """Get a cached font"""
+    return text_cache.get_font(size, face)
+
+def render_text(text, size, color, antialias=True, face=None):
+    """Get a cached rendered text surface"""
+    return text_cache.render(text, size, color, antialias, face)
+
+def blit_number(screen, value, pos, size, color, face=None, center=False):
+    """Draw a number from cached glyphs"""
+    return text_cache.blit_number(screen, value, pos, size, color, face, center)
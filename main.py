@@ -10,7 +10,10 @@ from universe import Universe
 from economy import Economy
 from ui import UI
 from combat import CombatManager
-from entities import Entity, Planet, SpaceStation, WarpGate, Asteroid, EnemyShip
+import fonts
+from renderer import RenderQueue
+from triggers import ZONE_TRADE, ZONE_GATE, EVENT_ENTER
+from entities import Entity, Planet, SpaceStation, WarpGate, EnemyShip
 
 # Initialize pygame
 pygame.init()
@@ -21,6 +24,10 @@ pygame.mixer.init()
 SCREEN_WIDTH = 1024
 SCREEN_HEIGHT = 768
 FPS = 60
+SIMULATION_RATE = 120  # Fixed simulation steps per second
+FIXED_DT = 1.0 / SIMULATION_RATE
+MAX_SUBSTEPS = 8  # Most steps run in one frame (longer hitches are dropped)
+ECONOMY_INTERVAL = 5.0  # Seconds between economy updates
 GAME_TITLE = "Stellar Merchants"
 VERSION = "0.1"
 
@@ -53,6 +60,7 @@ class Game:
         
         # Mark starting system as explored
         starting_system.explored = True
+        starting_system.warm_textures()
         
         # Player
         self.player = Player(self.screen_width // 2, self.screen_height // 2, starting_system)
@@ -66,9 +74,15 @@ class Game:
         # Combat
         self.combat_manager = CombatManager(self.player, self.universe)
         
+        # Batched renderer for world sprites
+        self.render_queue = RenderQueue(self.screen)
+        
         # Time tracking
         self.last_time = pygame.time.get_ticks()
-        self.delta_time = 0
+        self.delta_time = 0  # Real time of the last frame
+        self.accumulator = 0.0  # Real time not yet simulated
+        self.render_alpha = 0.0  # How far rendering is between the last two steps
+        self.economy_timer = 0.0
         
         # Load resources
         self.load_resources()
@@ -80,7 +94,9 @@ class Game:
         
         # You could add sounds like:
         # self.laser_sound = pygame.mixer.Sound('assets/sounds/laser.wav')
-        pass
+        
+        # Build all fonts up front so none are created during a frame
+        fonts.text_cache.preload()
     
     def handle_events(self):
         """Process game events"""
@@ -121,6 +137,10 @@ class Game:
                     if self.game_state == "PLAYING":
                         self.player.fire_weapon()
                 
+                elif event.key == K_b and self.game_state == "PLAYING":
+                    # Switch between laser bolts and hitscan beams
+                    self.player.beam_mode = not self.player.beam_mode
+                
                 elif event.key == K_RETURN and self.game_state == "MENU":
                     # Handle menu selection with Enter key
                     selection = self.ui.main_menu_items[self.ui.selected_menu_item]
@@ -159,38 +179,51 @@ class Game:
             self.ui.handle_event(event, self.game_state)
     
     def update(self):
-        """Update game state"""
+        """Advance the simulation in fixed steps to catch up with real time"""
         # Calculate delta time
         current_time = pygame.time.get_ticks()
         self.delta_time = (current_time - self.last_time) / 1000.0  # Convert to seconds
         self.last_time = current_time
         
+        if self.game_state == "PLAYING":
+            # A long hitch is clamped instead of being simulated in one huge burst
+            self.accumulator += min(self.delta_time, MAX_SUBSTEPS * FIXED_DT)
+            while self.accumulator >= FIXED_DT:
+                self.step(FIXED_DT)
+                self.accumulator -= FIXED_DT
+            self.render_alpha = self.accumulator / FIXED_DT
+        else:
+            # The simulation is paused outside of flight
+            self.accumulator = 0.0
+        
+        # Update UI regardless of state
+        self.ui.update(self.game_state, self.delta_time)
+    
+    def step(self, delta_time):
+        """Advance the simulation by one fixed step"""
         if self.game_state == "PLAYING":
             # Update player
-            self.player.update(self.delta_time)
+            self.player.update(delta_time)
             
-            # Check for warp gate interactions
-            for gate in self.player.current_system.warp_gates:
-                if gate.check_collision(self.player) and gate.destination:
-                    # Capture the player's current angle before warping
-                    entry_angle = self.player.angle
-                    self.warp_to_new_system(gate.destination, gate.direction, entry_angle)
+            # React to the trade and warp gate zones the player entered or left
+            events = self.player.current_system.triggers.update(
+                self.player.x, self.player.y, {ZONE_TRADE: self.player.trade_range})
+            self.handle_trigger_events(events)
             
             # Update entities in current system
-            self.universe.update_current_system(self.player.current_system, self.delta_time)
+            self.universe.update_current_system(self.player.current_system, delta_time, self.player)
             
             # Update combat
-            self.combat_manager.update(self.delta_time)
+            self.combat_manager.update(delta_time)
             
-            # Check for trading opportunities
-            self.player.update_trade_status()
+            # Entities destroyed during the tick leave the system now
+            self.player.current_system.flush_removed()
             
             # Economy updates (slower frequency)
-            if current_time % 5000 < self.delta_time * 1000:  # Every 5 seconds
+            self.economy_timer += delta_time
+            if self.economy_timer >= ECONOMY_INTERVAL:
+                self.economy_timer -= ECONOMY_INTERVAL
                 self.economy.update()
-        
-        # Update UI regardless of state
-        self.ui.update(self.game_state)
     
     def render(self):
         """Render the game"""
@@ -201,22 +234,34 @@ class Game:
             self.ui.render_menu()
             
         elif self.game_state == "PLAYING":
+            # Place the view between the last two simulation steps
+            self.player.interpolate(self.render_alpha)
+            
             # Render space background
             self.render_space_background()
             
-            # Render all entities in the current system
-            self.universe.render_current_system(self.screen, self.player)
+            # Queue all entities in the current system
+            self.universe.render_current_system(self.render_queue, self.player, self.render_alpha)
             
-            # Render player
-            self.player.render(self.screen)
+            # Queue player
+            self.player.render(self.render_queue)
             
-            # Render combat effects
-            self.combat_manager.render(self.screen)
+            # Queue combat effects
+            self.combat_manager.render(self.render_queue, self.render_alpha)
+            
+            # Draw the queued world in layer order
+            self.render_queue.flush()
             
             # Render UI elements
             self.ui.render_hud()
             self.ui.render_minimap()
             
+            # Per-frame renderer counters
+            if self.ui.show_debug:
+                self.ui.render_debug_overlay(self.render_queue.stats,
+                                             self.combat_manager.projectiles.get_stats(),
+                                             self.combat_manager.particles.get_stats())
+            
         elif self.game_state == "TRADING":
             self.ui.render_trading_interface()
             
@@ -262,10 +307,26 @@ class Game:
             color = (brightness, brightness, brightness)
             pygame.draw.circle(self.screen, color, (int(star['x']), int(star['y'])), star['radius'])
     
+    def handle_trigger_events(self, events):
+        """Pass trigger zone events on to whatever reacts to them"""
+        for event, zone in events:
+            if zone.kind == ZONE_TRADE:
+                self.player.on_trade_zone(event, zone)
+            elif zone.kind == ZONE_GATE and event == EVENT_ENTER and zone.entity.destination:
+                # Capture the player's current angle before warping
+                gate = zone.entity
+                self.warp_to_new_system(gate.destination, gate.direction, self.player.angle)
+                break
+    
     def warp_to_new_system(self, destination_system, entry_direction, entry_angle):
         """Handle warping to a new star system"""
+        # The player leaves every zone of the old system
+        self.handle_trigger_events(self.player.current_system.triggers.clear())
         self.player.current_system = destination_system
         
+        # Textures are made during the warp rather than on the first frame the body is seen
+        destination_system.warm_textures()
+        
         # Determine exit gate based on entry direction
         opposite_direction = {
             "North": "South",
@@ -278,7 +339,7 @@ class Game:
         
         # Find the exit gate in the destination system
         exit_gate = None
-        for gate in destination_system.warp_gates:
+        for gate in destination_system.entities.of_type("WarpGate"):
             if gate.direction == exit_direction:
                 exit_gate = gate
                 break
@@ -310,6 +371,9 @@ class Game:
             self.player.vx = 0
             self.player.vy = 0
         
+        # Don't interpolate across the jump
+        self.player.reset_interpolation()
+        
         # If the system was unexplored, mark it as explored
         destination_system.explored = True
         
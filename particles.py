@@ -0,0 +1,170 @@
+import pygame
+import math
+import numpy as np
+from renderer import LAYER_EFFECTS
+from soa import compact_fields
+
+"""
+Vectorized particle system.
+
+Particles live in fixed-capacity NumPy arrays and are moved, aged and
+removed in bulk. Their looks come from a pre-rendered atlas of small sprites,
+one per (kind, radius, life level), so drawing a particle is only a lookup and
+a blit and the whole system is queued as a single batch of blits. When the
+store is full, new particles are dropped, so the cost of a big firefight is
+capped.
+"""
+
+# Particle kinds
+KIND_FIRE = 0
+KIND_SMOKE = 1
+
+# Most particles alive at once
+PARTICLE_CAPACITY = 2048
+
+# Largest particle radius in the atlas (bigger particles are drawn at this size)
+MAX_RADIUS = 16
+
+# Number of fade steps in the atlas between a new and a dying particle
+LIFE_LEVELS = 8
+
+# Per-particle arrays
+PARTICLE_FIELDS = {
+    'x': np.float64, 'y': np.float64,
+    'vx': np.float64, 'vy': np.float64,
+    'size': np.float64,
+    'lifetime': np.float64, 'max_lifetime': np.float64,
+    'kind': np.int8
+}
+
+def draw_particle(kind, radius, life):
+    """Draw a particle of the given radius at a fraction of its lifetime left"""
+    surface = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+    
+    # Calculate alpha based on remaining lifetime
+    alpha = min(255, int(255 * life))
+    
+    # Calculate color with alpha
+    if kind == KIND_FIRE:
+        color = (255, 100 + int(155 * life), 0, alpha)
+    else:  # smoke
+        gray = 150 + int(105 * life)
+        color = (gray, gray, gray, alpha)
+    
+    # Particles shrink as they fade
+    pygame.draw.circle(surface, color, (radius, radius), max(1, int(radius * (0.5 + 0.5 * life))))
+    return surface
+
+class ParticleAtlas:
+    """Pre-rendered particle sprites indexed by kind, radius and life level"""
+    def __init__(self, max_radius=MAX_RADIUS, levels=LIFE_LEVELS):
+        self.max_radius = max_radius
+        self.levels = levels
+        
+        # frames[kind][radius][level], level 0 is nearly faded and the last is brand new
+        self.frames = [
+            [[draw_particle(kind, max(radius, 1), (level + 1) / levels) for level in range(levels)]
+             for radius in range(max_radius + 1)]
+            for kind in (KIND_FIRE, KIND_SMOKE)
+        ]
+
+class ParticleSystem:
+    """Fixed-capacity struct-of-arrays store of effect particles"""
+    def __init__(self, capacity=PARTICLE_CAPACITY):
+        self.capacity = capacity
+        self.count = 0
+        for name, dtype in PARTICLE_FIELDS.items():
+            setattr(self, name, np.zeros(capacity, dtype=dtype))
+        
+        # Sprites are drawn the first time they are needed (after pygame is up)
+        self.atlas = None
+        
+        # Particles that did not fit, in total
+        self.dropped = 0
+    
+    def __len__(self):
+        return self.count
+    
+    def emit(self, x, y, vx, vy, size, lifetime, kind):
+        """Add a batch of particles from matching arrays, dropping any that do not fit"""
+        count = min(len(x), self.capacity - self.count)
+        self.dropped += len(x) - count
+        if count <= 0:
+            return
+        
+        start = self.count
+        end = start + count
+        self.x[start:end] = x[:count]
+        self.y[start:end] = y[:count]
+        self.vx[start:end] = vx[:count]
+        self.vy[start:end] = vy[:count]
+        self.size[start:end] = size[:count]
+        self.lifetime[start:end] = lifetime[:count]
+        self.max_lifetime[start:end] = lifetime[:count]
+        self.kind[start:end] = kind[:count]
+        self.count = end
+    
+    def explode(self, x, y, size):
+        """Emit the particles of an explosion at the given position"""
+        # Number of particles based on size
+        count = int(size * 2)
+        
+        # Random velocity
+        angle = np.random.uniform(0, 2 * math.pi, count)
+        speed = np.random.uniform(50, 150, count)
+        
+        self.emit(
+            x + np.random.uniform(-size * 0.2, size * 0.2, count),
+            y + np.random.uniform(-size * 0.2, size * 0.2, count),
+            np.cos(angle) * speed,
+            np.sin(angle) * speed,
+            np.random.uniform(size * 0.2, size * 0.6, count),
+            np.random.uniform(0.3, 0.8, count),
+            # Determine particle type (fire or smoke)
+            np.where(np.random.random(count) < 0.7, KIND_FIRE, KIND_SMOKE)
+        )
+    
+    def update(self, delta_time):
+        """Move and age every particle, then drop expired ones"""
+        n = self.count
+        if n == 0:
+            return
+        
+        lifetime = self.lifetime[:n]
+        lifetime -= delta_time
+        self.x[:n] += self.vx[:n] * delta_time
+        self.y[:n] += self.vy[:n] * delta_time
+        
+        # Live particles from the end fill the slots of expired ones
+        compact_fields(self, PARTICLE_FIELDS, lifetime > 0)
+    
+    def render(self, render_queue, player_x, player_y):
+        """Queue every visible particle as one batch of atlas blits"""
+        n = self.count
+        if n == 0:
+            return
+        if self.atlas is None:
+            self.atlas = ParticleAtlas()
+        atlas = self.atlas
+        
+        # Atlas sprite for each particle
+        radius = np.clip(self.size[:n].astype(np.intp), 1, atlas.max_radius)
+        life = self.lifetime[:n] / self.max_lifetime[:n]
+        level = np.clip((life * atlas.levels).astype(np.intp), 0, atlas.levels - 1)
+        
+        # Top-left screen corner, culled to the screen
+        left = (render_queue.get_width() // 2 + (self.x[:n] - player_x)).astype(np.intp) - radius
+        top = (render_queue.get_height() // 2 + (self.y[:n] - player_y)).astype(np.intp) - radius
+        visible = np.nonzero((left > -2 * radius) & (left < render_queue.get_width()) &
+                             (top > -2 * radius) & (top < render_queue.get_height()))[0]
+        
+        frames = atlas.frames
+        render_queue.submit_many(LAYER_EFFECTS, [
+            (frames[k][r][l], (px, py))
+            for k, r, l, px, py in zip(self.kind[visible].tolist(), radius[visible].tolist(),
+                                       level[visible].tolist(), left[visible].tolist(), top[visible].tolist())
+        ])
+    
+    def get_stats(self):
+        """Get the number of live particles, the capacity and how many were dropped"""
+        return {'active': self.count, 'capacity': self.capacity, 'dropped': self.dropped}
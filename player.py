@@ -1,7 +1,11 @@
 import pygame
 import math
 from pygame.locals import *
-from projectile import Laser
+from projectile import ProjectileStore, OWNER_PLAYER
+from registry import PLAYER_HANDLE
+from triggers import EVENT_ENTER
+from cargo import CargoHold
+from renderer import LAYER_SHIPS
 
 class Player:
     def __init__(self, x, y, starting_system):
@@ -10,6 +14,14 @@ class Player:
         self.y = y
         self.angle = 0  # Angle in radians
         
+        # State at the previous simulation step, and the interpolated state drawn this frame
+        self.prev_x = x
+        self.prev_y = y
+        self.prev_angle = 0
+        self.view_x = x
+        self.view_y = y
+        self.view_angle = 0
+        
         # Movement
         self.vx = 0
         self.vy = 0
@@ -23,6 +35,7 @@ class Player:
         self.color = (0, 255, 0)  # Green ship
         self.shape = [(-self.size, -self.size/2), (self.size, 0), (-self.size, self.size/2)]
         self.hit_radius = self.size  # Collision detection
+        self.handle = PLAYER_HANDLE  # How missiles refer to the player as a target
         
         # Combat
         self.health = 100
@@ -32,18 +45,21 @@ class Player:
         self.weapon_cooldown = 0
         self.weapon_cooldown_max = 0.3  # Seconds between shots
         self.weapon_damage = 10
-        self.projectiles = []  # List of active projectiles
+        self.projectiles = ProjectileStore()  # Every projectile in flight (shared with the combat manager)
+        self.beam_mode = False  # Fire hitscan beams instead of laser bolts
+        self.beam_shots = []  # Beams fired this frame, resolved by the combat manager
         
         # Economy
         self.credits = 1000
-        self.cargo = {}  # Dictionary of goods and quantities
-        self.cargo_capacity = 10  # Units of cargo
+        self.cargo = CargoHold(10)  # Goods by commodity name, 10 units of space
         
         # Navigation
         self.current_system = starting_system
         self.is_near_station = False
         self.nearest_trade_entity = None
+        self.trade_entities = []  # Trade entities whose zone holds the player (see on_trade_zone)
         self.trade_range = 100  # Distance at which trading is possible
+        self.radar_range = 600  # Distance at which ships show on the minimap
         
         # Upgrades
         self.engine_level = 1
@@ -69,21 +85,21 @@ class Player:
         pygame.draw.polygon(self.ship_surface, (255, 165, 0), 
                           [(self.size * 3 // 2 + pt[0], self.size * 3 // 2 + pt[1]) for pt in engine_points])
     
-    def handle_input(self):
-        """Process keyboard input for the player ship"""
+    def handle_input(self, delta_time):
+        """Process keyboard input for the player ship over one simulation step"""
         keys = pygame.key.get_pressed()
         
         # Rotation
         if keys[K_LEFT]:
-            self.angle -= self.rotation_speed * (1/60)  # Assuming 60 FPS
+            self.angle -= self.rotation_speed * delta_time
         if keys[K_RIGHT]:
-            self.angle += self.rotation_speed * (1/60)
+            self.angle += self.rotation_speed * delta_time
         
         # Thrust
         if keys[K_UP]:
             # Calculate thrust vector based on angle
-            thrust_x = self.thrust * math.cos(self.angle) * (1/60)
-            thrust_y = self.thrust * math.sin(self.angle) * (1/60)
+            thrust_x = self.thrust * math.cos(self.angle) * delta_time
+            thrust_y = self.thrust * math.sin(self.angle) * delta_time
             
             # Apply thrust
             self.vx += thrust_x
@@ -97,8 +113,13 @@ class Player:
     
     def update(self, delta_time):
         """Update player state"""
+        # Remember the last state so rendering can interpolate toward this one
+        self.prev_x = self.x
+        self.prev_y = self.y
+        self.prev_angle = self.angle
+        
         # Handle keyboard input
-        self.handle_input()
+        self.handle_input(delta_time)
         
         # Apply drag
         self.vx *= (1 - self.drag * delta_time)
@@ -114,55 +135,48 @@ class Player:
         # Update weapon cooldown
         if self.weapon_cooldown > 0:
             self.weapon_cooldown -= delta_time
-        
-        # Update projectiles
-        for projectile in self.projectiles[:]:
-            projectile.update(delta_time)
-            # Remove projectiles that have expired
-            if projectile.lifetime <= 0:
-                self.projectiles.remove(projectile)
-        
-        # Check distance to trade entities
-        self.update_trade_status()
     
-    def render(self, screen):
-        """Render the player ship"""
+    def interpolate(self, alpha):
+        """Set the drawn state a fraction alpha of the way from the previous step to the current one"""
+        self.view_x = self.prev_x + (self.x - self.prev_x) * alpha
+        self.view_y = self.prev_y + (self.y - self.prev_y) * alpha
+        self.view_angle = self.prev_angle + (self.angle - self.prev_angle) * alpha
+    
+    def reset_interpolation(self):
+        """Draw the current state as is (after a jump such as a warp)"""
+        self.prev_x = self.view_x = self.x
+        self.prev_y = self.view_y = self.y
+        self.prev_angle = self.view_angle = self.angle
+    
+    def render(self, render_queue):
+        """Submit the player ship to the render queue"""
         # Get screen dimensions
-        screen_width = screen.get_width()
-        screen_height = screen.get_height()
+        screen_width = render_queue.get_width()
+        screen_height = render_queue.get_height()
         
         # Position the ship at the center of the screen
         screen_center_x = screen_width // 2
         screen_center_y = screen_height // 2
         
         # Create a rotated copy of the ship surface
-        angle_degrees = math.degrees(self.angle)
+        angle_degrees = math.degrees(self.view_angle)
         rotated_ship = pygame.transform.rotate(self.ship_surface, -angle_degrees)
         
         # Get the rect for positioning
         ship_rect = rotated_ship.get_rect(center=(screen_center_x, screen_center_y))
         
         # Draw the ship
-        screen.blit(rotated_ship, ship_rect)
+        render_queue.submit(rotated_ship, ship_rect, LAYER_SHIPS)
         
         # Draw engine glow when thrusting (would be more sophisticated)
         keys = pygame.key.get_pressed()
         if keys[K_UP]:
             # Calculate engine position
-            engine_x = screen_center_x - math.cos(self.angle) * self.size
-            engine_y = screen_center_y - math.sin(self.angle) * self.size
+            engine_x = screen_center_x - math.cos(self.view_angle) * self.size
+            engine_y = screen_center_y - math.sin(self.view_angle) * self.size
             
             # Draw engine glow
-            pygame.draw.circle(screen, (255, 165, 0), (int(engine_x), int(engine_y)), 5)
-        
-        # Render all projectiles
-        for projectile in self.projectiles:
-            # Calculate projectile position relative to player
-            screen_x = screen_center_x + (projectile.x - self.x)
-            screen_y = screen_center_y + (projectile.y - self.y)
-            
-            # We need to modify the projectile's render method to accept custom coordinates
-            projectile.render_at(screen, screen_x, screen_y)
+            render_queue.submit_draw(LAYER_SHIPS, pygame.draw.circle, (255, 165, 0), (int(engine_x), int(engine_y)), 5)
         
         # Debug: draw hit radius
         # pygame.draw.circle(screen, (255, 0, 0), (int(self.x), int(self.y)), self.hit_radius, 1)
@@ -177,9 +191,12 @@ class Player:
             spawn_x = self.x + math.cos(self.angle) * self.size
             spawn_y = self.y + math.sin(self.angle) * self.size
             
-            # Create new projectile
-            new_laser = Laser(spawn_x, spawn_y, self.angle, self.weapon_damage)
-            self.projectiles.append(new_laser)
+            if self.beam_mode:
+                # Beams hit instantly, so they are only queued for the combat manager
+                self.beam_shots.append((spawn_x, spawn_y, self.angle, self.weapon_damage))
+            else:
+                # Create new projectile
+                self.projectiles.fire_laser(spawn_x, spawn_y, self.angle, self.weapon_damage, OWNER_PLAYER)
             
             # Play sound (would be implemented in full game)
             # self.laser_sound.play()
@@ -220,34 +237,15 @@ class Player:
     
     def add_cargo(self, item, quantity):
         """Add items to cargo hold if there's space"""
-        # Calculate current cargo usage
-        current_cargo = sum(self.cargo.values())
-        
-        if current_cargo + quantity <= self.cargo_capacity:
-            # There's enough space
-            if item in self.cargo:
-                self.cargo[item] += quantity
-            else:
-                self.cargo[item] = quantity
-            return True
-        return False  # Not enough space
+        return self.cargo.add(item, quantity)
     
     def remove_cargo(self, item, quantity):
         """Remove items from cargo"""
-        if item in self.cargo and self.cargo[item] >= quantity:
-            self.cargo[item] -= quantity
-            
-            # Remove item completely if quantity is 0
-            if self.cargo[item] == 0:
-                del self.cargo[item]
-            
-            return True
-        return False  # Not enough of this item
+        return self.cargo.remove(item, quantity)
     
     def get_cargo_space_remaining(self):
-        """Calculate remaining cargo space"""
-        current_cargo = sum(self.cargo.values())
-        return self.cargo_capacity - current_cargo
+        """Get remaining cargo space"""
+        return self.cargo.space_remaining()
     
     def upgrade_engine(self):
         """Upgrade the ship's engine"""
@@ -271,26 +269,27 @@ class Player:
     def upgrade_cargo(self):
         """Upgrade the ship's cargo capacity"""
         self.cargo_level += 1
-        self.cargo_capacity += 5  # Add 5 units per upgrade
+        self.cargo.capacity += 5  # Add 5 units per upgrade
     
     def upgrade_sensors(self):
         """Upgrade the ship's sensors"""
         self.sensor_level += 1
         self.trade_range *= 1.2
+        self.radar_range *= 1.2
     
-    def update_trade_status(self):
-        """Check if player is near a planet or station for trading"""
-        self.is_near_station = False
-        self.nearest_trade_entity = None
+    def on_trade_zone(self, event, zone):
+        """Track the trade entities in range as the player enters and leaves their zones"""
+        if event == EVENT_ENTER:
+            self.trade_entities.append(zone.entity)
+        elif zone.entity in self.trade_entities:
+            self.trade_entities.remove(zone.entity)
         
-        # Check distance to all trade entities in current system
-        for entity in self.current_system.entities:
-            if hasattr(entity, 'can_trade') and entity.can_trade:
-                distance = math.sqrt((self.x - entity.x)**2 + (self.y - entity.y)**2)
-                if distance <= self.trade_range:
-                    self.is_near_station = True
-                    self.nearest_trade_entity = entity
-                    break
+        # Trade with the nearest one in range
+        self.nearest_trade_entity = min(
+            self.trade_entities,
+            key=lambda entity: (entity.x - self.x) ** 2 + (entity.y - self.y) ** 2,
+            default=None)
+        self.is_near_station = self.nearest_trade_entity is not None
     
     def can_trade(self):
         """Check if player can trade now"""
@@ -1,209 +1,371 @@
 import pygame
 import math
+import numpy as np
+import animation
+import sprites
+from renderer import LAYER_PROJECTILES
+from registry import NO_HANDLE
+from soa import compact_fields
 
-class Projectile:
-    """Base class for all projectiles"""
-    def __init__(self, x, y, angle, damage):
-        self.x = x
-        self.y = y
-        self.angle = angle
-        self.damage = damage
-        self.speed = 0
-        self.lifetime = 0
-        self.max_lifetime = 0
-        self.color = (255, 255, 255)
-        self.size = 2
-    
-    def update(self, delta_time):
-        """Update projectile position"""
-        # Move in the direction of angle
-        self.x += math.cos(self.angle) * self.speed * delta_time
-        self.y += math.sin(self.angle) * self.speed * delta_time
-        
-        # Decrease lifetime
-        self.lifetime -= delta_time
-    
-    def render(self, screen):
-        """Render the projectile"""
-        # Draw projectile
-        pygame.draw.circle(screen, self.color, (int(self.x), int(self.y)), self.size)
-    
-    def render_at(self, screen, screen_x, screen_y):
-        """Render the projectile at the specified screen coordinates"""
-        # Draw projectile at the given position
-        pygame.draw.circle(screen, self.color, (int(screen_x), int(screen_y)), self.size)
-    
-    def check_collision(self, entity):
-        """Check if projectile collides with an entity"""
-        if hasattr(entity, 'hit_radius'):
-            radius = entity.hit_radius
-        else:
-            radius = entity.size
-            
-        distance = math.sqrt((self.x - entity.x)**2 + (self.y - entity.y)**2)
-        return distance < radius + self.size
-
-class Laser(Projectile):
-    """A basic laser projectile"""
-    def __init__(self, x, y, angle, damage):
-        super().__init__(x, y, angle, damage)
-        self.speed = 600  # Pixels per second
-        self.lifetime = 1.0  # Seconds
-        self.max_lifetime = 1.0
-        self.color = (255, 0, 0)  # Red laser
-        self.length = 20  # Laser length
-        self.width = 2    # Laser width
-    
-    def render_at(self, screen, screen_x, screen_y):
-        """Render the laser at the specified screen coordinates"""
-        # Calculate end position
-        end_x = screen_x - math.cos(self.angle) * self.length
-        end_y = screen_y - math.sin(self.angle) * self.length
-        
-        # Draw laser trail
-        pygame.draw.line(screen, self.color, (screen_x, screen_y), (end_x, end_y), self.width)
-        
-        # Draw bright core
-        pygame.draw.line(screen, (255, 255, 255), (screen_x, screen_y), 
-                        (screen_x - math.cos(self.angle) * 5, screen_y - math.sin(self.angle) * 5), 1)
-
-class Missile(Projectile):
-    """A guided missile projectile"""
-    def __init__(self, x, y, angle, damage, target=None):
-        super().__init__(x, y, angle, damage)
-        self.speed = 200  # Slower than laser but tracks target
-        self.lifetime = 5.0  # Longer lifetime
-        self.max_lifetime = 5.0
-        self.color = (255, 200, 0)  # Yellow/orange
-        self.size = 3
-        self.target = target  # Entity to track
-        self.turn_rate = 3.0  # Radians per second
-        self.smoke_trail = []  # List of smoke particles
-    
-    def update(self, delta_time):
-        """Update missile position and tracking"""
-        # If we have a target, adjust angle to track it
-        if self.target and hasattr(self.target, 'x') and hasattr(self.target, 'y'):
-            # Calculate angle to target
-            target_angle = math.atan2(self.target.y - self.y, self.target.x - self.x)
-            
-            # Calculate angle difference
-            angle_diff = ((target_angle - self.angle + math.pi) % (2 * math.pi)) - math.pi
-            
-            # Adjust angle (limited by turn rate)
-            max_turn = self.turn_rate * delta_time
-            if abs(angle_diff) > max_turn:
-                angle_diff = max_turn if angle_diff > 0 else -max_turn
-            
-            self.angle += angle_diff
-        
-        # Call parent update for movement
-        super().update(delta_time)
-        
-        # Add smoke trail particle
-        if self.lifetime < self.max_lifetime - 0.1:  # Don't create smoke for the first 0.1s
-            self.smoke_trail.append({
-                'x': self.x,
-                'y': self.y,
-                'lifetime': 0.5,  # Smoke lifetime in seconds
-                'size': self.size * 0.8
-            })
-        
-        # Update smoke trail
-        for particle in self.smoke_trail[:]:
-            particle['lifetime'] -= delta_time
-            if particle['lifetime'] <= 0:
-                self.smoke_trail.remove(particle)
-    
-    def render(self, screen):
-        """Render the missile and its smoke trail"""
-        # Render smoke trail first (so missile appears on top)
-        for particle in self.smoke_trail:
-            # Calculate alpha based on remaining lifetime
-            alpha = min(255, int(255 * particle['lifetime'] / 0.5))
+"""
+Struct-of-arrays projectile store.
+
+Every shot in flight (player or enemy, laser, missile or mine) lives in one
+ProjectileStore that keeps position, heading, speed, lifetime, damage, owner
+and kind in NumPy arrays. The whole store is integrated in one vectorized
+step, missiles home with a vectorized turn-rate clamp, expired shots are
+compacted by moving live shots from the end into the freed slots, and lasers
+and mines are drawn as one batch of shared sprites. The position at the start
+of the last step is kept too, so collisions can test the path a projectile
+swept rather than only where it ended up. Missile smoke is written into a
+fixed-size ring buffer; a puff's age comes from its birth time, so nothing is
+ever removed and the cost of a missile swarm is bounded by the ring size.
+"""
+
+# Projectile kinds
+KIND_LASER = 0
+KIND_MISSILE = 1
+KIND_MINE = 2
+
+# Who fired a projectile
+OWNER_PLAYER = 0
+OWNER_ENEMY = 1
+
+# Per-kind properties, indexed by kind
+KIND_SPEED = np.array([600.0, 200.0, 0.0])  # Pixels per second
+KIND_LIFETIME = np.array([1.0, 5.0, 20.0])  # Seconds
+KIND_SIZE = np.array([2.0, 3.0, 6.0])  # Collision radius
+
+# Laser appearance
+LASER_COLOR = (255, 0, 0)  # Red laser
+LASER_LENGTH = 20
+LASER_WIDTH = 2
+
+# Missile behaviour and appearance
+MISSILE_COLOR = (255, 200, 0)  # Yellow/orange
+MISSILE_TURN_RATE = 3.0  # Radians per second
+MISSILE_SMOKE_DELAY = 0.1  # No smoke for the first 0.1s
+SMOKE_LIFETIME = 0.5  # Smoke lifetime in seconds
+
+# Smoke puffs kept at once (the oldest are overwritten when the ring is full)
+SMOKE_CAPACITY = 2048
+
+# Number of cached fade steps for smoke puff sprites
+SMOKE_ALPHA_LEVELS = 4
+
+# Mine behaviour and appearance
+MINE_COLOR = (255, 0, 0)
+MINE_ARM_TIME = 1.0  # Time before mine is armed
+MINE_PULSE_PERIOD = 1.0  # Seconds per pulse
+MINE_TRIGGER_RADIUS = 40  # Armed mines go off when a target comes this close
+MINE_BLAST_RADIUS = 80
+MISSILE_BLAST_RADIUS = 40
+
+# Radius of the blast when a projectile goes off, by kind (0 for direct hits only)
+KIND_BLAST_RADIUS = np.array([0.0, MISSILE_BLAST_RADIUS, MINE_BLAST_RADIUS])
+
+# Number of precomputed frames in the mine pulse animation
+MINE_PULSE_FRAMES = 16
+
+# Per-projectile arrays
+PROJECTILE_FIELDS = {
+    'x': np.float64, 'y': np.float64,
+    'prev_x': np.float64, 'prev_y': np.float64,
+    'angle': np.float64, 'speed': np.float64,
+    'lifetime': np.float64, 'max_lifetime': np.float64,
+    'damage': np.float64, 'size': np.float64,
+    'owner': np.int8, 'kind': np.int8,
+    'target': np.int64  # Handle of a missile's homing target
+}
+
+def draw_laser_sprite():
+    """Draw the laser sprite, pointing right and centered on the middle of the beam"""
+    surface = pygame.Surface((LASER_LENGTH + 2, LASER_WIDTH + 4), pygame.SRCALPHA)
+    center_y = surface.get_height() // 2
+    head_x = LASER_LENGTH + 1
+    
+    # Draw laser trail
+    pygame.draw.line(surface, LASER_COLOR, (1, center_y), (head_x, center_y), LASER_WIDTH)
+    
+    # Draw bright core
+    pygame.draw.line(surface, (255, 255, 255), (head_x - 5, center_y), (head_x, center_y), 1)
+    
+    return surface
+
+def draw_mine_frame(size, color, armed, phase):
+    """Draw one frame of the mine pulse animation"""
+    # Leave room for the spikes around the body
+    extent = int(size * 1.5) + 2
+    surface = pygame.Surface((extent * 2, extent * 2), pygame.SRCALPHA)
+    center_x = extent
+    center_y = extent
+    
+    # Calculate pulse value (0 to 1)
+    pulse_value = animation.pulse(phase)
+    
+    # Mine body
+    pygame.draw.circle(surface, color, (center_x, center_y), size)
+    
+    # Pulsing core
+    core_size = size * 0.5 * (0.5 + 0.5 * pulse_value)
+    
+    # Different color based on armed status
+    if armed:
+        core_color = (255, 255, 0)  # Yellow when armed
+    else:
+        core_color = (100, 100, 100)  # Gray when not armed
+        
+    pygame.draw.circle(surface, core_color, (center_x, center_y), int(core_size))
+    
+    # Spikes
+    for i in range(8):
+        angle = i * math.pi / 4
+        spike_x = center_x + math.cos(angle) * size
+        spike_y = center_y + math.sin(angle) * size
+        spike_length = size * 0.5
+        
+        # Draw spike
+        pygame.draw.line(surface, color,
+                       (spike_x, spike_y),
+                       (spike_x + math.cos(angle) * spike_length,
+                        spike_y + math.sin(angle) * spike_length),
+                       2)
+    
+    return surface
+
+def get_mine_animation(armed):
+    """Get the shared pulse animation for a mine's armed state"""
+    size = int(KIND_SIZE[KIND_MINE])
+    return animation.get_animation(
+        ("Mine", size, MINE_PULSE_PERIOD, armed),
+        MINE_PULSE_FRAMES, MINE_PULSE_PERIOD,
+        lambda phase: draw_mine_frame(size, MINE_COLOR, armed, phase))
+
+def draw_missile(screen, screen_x, screen_y, angle, size):
+    """Draw a missile body and engine glow at screen coordinates"""
+    # Missile body
+    pygame.draw.circle(screen, MISSILE_COLOR, (int(screen_x), int(screen_y)), size)
+    
+    # Engine glow
+    engine_x = screen_x - math.cos(angle) * size * 1.5
+    engine_y = screen_y - math.sin(angle) * size * 1.5
+    pygame.draw.circle(screen, (255, 100, 0), (int(engine_x), int(engine_y)), size * 0.8)
+
+def draw_smoke_puff(radius, alpha):
+    """Draw one missile smoke puff sprite"""
+    smoke_surface = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+    pygame.draw.circle(smoke_surface, (200, 200, 200, alpha), (radius, radius), radius)
+    return smoke_surface
+
+class ProjectileStore:
+    """Struct-of-arrays store for every projectile in flight"""
+    def __init__(self, capacity=256):
+        self.count = 0
+        self.allocate(capacity)
+        
+        # Missile smoke puffs, in a ring buffer written at smoke_head
+        self.clock = 0.0
+        self.smoke_head = 0
+        self.smoke_x = np.zeros(SMOKE_CAPACITY)
+        self.smoke_y = np.zeros(SMOKE_CAPACITY)
+        self.smoke_size = np.zeros(SMOKE_CAPACITY)
+        self.smoke_born = np.full(SMOKE_CAPACITY, -np.inf)
+    
+    def allocate(self, capacity):
+        """Create (or grow) the backing arrays, keeping existing projectiles"""
+        old = getattr(self, 'x', None)
+        for name, dtype in PROJECTILE_FIELDS.items():
+            array = np.zeros(capacity, dtype=dtype)
+            if old is not None:
+                array[:self.count] = getattr(self, name)[:self.count]
+            setattr(self, name, array)
+        self.capacity = capacity
+    
+    def __len__(self):
+        return self.count
+    
+    def spawn(self, kind, x, y, angle, damage, owner, target=NO_HANDLE):
+        """Add a projectile and return its index"""
+        if self.count == self.capacity:
+            self.allocate(self.capacity * 2)
+        
+        i = self.count
+        self.x[i] = x
+        self.y[i] = y
+        self.prev_x[i] = x
+        self.prev_y[i] = y
+        self.angle[i] = angle
+        self.speed[i] = KIND_SPEED[kind]
+        self.lifetime[i] = KIND_LIFETIME[kind]
+        self.max_lifetime[i] = KIND_LIFETIME[kind]
+        self.damage[i] = damage
+        self.size[i] = KIND_SIZE[kind]
+        self.owner[i] = owner
+        self.kind[i] = kind
+        self.target[i] = target
+        self.count += 1
+        return i
+    
+    def fire_laser(self, x, y, angle, damage, owner):
+        """Fire a laser"""
+        return self.spawn(KIND_LASER, x, y, angle, damage, owner)
+    
+    def fire_missile(self, x, y, angle, damage, owner, target=NO_HANDLE):
+        """Fire a missile that homes in on the target with the given handle"""
+        return self.spawn(KIND_MISSILE, x, y, angle, damage, owner, target)
+    
+    def deploy_mine(self, x, y, damage, owner):
+        """Deploy a stationary mine"""
+        return self.spawn(KIND_MINE, x, y, 0, damage, owner)
+    
+    def kill(self, index):
+        """Mark a projectile (or an array of them) as spent (removed by the next compact)"""
+        self.lifetime[index] = 0
+    
+    def compact(self):
+        """Remove spent projectiles, moving live ones from the end into their slots"""
+        compact_fields(self, PROJECTILE_FIELDS, self.lifetime[:self.count] > 0)
+    
+    def update(self, delta_time, resolve_target=None):
+        """Home, move and age every projectile, then drop expired ones
+        
+        resolve_target turns a target handle into the object it refers to, or
+        None once that object is gone (the missile then flies straight on).
+        """
+        n = self.count
+        self.clock += delta_time
+        if n > 0:
+            x = self.x[:n]
+            y = self.y[:n]
+            angle = self.angle[:n]
+            kind = self.kind[:n]
+            missiles = np.nonzero(kind == KIND_MISSILE)[0]
             
-            # Calculate color with alpha
-            smoke_color = (200, 200, 200, alpha)
+            # Missile homing, limited by turn rate
+            homing = []
+            targets = []
+            if resolve_target is not None:
+                for i in missiles[self.target[missiles] != NO_HANDLE].tolist():
+                    target = resolve_target(int(self.target[i]))
+                    if target is None:
+                        self.target[i] = NO_HANDLE
+                    else:
+                        homing.append(i)
+                        targets.append(target)
+            if homing:
+                target_x = np.array([target.x for target in targets])
+                target_y = np.array([target.y for target in targets])
+                
+                target_angle = np.arctan2(target_y - y[homing], target_x - x[homing])
+                angle_diff = np.mod(target_angle - angle[homing] + math.pi, 2 * math.pi) - math.pi
+                max_turn = MISSILE_TURN_RATE * delta_time
+                angle[homing] += np.clip(angle_diff, -max_turn, max_turn)
             
-            # Create a temporary surface for the smoke with alpha
-            smoke_surface = pygame.Surface((int(particle['size'] * 2), int(particle['size'] * 2)), 
-                                          pygame.SRCALPHA)
+            # Remember where each projectile started, so collisions can sweep the whole path
+            self.prev_x[:n] = x
+            self.prev_y[:n] = y
             
-            # Draw the smoke particle
-            pygame.draw.circle(smoke_surface, smoke_color, 
-                             (int(particle['size']), int(particle['size'])), 
-                             int(particle['size']))
+            # Move in the direction of angle
+            distance = self.speed[:n] * delta_time
+            x += np.cos(angle) * distance
+            y += np.sin(angle) * distance
             
-            # Blit the smoke surface to the screen
-            screen.blit(smoke_surface, 
-                      (int(particle['x'] - particle['size']), int(particle['y'] - particle['size'])))
-        
-        # Render missile itself
-        # Missile body
-        pygame.draw.circle(screen, self.color, (int(self.x), int(self.y)), self.size)
-        
-        # Engine glow
-        engine_x = self.x - math.cos(self.angle) * self.size * 1.5
-        engine_y = self.y - math.sin(self.angle) * self.size * 1.5
-        pygame.draw.circle(screen, (255, 100, 0), (int(engine_x), int(engine_y)), self.size * 0.8)
-
-class Mine(Projectile):
-    """A stationary mine that explodes on contact"""
-    def __init__(self, x, y, damage):
-        super().__init__(x, y, 0, damage)
-        self.speed = 0  # Doesn't move
-        self.lifetime = 20.0  # Long lifetime
-        self.max_lifetime = 20.0
-        self.color = (255, 0, 0)
-        self.size = 6
-        self.pulse_time = 0
-        self.pulse_period = 1.0  # Seconds per pulse
-        self.armed = False
-        self.arm_time = 1.0  # Time before mine is armed
-    
-    def update(self, delta_time):
-        """Update mine state"""
-        # Decrease lifetime
-        super().update(delta_time)
-        
-        # Update pulse time
-        self.pulse_time += delta_time
-        if self.pulse_time > self.pulse_period:
-            self.pulse_time = 0
-        
-        # Arm the mine after a delay
-        if not self.armed and self.max_lifetime - self.lifetime >= self.arm_time:
-            self.armed = True
-    
-    def render(self, screen):
-        """Render the mine with pulsing effect"""
-        # Calculate pulse value (0 to 1)
-        pulse_value = abs(math.sin(self.pulse_time * math.pi / self.pulse_period))
-        
-        # Mine body
-        pygame.draw.circle(screen, self.color, (int(self.x), int(self.y)), self.size)
-        
-        # Pulsing core
-        core_size = self.size * 0.5 * (0.5 + 0.5 * pulse_value)
-        
-        # Different color based on armed status
-        if self.armed:
-            core_color = (255, 255, 0)  # Yellow when armed
-        else:
-            core_color = (100, 100, 100)  # Gray when not armed
+            # Decrease lifetime
+            lifetime = self.lifetime[:n]
+            lifetime -= delta_time
             
-        pygame.draw.circle(screen, core_color, (int(self.x), int(self.y)), int(core_size))
-        
-        # Spikes
-        for i in range(8):
-            angle = i * math.pi / 4
-            spike_x = self.x + math.cos(angle) * self.size
-            spike_y = self.y + math.sin(angle) * self.size
-            spike_length = self.size * 0.5
+            # Smoke behind missiles past their launch delay
+            smoking = missiles[lifetime[missiles] < self.max_lifetime[missiles] - MISSILE_SMOKE_DELAY]
+            self.add_smoke(x[smoking], y[smoking], self.size[smoking] * 0.8)
+        
+        self.compact()
+    
+    def add_smoke(self, xs, ys, sizes):
+        """Write smoke puffs into the ring, over the oldest ones"""
+        count = min(len(xs), SMOKE_CAPACITY)
+        if count == 0:
+            return
+        
+        slots = (self.smoke_head + np.arange(count)) % SMOKE_CAPACITY
+        self.smoke_x[slots] = xs[-count:]
+        self.smoke_y[slots] = ys[-count:]
+        self.smoke_size[slots] = sizes[-count:]
+        self.smoke_born[slots] = self.clock
+        self.smoke_head = (self.smoke_head + count) % SMOKE_CAPACITY
+    
+    def query_owner(self, owner):
+        """Get indices of projectiles fired by an owner"""
+        return np.nonzero(self.owner[:self.count] == owner)[0]
+    
+    def render(self, render_queue, player_x, player_y, alpha=1.0):
+        """Submit visible projectiles to the render queue relative to player position
+        
+        Projectiles are drawn a fraction alpha of the way through their last step.
+        """
+        n = self.count
+        half_width = render_queue.get_width() // 2
+        half_height = render_queue.get_height() // 2
+        
+        # Smoke puffs still alive, as cached sprites at a few fade levels
+        age = self.clock - self.smoke_born
+        puffs = np.nonzero(age < SMOKE_LIFETIME)[0]
+        if len(puffs):
+            radius = np.maximum(self.smoke_size[puffs].astype(np.int32), 1)
+            level = np.minimum(((1 - age[puffs] / SMOKE_LIFETIME) * SMOKE_ALPHA_LEVELS).astype(np.int32),
+                               SMOKE_ALPHA_LEVELS - 1)
+            left = (half_width + (self.smoke_x[puffs] - player_x)).astype(np.int32) - radius
+            top = (half_height + (self.smoke_y[puffs] - player_y)).astype(np.int32) - radius
             
-            # Draw spike
-            pygame.draw.line(screen, self.color,
-                           (spike_x, spike_y),
-                           (spike_x + math.cos(angle) * spike_length,
-                            spike_y + math.sin(angle) * spike_length),
-                           2)
+            # Smoke is queued as blits, which the queue draws before the missiles on the same layer
+            render_queue.submit_many(LAYER_PROJECTILES, [
+                (sprites.get_sprite(("Smoke", r, l), draw_smoke_puff, r, 255 * (l + 1) // SMOKE_ALPHA_LEVELS), (px, py))
+                for r, l, px, py in zip(radius.tolist(), level.tolist(), left.tolist(), top.tolist())
+            ])
+        
+        if n == 0:
+            return
+        
+        # Screen positions, culled to the screen (with some margin)
+        prev_x = self.prev_x[:n]
+        prev_y = self.prev_y[:n]
+        screen_x = half_width + (prev_x + (self.x[:n] - prev_x) * alpha - player_x)
+        screen_y = half_height + (prev_y + (self.y[:n] - prev_y) * alpha - player_y)
+        visible = ((screen_x >= -50) & (screen_x <= render_queue.get_width() + 50) &
+                   (screen_y >= -50) & (screen_y <= render_queue.get_height() + 50))
+        kind = self.kind[:n]
+        
+        blits = []
+        
+        # Lasers: one shared sprite at a quantized rotation, centered mid-beam
+        lasers = np.nonzero(visible & (kind == KIND_LASER))[0]
+        if len(lasers):
+            angle = self.angle[lasers]
+            center_x = (screen_x[lasers] - np.cos(angle) * (LASER_LENGTH / 2)).astype(np.int32)
+            center_y = (screen_y[lasers] - np.sin(angle) * (LASER_LENGTH / 2)).astype(np.int32)
+            steps = np.rint(-np.degrees(angle) * (sprites.ROTATION_STEPS / 360.0)).astype(np.int32) % sprites.ROTATION_STEPS
+            for step, cx, cy in zip(steps.tolist(), center_x.tolist(), center_y.tolist()):
+                sprite = sprites.get_rotated_step(("Laser",), step, sprites.ROTATION_STEPS, draw_laser_sprite)
+                blits.append((sprite, (cx - sprite.get_width() // 2, cy - sprite.get_height() // 2)))
+        
+        # Mines: frames of the shared pulse animations
+        mines = np.nonzero(visible & (kind == KIND_MINE))[0]
+        if len(mines):
+            age = self.max_lifetime[mines] - self.lifetime[mines]
+            unarmed_animation = get_mine_animation(False)
+            armed_animation = get_mine_animation(True)
+            for mine_age, mx, my in zip(age.tolist(), screen_x[mines].tolist(), screen_y[mines].tolist()):
+                mine_animation = armed_animation if mine_age >= MINE_ARM_TIME else unarmed_animation
+                frame = mine_animation.frame_at(mine_age)
+                blits.append((frame, (int(mx) - frame.get_width() // 2, int(my) - frame.get_height() // 2)))
+        
+        render_queue.submit_many(LAYER_PROJECTILES, blits)
+        
+        # Missiles are drawn individually
+        missiles = np.nonzero(visible & (kind == KIND_MISSILE))[0]
+        for i in missiles.tolist():
+            render_queue.submit_draw(LAYER_PROJECTILES, draw_missile,
+                                     screen_x[i], screen_y[i], self.angle[i], int(self.size[i]))
+    
+    def get_stats(self):
+        """Get the number of projectiles in flight and free slots in the store"""
+        return {'active': self.count, 'free': self.capacity - self.count}
@@ -0,0 +1,102 @@
+"""
+Entity registry with typed partitions and generational handles.
+
+Every entity in a star system is registered once and gets an integer handle
+that packs its slot index with the slot's generation. When an entity is
+removed its slot's generation is bumped, so old handles stop resolving
+instead of pointing at whatever reuses the slot. Removal is deferred: it is
+requested during the tick and applied by flush() at the end, so entities can
+be destroyed safely while the world is being iterated. Entities are also kept
+in one partition per type for typed iteration.
+"""
+
+# Bits of a handle used for the slot index (the generation is above them)
+INDEX_BITS = 20
+INDEX_MASK = (1 << INDEX_BITS) - 1
+
+# Handle that always refers to the player (never issued to an entity)
+PLAYER_HANDLE = 0
+
+# Handle that refers to nothing
+NO_HANDLE = -1
+
+# Partitions every registry starts with (others are created on demand)
+PARTITIONS = ("Planet", "SpaceStation", "WarpGate", "EnemyShip")
+
+class EntityRegistry:
+    """Owns the entities of a star system"""
+    def __init__(self):
+        self.slots = []  # Entity in each slot (None when free)
+        self.generations = []  # Current generation of each slot
+        self.free = []  # Free slot indices
+        self.partitions = {entity_type: [] for entity_type in PARTITIONS}
+        self.pending = []  # Entities waiting to be removed at the end of the tick
+    
+    def __len__(self):
+        return len(self.slots) - len(self.free)
+    
+    def __iter__(self):
+        """Iterate over every entity, partition by partition"""
+        for partition in self.partitions.values():
+            yield from partition
+    
+    def add(self, entity):
+        """Register an entity, give it a handle and return the handle"""
+        if self.free:
+            index = self.free.pop()
+            self.slots[index] = entity
+        else:
+            index = len(self.slots)
+            self.slots.append(entity)
+            self.generations.append(1)  # Generation 0 is never used, so no handle is 0
+        handle = (self.generations[index] << INDEX_BITS) | index
+        entity.handle = handle
+        
+        self.partitions.setdefault(entity.entity_type, []).append(entity)
+        return handle
+    
+    def get(self, handle):
+        """Get the entity a handle refers to, or None if it has been removed"""
+        index = handle & INDEX_MASK
+        if handle <= 0 or index >= len(self.slots) or self.generations[index] != handle >> INDEX_BITS:
+            return None
+        return self.slots[index]
+    
+    def of_type(self, entity_type):
+        """Get the entities of one type (do not add or remove while iterating)"""
+        return self.partitions.get(entity_type, ())
+    
+    def of_types(self, *entity_types):
+        """Iterate over the entities of several types"""
+        for entity_type in entity_types:
+            yield from self.of_type(entity_type)
+    
+    def remove(self, entity):
+        """Ask for an entity to be removed at the end of the tick
+        
+        Returns False if it is not registered here or already waiting to be removed.
+        """
+        if self.get(entity.handle) is not entity or entity in self.pending:
+            return False
+        self.pending.append(entity)
+        return True
+    
+    def flush(self):
+        """Remove every entity whose removal was requested and return them"""
+        removed = self.pending
+        if not removed:
+            return removed
+        self.pending = []
+        
+        for entity in removed:
+            index = entity.handle & INDEX_MASK
+            self.slots[index] = None
+            self.generations[index] += 1
+            self.free.append(index)
+            entity.handle = NO_HANDLE
+        
+        # Each touched partition is rebuilt once, however many of its entities went
+        gone = set(removed)
+        for entity_type in {entity.entity_type for entity in removed}:
+            self.partitions[entity_type] = [entity for entity in self.partitions[entity_type] if entity not in gone]
+        return removed
@@ -0,0 +1,100 @@
+"""
+Batched sprite renderer.
+
+World objects submit (surface, position, layer) records to a RenderQueue
+during a frame instead of drawing directly. At the end of the frame the
+queue is flushed layer by layer, with every sprite in a layer drawn by a
+single Surface.blits call.
+"""
+
+# Render layers (drawn in ascending order)
+LAYER_BODIES = 10  # Planets and stations
+LAYER_GATES = 20
+LAYER_ASTEROIDS = 30
+LAYER_SHIPS = 40
+LAYER_PROJECTILES = 50
+LAYER_EFFECTS = 60
+LAYER_LABELS = 70
+
+class RenderQueue:
+    """Collects sprites during a frame and draws them in batches per layer"""
+    def __init__(self, screen):
+        self.screen = screen
+        self.blits = {}  # layer -> list of (surface, position)
+        self.draws = {}  # layer -> list of (function, args)
+        
+        # Counters for the frame being built and the last flushed frame
+        self.submitted = 0
+        self.stats = {'draw_calls': 0, 'blits': 0, 'layers': 0}
+    
+    def get_width(self):
+        """Width of the target surface"""
+        return self.screen.get_width()
+    
+    def get_height(self):
+        """Height of the target surface"""
+        return self.screen.get_height()
+    
+    def submit(self, surface, position, layer):
+        """Queue a surface to be drawn at a position (top-left or rect)"""
+        batch = self.blits.get(layer)
+        if batch is None:
+            batch = self.blits[layer] = []
+        batch.append((surface, position))
+        self.submitted += 1
+    
+    def submit_many(self, layer, sequence):
+        """Queue several (surface, position) records on one layer"""
+        batch = self.blits.get(layer)
+        if batch is None:
+            batch = self.blits[layer] = []
+        count = len(batch)
+        batch.extend(sequence)
+        self.submitted += len(batch) - count
+    
+    def submit_draw(self, layer, function, *args):
+        """Queue an immediate-mode draw, called as function(screen, *args)
+        
+        Draws run after the layer's sprites. Use sparingly for primitives
+        that have no sprite (lines, bars); each one counts as a draw call.
+        """
+        draws = self.draws.get(layer)
+        if draws is None:
+            draws = self.draws[layer] = []
+        draws.append((function, args))
+    
+    def flush(self):
+        """Draw everything queued this frame and reset for the next one"""
+        screen = self.screen
+        draw_calls = 0
+        blit_count = 0
+        
+        layers = sorted(set(self.blits) | set(self.draws))
+        drawn_layers = 0
+        for layer in layers:
+            # One batched blit call per layer
+            batch = self.blits.get(layer)
+            if batch:
+                screen.blits(batch, doreturn=False)
+                draw_calls += 1
+                blit_count += len(batch)
+            
+            # Then any immediate-mode draws on this layer
+            draws = self.draws.get(layer)
+            if draws:
+                for function, args in draws:
+                    function(screen, *args)
+                draw_calls += len(draws)
+            
+            if batch or draws:
+                drawn_layers += 1
+        
+        # Report counters for the frame just drawn
+        self.stats = {'draw_calls': draw_calls, 'blits': blit_count, 'layers': drawn_layers}
+        
+        # Keep the per-layer lists so they are reused next frame
+        for batch in self.blits.values():
+            batch.clear()
+        for draws in self.draws.values():
+            draws.clear()
+        self.submitted = 0
@@ -0,0 +1,30 @@
+import numpy as np
+
+"""
+Helpers for fixed-capacity struct-of-arrays stores.
+
+A store keeps one NumPy array per field (as attributes named after the
+fields) and a count of the live entries at the front of every array.
+"""
+
+def compact_fields(store, fields, alive):
+    """Drop the dead entries of a store, given a mask over its live range
+    
+    Live entries from above the new end are moved into the holes left below
+    it, so only the moved entries are copied (their order is not kept).
+    Updates store.count and returns True if anything was dropped.
+    """
+    n = store.count
+    new_count = int(np.count_nonzero(alive))
+    if new_count == n:
+        return False
+    
+    # Holes below the new end are filled by live entries above it
+    holes = np.nonzero(~alive[:new_count])[0]
+    movers = np.nonzero(alive[new_count:])[0] + new_count
+    for name in fields:
+        array = getattr(store, name)
+        array[holes] = array[movers]
+    
+    store.count = new_count
+    return True
@@ -0,0 +1,159 @@
+import math
+import heapq
+
+"""
+Uniform spatial hash for per-system entity queries.
+
+Entities are bucketed by the grid cell containing their center. Buckets are
+kept up to date incrementally (an entity only moves between buckets when it
+crosses a cell boundary), so rectangle, radius and nearest-neighbour queries
+only touch the cells around the query instead of the whole system.
+"""
+
+# Default grid cell size in world pixels
+DEFAULT_CELL_SIZE = 256
+
+class SpatialHash:
+    """Uniform grid of entities bucketed by position"""
+    def __init__(self, cell_size=DEFAULT_CELL_SIZE):
+        self.cell_size = cell_size
+        self.cells = {}  # (cell_x, cell_y) -> {entity: None} (insertion ordered)
+        self.entity_cells = {}  # entity -> (cell_x, cell_y)
+        self.max_size = 0  # Largest entity size, used to pad overlap queries
+    
+    def __len__(self):
+        return len(self.entity_cells)
+    
+    def __contains__(self, entity):
+        return entity in self.entity_cells
+    
+    def cell_for(self, x, y):
+        """Get the grid cell containing a world position"""
+        return (math.floor(x / self.cell_size), math.floor(y / self.cell_size))
+    
+    def insert(self, entity):
+        """Add an entity to the grid"""
+        key = self.cell_for(entity.x, entity.y)
+        cell = self.cells.get(key)
+        if cell is None:
+            cell = self.cells[key] = {}
+        cell[entity] = None
+        self.entity_cells[entity] = key
+        
+        # Track the largest entity so overlap queries can be padded
+        self.max_size = max(self.max_size, entity.size)
+    
+    def remove(self, entity):
+        """Remove an entity from the grid"""
+        key = self.entity_cells.pop(entity, None)
+        if key is None:
+            return
+        
+        cell = self.cells[key]
+        del cell[entity]
+        if not cell:
+            del self.cells[key]
+    
+    def update(self, entity):
+        """Re-bucket an entity after it moved (cheap when it stays in its cell)"""
+        key = self.cell_for(entity.x, entity.y)
+        old_key = self.entity_cells.get(entity)
+        if key == old_key:
+            return
+        
+        if old_key is not None:
+            old_cell = self.cells[old_key]
+            del old_cell[entity]
+            if not old_cell:
+                del self.cells[old_key]
+        
+        cell = self.cells.get(key)
+        if cell is None:
+            cell = self.cells[key] = {}
+        cell[entity] = None
+        self.entity_cells[entity] = key
+    
+    def query_rect(self, left, top, right, bottom):
+        """Get entities whose center lies inside a rectangle (edges inclusive)"""
+        min_cx, min_cy = self.cell_for(left, top)
+        max_cx, max_cy = self.cell_for(right, bottom)
+        
+        results = []
+        cells = self.cells
+        for cx in range(min_cx, max_cx + 1):
+            for cy in range(min_cy, max_cy + 1):
+                cell = cells.get((cx, cy))
+                if not cell:
+                    continue
+                
+                for entity in cell:
+                    if left <= entity.x <= right and top <= entity.y <= bottom:
+                        results.append(entity)
+        
+        return results
+    
+    def query_radius(self, x, y, radius):
+        """Get entities whose center lies within a radius of a point"""
+        radius_sq = radius * radius
+        
+        results = []
+        for entity in self.query_rect(x - radius, y - radius, x + radius, y + radius):
+            dx = entity.x - x
+            dy = entity.y - y
+            if dx * dx + dy * dy <= radius_sq:
+                results.append(entity)
+        
+        return results
+    
+    def nearest(self, x, y, k=1, max_radius=None, predicate=None):
+        """Get up to k entities nearest to a point, closest first
+        
+        Searches outward ring by ring and stops once no unvisited cell can
+        hold anything closer than the current k-th candidate.
+        """
+        if not self.cells:
+            return []
+        
+        center_cx, center_cy = self.cell_for(x, y)
+        
+        # Furthest ring that can hold anything
+        if max_radius is not None:
+            max_ring = int(math.ceil(max_radius / self.cell_size)) + 1
+            max_radius_sq = max_radius * max_radius
+        else:
+            max_ring = max(max(abs(cx - center_cx), abs(cy - center_cy)) for cx, cy in self.cells)
+            max_radius_sq = None
+        
+        candidates = []  # (distance squared, order, entity)
+        order = 0
+        for ring in range(max_ring + 1):
+            for cx in range(center_cx - ring, center_cx + ring + 1):
+                # Only the border cells of this ring are new
+                if cx == center_cx - ring or cx == center_cx + ring:
+                    cy_values = range(center_cy - ring, center_cy + ring + 1)
+                else:
+                    cy_values = (center_cy - ring, center_cy + ring) if ring else (center_cy,)
+                
+                for cy in cy_values:
+                    cell = self.cells.get((cx, cy))
+                    if not cell:
+                        continue
+                    for entity in cell:
+                        if predicate is not None and not predicate(entity):
+                            continue
+                        dx = entity.x - x
+                        dy = entity.y - y
+                        distance_sq = dx * dx + dy * dy
+                        if max_radius_sq is not None and distance_sq > max_radius_sq:
+                            continue
+                        candidates.append((distance_sq, order, entity))
+                        order += 1
+            
+            # Anything in further rings is at least this far away
+            if len(candidates) >= k:
+                reach = ring * self.cell_size
+                best = heapq.nsmallest(k, candidates)
+                if best[-1][0] <= reach * reach:
+                    return [entity for _, _, entity in best]
+        
+        return [entity for _, _, entity in heapq.nsmallest(k, candidates)]
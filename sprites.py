@@ -0,0 +1,50 @@
+import pygame
+
+"""
+Flyweight sprite registry.
+
+Sprites are keyed by the visual parameters that determine their pixels, e.g.
+("EnemyShip", ship_type, level), so every object that looks the same shares
+one Surface. Sprites are only drawn the first time they are requested, and
+rotated versions are cached at a fixed number of quantized angles.
+"""
+
+# Default number of cached rotation angles per sprite
+ROTATION_STEPS = 72
+
+# Shared sprites by key, and rotated versions by (key, step)
+_sprites = {}
+_rotated = {}
+
+def get_sprite(key, builder, *args):
+    """Get the shared sprite for a key, calling builder(*args) the first time"""
+    surface = _sprites.get(key)
+    if surface is None:
+        surface = builder(*args)
+        _sprites[key] = surface
+    return surface
+
+def rotation_step(angle_degrees, steps=ROTATION_STEPS):
+    """Quantize an angle in degrees to a rotation step"""
+    return int(round(angle_degrees * steps / 360.0)) % steps
+
+def get_rotated_step(key, step, steps, builder, *args):
+    """Get the shared sprite for a key rotated by step * 360 / steps degrees"""
+    rotated_key = (key, steps, step)
+    surface = _rotated.get(rotated_key)
+    if surface is None:
+        surface = pygame.transform.rotate(get_sprite(key, builder, *args), step * 360.0 / steps)
+        _rotated[rotated_key] = surface
+    return surface
+
+def get_rotated(key, angle_degrees, builder, *args):
+    """Get the shared sprite for a key rotated to the nearest cached angle
+    
+    Rotation follows pygame.transform.rotate (counterclockwise degrees).
+    """
+    step = rotation_step(angle_degrees)
+    return get_rotated_step(key, step, ROTATION_STEPS, builder, *args)
+
+def get_stats():
+    """Get the number of shared and rotated sprites currently held"""
+    return {'sprites': len(_sprites), 'rotated': len(_rotated)}
@@ -0,0 +1,332 @@
+import os
+import time
+import pygame
+import numpy as np
+
+"""
+Procedural planet and station textures.
+
+Textures are synthesized with NumPy (fractal value noise, colour ramps and
+sphere shading) and written into surfaces through pygame.surfarray. Each
+texture is keyed by (seed, type, size) and persisted to an on-disk cache, so
+later launches and revisits load the baked pixels instead of regenerating them.
+"""
+
+# Directory baked textures are stored in
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "texture_cache")
+
+# Bump when generation changes so stale cache files are ignored
+TEXTURE_VERSION = 1
+
+# Number of distinct looks per type and size (seeds are drawn from this range
+# so textures are shared between launches instead of being unique every time)
+TEXTURE_VARIANTS = 16
+
+# Colour ramps per planet type: (height, colour) stops from low to high ground
+PLANET_RAMPS = {
+    "Terrestrial": [
+        (0.00, (0, 40, 120)),     # Deep water
+        (0.45, (0, 90, 170)),     # Shallow water
+        (0.50, (194, 178, 128)),  # Beach
+        (0.55, (0, 128, 0)),      # Lowland
+        (0.75, (0, 90, 0)),       # Forest
+        (0.88, (120, 110, 100)),  # Mountains
+        (1.00, (255, 255, 255))   # Peaks
+    ],
+    "Jungle": [
+        (0.00, (0, 60, 90)),
+        (0.30, (0, 100, 40)),
+        (0.35, (0, 100, 0)),
+        (0.70, (0, 70, 0)),
+        (1.00, (40, 90, 20))
+    ],
+    "Ocean": [
+        (0.00, (0, 0, 110)),
+        (0.60, (0, 0, 150)),
+        (0.72, (0, 80, 190)),
+        (0.76, (194, 178, 128)),
+        (0.80, (0, 150, 0)),
+        (1.00, (0, 110, 0))
+    ],
+    "Desert": [
+        (0.00, (160, 130, 95)),
+        (0.40, (210, 180, 140)),
+        (0.75, (230, 200, 160)),
+        (1.00, (180, 150, 120))
+    ],
+    "Ice World": [
+        (0.00, (150, 170, 220)),
+        (0.50, (200, 200, 255)),
+        (1.00, (255, 255, 255))
+    ],
+    "Gas Giant": [
+        (0.00, (170, 120, 40)),
+        (0.35, (200, 150, 50)),
+        (0.65, (220, 170, 90)),
+        (1.00, (235, 200, 140))
+    ]
+}
+
+# Planet types with white polar caps
+POLAR_CAP_TYPES = ("Terrestrial", "Ice World")
+
+# Direction light falls from (upper left, towards the viewer)
+LIGHT_DIRECTION = np.array([-0.45, -0.45, 0.77])
+LIGHT_DIRECTION = LIGHT_DIRECTION / np.linalg.norm(LIGHT_DIRECTION)
+
+def value_noise(rng, width, height, scale=4, octaves=4, persistence=0.5):
+    """Fractal value noise in the range 0 to 1 as a (width, height) array
+    
+    Each octave bilinearly interpolates a random lattice with scale * 2^octave
+    cells across the texture, smoothed so the lattice does not show.
+    """
+    result = np.zeros((width, height))
+    amplitude = 1.0
+    total = 0.0
+    
+    for octave in range(octaves):
+        cells = max(1, int(scale * 2 ** octave))
+        lattice = rng.random((cells + 1, cells + 1))
+        
+        # Lattice coordinates of every pixel
+        xs = np.linspace(0, cells, width, endpoint=False)
+        ys = np.linspace(0, cells, height, endpoint=False)
+        x0 = xs.astype(np.int32)
+        y0 = ys.astype(np.int32)
+        fx = xs - x0
+        fy = ys - y0
+        fx = (fx * fx * (3 - 2 * fx))[:, None]
+        fy = (fy * fy * (3 - 2 * fy))[None, :]
+        
+        # Interpolate between the four surrounding lattice values
+        top = lattice[x0][:, y0] * (1 - fx) + lattice[x0 + 1][:, y0] * fx
+        bottom = lattice[x0][:, y0 + 1] * (1 - fx) + lattice[x0 + 1][:, y0 + 1] * fx
+        result += amplitude * (top * (1 - fy) + bottom * fy)
+        
+        total += amplitude
+        amplitude *= persistence
+    
+    result /= total
+    
+    # Stretch to use the full range
+    low = result.min()
+    high = result.max()
+    if high > low:
+        result = (result - low) / (high - low)
+    return result
+
+def apply_ramp(values, ramp):
+    """Map values (0 to 1) to colours through a ramp, returning an RGB array"""
+    stops = [stop for stop, _ in ramp]
+    rgb = np.empty(values.shape + (3,))
+    for channel in range(3):
+        rgb[..., channel] = np.interp(values, stops, [color[channel] for _, color in ramp])
+    return rgb
+
+def generate_planet_pixels(seed, planet_type, size, color):
+    """Synthesize a planet texture as a (width, height, 4) RGBA array"""
+    rng = np.random.default_rng(seed)
+    diameter = size * 2
+    
+    # Sphere coordinates (-1 to 1 across the disc)
+    coords = (np.arange(diameter) + 0.5 - size) / size
+    nx = coords[:, None]
+    ny = coords[None, :]
+    r2 = nx * nx + ny * ny
+    inside = r2 <= 1.0
+    nz = np.sqrt(np.clip(1.0 - r2, 0.0, 1.0))
+    
+    # Base surface colour from noise
+    ramp = PLANET_RAMPS.get(planet_type)
+    if planet_type == "Gas Giant":
+        # Bands that follow latitude, disturbed by turbulence
+        turbulence = value_noise(rng, diameter, diameter, scale=3, octaves=3)
+        bands = 0.5 + 0.5 * np.sin(ny * rng.uniform(5, 9) * np.pi + turbulence * 3.0)
+        rgb = apply_ramp(np.broadcast_to(bands, (diameter, diameter)), ramp)
+    elif ramp is not None:
+        heights = value_noise(rng, diameter, diameter, scale=3, octaves=5)
+        if planet_type == "Desert":
+            # Ridged noise gives dune lines
+            heights = 1.0 - np.abs(heights * 2 - 1)
+        rgb = apply_ramp(heights, ramp)
+    else:
+        # Unknown type: shades of the planet's colour
+        heights = value_noise(rng, diameter, diameter, scale=3, octaves=4)
+        rgb = np.array(color, dtype=np.float64) * (0.7 + 0.3 * heights)[..., None]
+    
+    # Polar caps
+    if planet_type in POLAR_CAP_TYPES:
+        edge = value_noise(rng, diameter, diameter, scale=6, octaves=2) * 0.12
+        caps = np.abs(np.broadcast_to(ny, (diameter, diameter))) > 0.8 - edge
+        rgb[caps] = (255, 255, 255)
+    
+    # Diffuse lighting with a little ambient light
+    light = nx * LIGHT_DIRECTION[0] + ny * LIGHT_DIRECTION[1] + nz * LIGHT_DIRECTION[2]
+    rgb *= (0.3 + 0.7 * np.clip(light, 0.0, 1.0))[..., None]
+    
+    # Anti-aliased disc edge
+    alpha = np.clip((1.0 - np.sqrt(r2)) * size, 0.0, 1.0) * 255
+    alpha[~inside] = 0
+    
+    rgba = np.empty((diameter, diameter, 4), dtype=np.uint8)
+    rgba[..., :3] = np.clip(rgb, 0, 255)
+    rgba[..., 3] = alpha
+    return rgba
+
+def generate_station_pixels(seed, station_type, size, color, draw_shape):
+    """Synthesize a station texture as a (width, height, 4) RGBA array
+    
+    The station outline comes from draw_shape(station_type, size, color) and
+    is covered with hull plating: plates of slightly varying brightness,
+    darker seams between them and fine surface noise.
+    """
+    rng = np.random.default_rng(seed)
+    surface = draw_shape(station_type, size, color)
+    width, height = surface.get_size()
+    
+    rgb = pygame.surfarray.array3d(surface).astype(np.float64)
+    alpha = pygame.surfarray.array_alpha(surface)
+    
+    # Hull plates
+    plate_size = max(4, size // 4)
+    plates = rng.uniform(0.8, 1.1, (width // plate_size + 1, height // plate_size + 1))
+    xs = np.arange(width) // plate_size
+    ys = np.arange(height) // plate_size
+    shade = plates[xs][:, ys]
+    
+    # Seams between plates
+    seams = (np.arange(width) % plate_size == 0)[:, None] | (np.arange(height) % plate_size == 0)[None, :]
+    shade = np.where(seams, shade * 0.7, shade)
+    
+    # Fine grime
+    shade *= 0.9 + 0.2 * value_noise(rng, width, height, scale=8, octaves=2)
+    
+    rgba = np.empty((width, height, 4), dtype=np.uint8)
+    rgba[..., :3] = np.clip(rgb * shade[..., None], 0, 255)
+    rgba[..., 3] = alpha
+    return rgba
+
+def surface_from_pixels(rgba):
+    """Create a per-pixel alpha surface from a (width, height, 4) RGBA array"""
+    surface = pygame.Surface(rgba.shape[:2], pygame.SRCALPHA)
+    pygame.surfarray.pixels3d(surface)[...] = rgba[..., :3]
+    pygame.surfarray.pixels_alpha(surface)[...] = rgba[..., 3]
+    return surface
+
+class TextureCache:
+    """Generates textures, persisting them to disk and loading them back"""
+    def __init__(self, cache_dir=CACHE_DIR):
+        self.cache_dir = cache_dir
+        
+        # Timing statistics (cold = generated, warm = loaded from disk)
+        self.generated = 0
+        self.generate_time = 0.0
+        self.loaded = 0
+        self.load_time = 0.0
+    
+    def path_for(self, kind, seed, type_name, size):
+        """Get the cache file for a texture"""
+        name = f"{kind}-{type_name.replace(' ', '_')}-{size}-{seed}-v{TEXTURE_VERSION}.npy"
+        return os.path.join(self.cache_dir, name)
+    
+    def get(self, kind, seed, type_name, size, generate, *args):
+        """Get a texture surface, generating it with generate(*args) on a cache miss"""
+        path = self.path_for(kind, seed, type_name, size)
+        
+        # Warm path: load the baked pixels
+        if os.path.exists(path):
+            start = time.perf_counter()
+            try:
+                rgba = np.load(path)
+            except (OSError, ValueError):
+                rgba = None  # Unreadable file, regenerate it below
+            if rgba is not None:
+                surface = surface_from_pixels(rgba)
+                self.loaded += 1
+                self.load_time += time.perf_counter() - start
+                return surface
+        
+        # Cold path: synthesize and bake
+        start = time.perf_counter()
+        rgba = generate(*args)
+        surface = surface_from_pixels(rgba)
+        self.generated += 1
+        self.generate_time += time.perf_counter() - start
+        
+        self.save(path, rgba)
+        return surface
+    
+    def save(self, path, rgba):
+        """Write texture pixels to the cache (the game runs fine without it)"""
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            
+            # Write to a temporary file first so a partial file is never loaded
+            temp_path = path + ".tmp"
+            with open(temp_path, "wb") as file:
+                np.save(file, rgba)
+            os.replace(temp_path, path)
+        except OSError:
+            pass
+    
+    def get_stats(self):
+        """Get cold (generated) and warm (loaded) texture timings in milliseconds"""
+        return {
+            'generated': self.generated,
+            'cold_ms': self.generate_time * 1000 / self.generated if self.generated else 0.0,
+            'loaded': self.loaded,
+            'warm_ms': self.load_time * 1000 / self.loaded if self.loaded else 0.0
+        }
+
+# Shared texture cache used by the whole game
+texture_cache = TextureCache()
+
+def get_planet_surface(seed, planet_type, size, color):
+    """Get a planet's textured surface"""
+    return texture_cache.get("planet", seed, planet_type, size,
+                             generate_planet_pixels, seed, planet_type, size, color)
+
+def get_station_surface(seed, station_type, size, color, draw_shape):
+    """Get a station's textured surface, outlined by draw_shape"""
+    return texture_cache.get("station", seed, station_type, size,
+                             generate_station_pixels, seed, station_type, size, color, draw_shape)
+
+def get_stats():
+    """Get texture generation timings"""
+    return texture_cache.get_stats()
+
+def benchmark(cache_dir, sizes=(40, 60, 80), seeds=range(4)):
+    """Time cold and warm texture generation for every planet and station type
+    
+    cache_dir should be an empty directory: the first pass generates and bakes
+    every texture, the second loads them back.
+    """
+    from entities import draw_station_surface
+    
+    station_types = ["Trading Post", "Military Base", "Research Facility", "Mining Outpost"]
+    results = {}
+    for label in ("cold", "warm"):
+        cache = TextureCache(cache_dir)
+        for seed in seeds:
+            for size in sizes:
+                for planet_type in PLANET_RAMPS:
+                    cache.get("planet", seed, planet_type, size,
+                              generate_planet_pixels, seed, planet_type, size, (150, 150, 150))
+                for station_type in station_types:
+                    cache.get("station", seed, station_type, size,
+                              generate_station_pixels, seed, station_type, size, (150, 150, 150),
+                              draw_station_surface)
+        results[label] = cache.get_stats()
+    
+    return {
+        'textures': results['cold']['generated'],
+        'cold_ms': results['cold']['cold_ms'],
+        'warm_ms': results['warm']['warm_ms']
+    }
+
+if __name__ == "__main__":
+    import tempfile
+    
+    with tempfile.TemporaryDirectory() as directory:
+        stats = benchmark(directory)
+    print(f"{stats['textures']} textures: cold {stats['cold_ms']:.2f} ms, warm {stats['warm_ms']:.2f} ms per texture")
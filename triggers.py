@@ -0,0 +1,95 @@
+from spatial import SpatialHash
+
+"""
+Proximity trigger zones.
+
+Things the player reacts to by flying near them (trading posts, warp gates)
+get a zone registered once when they join a star system. Each step the zones
+are tested against the player through a spatial hash, using squared
+distances, and only changes are reported: an "enter" event when the player
+comes inside a zone and an "exit" event when it leaves. Consumers react to
+those events instead of polling every entity every frame.
+"""
+
+# Kinds of zone
+ZONE_TRADE = "trade"
+ZONE_GATE = "gate"
+
+# Events
+EVENT_ENTER = "enter"
+EVENT_EXIT = "exit"
+
+# Distance from a gate's center at which the player enters it
+# (smaller than the gate's visual size to require deliberate entry)
+GATE_TRIGGER_RADIUS = 20
+
+class TriggerZone:
+    """A circle around an entity that reports when the player enters or leaves it"""
+    __slots__ = ('entity', 'kind', 'radius', 'x', 'y', 'size')
+    
+    def __init__(self, entity, kind, radius):
+        self.entity = entity
+        self.kind = kind
+        self.radius = radius
+        
+        # Zones sit on entities that do not move
+        self.x = entity.x
+        self.y = entity.y
+        self.size = radius
+
+class TriggerSystem:
+    """The trigger zones of one star system and which of them hold the player"""
+    def __init__(self):
+        self.zones = SpatialHash()
+        self.entity_zones = {}  # entity -> [zone]
+        self.inside = {}  # Zones currently holding the player -> None (insertion ordered)
+    
+    def __len__(self):
+        return len(self.zones)
+    
+    def add(self, entity, kind, radius=0):
+        """Register a zone around an entity and return it"""
+        zone = TriggerZone(entity, kind, radius)
+        self.zones.insert(zone)
+        self.entity_zones.setdefault(entity, []).append(zone)
+        return zone
+    
+    def remove(self, entity):
+        """Drop the zones of an entity (no exit event is sent for them)"""
+        for zone in self.entity_zones.pop(entity, ()):
+            self.zones.remove(zone)
+            self.inside.pop(zone, None)
+    
+    def update(self, x, y, reach=None):
+        """Test the zones against the player and return the (event, zone) changes
+        
+        reach maps a zone kind to extra radius added to all zones of that kind,
+        for ranges that belong to the player (like sensor range) rather than
+        to the zone.
+        """
+        reach = reach or {}
+        
+        # Only zones within the largest possible radius can hold the player
+        search = self.zones.max_size + max(reach.values(), default=0)
+        holding = {}
+        for zone in self.zones.query_radius(x, y, search):
+            radius = zone.radius + reach.get(zone.kind, 0)
+            dx = zone.x - x
+            dy = zone.y - y
+            if dx * dx + dy * dy < radius * radius:
+                holding[zone] = None
+        
+        if holding.keys() == self.inside.keys():
+            return []
+        
+        # Exits are reported before enters
+        events = [(EVENT_EXIT, zone) for zone in self.inside if zone not in holding]
+        events.extend((EVENT_ENTER, zone) for zone in holding if zone not in self.inside)
+        self.inside = holding
+        return events
+    
+    def clear(self):
+        """Let go of the player (when it leaves the system) and return the exit events"""
+        events = [(EVENT_EXIT, zone) for zone in self.inside]
+        self.inside = {}
+        return events
@@ -1,8 +1,33 @@
 import pygame
 import math
 import random
+import fonts
+import textures
+from widgets import WidgetLayer, Label, Number, Bar, Static, VirtualList
 from pygame.locals import *
 
+# Minimap blip (color, radius) for each entity type (None uses the entity's color)
+MINIMAP_BLIPS = {
+    "Planet": (None, 5),
+    "SpaceStation": (None, 4),
+    "WarpGate": ((100, 150, 255), 3),
+    "EnemyShip": (None, 2)
+}
+
+# Entity types that never move, drawn once into the minimap's cached layer in this order
+MINIMAP_STATIC_TYPES = ("Planet", "SpaceStation", "WarpGate")
+
+# Minimap size in pixels and world pixels per minimap pixel
+MINIMAP_SIZE = 150
+MINIMAP_SCALE = 12.0
+
+# Trading list columns and their proportions of the list width
+TRADE_HEADERS = ["Commodity", "Buy Price", "Sell Price", "Available", "In Cargo", "Trend"]
+TRADE_COLUMN_WIDTHS = [0.35, 0.15, 0.15, 0.15, 0.1, 0.1]
+
+# Spacing of trading list rows in pixels
+TRADE_ROW_HEIGHT = 30
+
 class UI:
     """Manages all game user interface elements"""
     def __init__(self, screen, player, universe, economy):
@@ -23,11 +48,11 @@ class UI:
         self.CYAN = (0, 255, 255)
         self.PURPLE = (150, 0, 150)
         
-        # Fonts
-        self.title_font = pygame.font.SysFont(None, 48)
-        self.header_font = pygame.font.SysFont(None, 32)
-        self.normal_font = pygame.font.SysFont(None, 24)
-        self.small_font = pygame.font.SysFont(None, 18)
+        # Fonts (shared through the text cache)
+        self.title_font = fonts.get_font(48)
+        self.header_font = fonts.get_font(32)
+        self.normal_font = fonts.get_font(24)
+        self.small_font = fonts.get_font(18)
         
         # UI state
         self.selected_menu_item = 0
@@ -36,6 +61,7 @@ class UI:
         self.map_scroll_offset = (0, 0)
         self.show_trade_details = False
         self.show_help = False
+        self.show_debug = False
         self.notification_text = ""
         self.notification_timer = 0
         self.selected_upgrade = 0
@@ -47,6 +73,23 @@ class UI:
         # Buttons and UI elements
         self.buttons = []
         self.initialize_ui_elements()
+        
+        # Heads-up display, redrawn only where the values it shows change
+        self.hud = self.build_hud()
+        
+        # Minimap panel, and its cached layer of things that don't move: (system, surface, world origin)
+        self.minimap_frame = None
+        self.minimap_layer = None
+        
+        # Trading screen: one dimming overlay reused every frame, and a list that only draws the rows in view
+        self.trading_overlay = pygame.Surface(self.screen.get_size())
+        self.trading_overlay.fill(self.BLACK)
+        self.trading_overlay.set_alpha(200)
+        
+        list_width = self.screen.get_width() - 140
+        self.trade_column_x = [int(sum(TRADE_COLUMN_WIDTHS[:i]) * list_width) for i in range(len(TRADE_HEADERS))]
+        self.trading_list = VirtualList((70, 150, list_width, self.screen.get_height() - 300), TRADE_ROW_HEIGHT,
+                                        self.trade_row_key, self.draw_trade_row)
     
     def initialize_ui_elements(self):
         """Create UI elements like buttons"""
@@ -141,7 +184,7 @@ class UI:
                 trading_area = pygame.Rect(50, 150, self.screen.get_width() - 100, self.screen.get_height() - 300)
                 if trading_area.collidepoint(mouse_pos):
                     # Calculate which item was clicked based on position
-                    item_height = 30
+                    item_height = TRADE_ROW_HEIGHT
                     item_index = (mouse_pos[1] - 150 + self.trading_scroll_offset) // item_height
                     
                     # Get market data
@@ -181,7 +224,7 @@ class UI:
                 if game_state == "TRADING":
                     # Get maximum scroll (based on number of items)
                     market = self.economy.get_system_market(self.player.current_system)
-                    max_scroll = max(0, len(market) * 30 - (self.screen.get_height() - 300))
+                    max_scroll = max(0, len(market) * TRADE_ROW_HEIGHT - (self.screen.get_height() - 300))
                     self.trading_scroll_offset = min(max_scroll, self.trading_scroll_offset + 30)
                 elif game_state == "MAP":
                     # Maximum map scroll would depend on galaxy size
@@ -226,6 +269,10 @@ class UI:
             # Help toggle
             if event.key == K_h:
                 self.show_help = not self.show_help
+            
+            # Debug overlay toggle
+            elif event.key == K_F3:
+                self.show_debug = not self.show_debug
         
         return False
     
@@ -297,7 +344,7 @@ class UI:
             item = market[self.selected_commodity]
             
             # Check if player has any of this commodity
-            if item['commodity'].name in self.player.cargo and self.player.cargo[item['commodity'].name] > 0:
+            if item['commodity'].name in self.player.cargo:
                 # Default to selling 1 unit
                 quantity = 1
                 
@@ -382,11 +429,11 @@ class UI:
         print(f"Tech Level: {system.tech_level}")
         print(f"Danger Level: {system.danger_level}")
     
-    def update(self, game_state):
+    def update(self, game_state, delta_time):
         """Update UI state"""
         # Update notification timer
         if self.notification_timer > 0:
-            self.notification_timer -= 1/60  # Assuming 60 FPS
+            self.notification_timer -= delta_time
             if self.notification_timer <= 0:
                 self.notification_text = ""
     
@@ -423,7 +470,7 @@ class UI:
             pygame.draw.circle(self.screen, color, (int(star['x']), int(star['y'])), star['radius'])
         
         # Draw title
-        title = self.title_font.render("STELLAR MERCHANTS", True, self.YELLOW)
+        title = fonts.render_text("STELLAR MERCHANTS", 48, self.YELLOW)
         self.screen.blit(title, (self.screen.get_width() // 2 - title.get_width() // 2, 100))
         
         # Draw menu items with background rectangles for better visibility and clicking
@@ -435,7 +482,7 @@ class UI:
                 pygame.draw.rect(self.screen, (40, 40, 80), item_rect, border_radius=5)
                 color = self.YELLOW
                 # Draw selection arrow
-                arrow = self.normal_font.render("> ", True, self.YELLOW)
+                arrow = fonts.render_text("> ", 24, self.YELLOW)
                 self.screen.blit(arrow, (self.screen.get_width() // 2 - 120, 200 + i * 50 + 5))
             else:
                 pygame.draw.rect(self.screen, (20, 20, 40), item_rect, border_radius=5)
@@ -444,211 +491,207 @@ class UI:
             # Draw border around button
             pygame.draw.rect(self.screen, self.GRAY, item_rect, 1, border_radius=5)
             
-            text = self.normal_font.render(item, True, color)
+            text = fonts.render_text(item, 24, color)
             self.screen.blit(text, (self.screen.get_width() // 2 - text.get_width() // 2, 205 + i * 50))
         
         # Draw instructions
-        instructions = self.small_font.render("Use arrow keys to select, Enter to confirm", True, self.LIGHT_GRAY)
+        instructions = fonts.render_text("Use arrow keys to select, Enter to confirm", 18, self.LIGHT_GRAY)
         self.screen.blit(instructions, (self.screen.get_width() // 2 - instructions.get_width() // 2, 
                                        self.screen.get_height() - 60))
         
         # Draw version and credits
-        version = self.small_font.render("Version 0.1", True, self.GRAY)
+        version = fonts.render_text("Version 0.1", 18, self.GRAY)
         self.screen.blit(version, (10, self.screen.get_height() - 30))
         
-        credits = self.small_font.render("© 2025 Your Game Studio", True, self.GRAY)
+        credits = fonts.render_text("© 2025 Your Game Studio", 18, self.GRAY)
         self.screen.blit(credits, (self.screen.get_width() - credits.get_width() - 10, self.screen.get_height() - 30))
     
-    def render_hud(self):
-        """Render the heads-up display during gameplay"""
-        # Player status panel (top-left)
-        panel_rect = pygame.Rect(10, 10, 200, 120)
-        pygame.draw.rect(self.screen, (0, 0, 0, 150), panel_rect)
-        pygame.draw.rect(self.screen, self.GRAY, panel_rect, 1)
+    def build_hud(self):
+        """Lay out the heads-up display as widgets bound to the player's state"""
+        hud = WidgetLayer()
+        width = self.screen.get_width()
+        height = self.screen.get_height()
+        
+        def panel(size):
+            """Draw a black panel with a gray border"""
+            surface = pygame.Surface(size)
+            surface.fill(self.BLACK)
+            pygame.draw.rect(surface, self.GRAY, surface.get_rect(), 1)
+            return surface
         
-        # Credits
-        credits_text = self.normal_font.render(f"Credits: {self.player.credits}", True, self.WHITE)
-        self.screen.blit(credits_text, (20, 20))
+        # Player status panel (top-left)
+        hud.add(Static((10, 10), lambda: panel((200, 120))))
+        # Credits (value drawn from cached digit glyphs since it changes often)
+        hud.add(Number((20, 20), "Credits: ", lambda: int(self.player.credits), 24, self.WHITE))
         
         # Health bar
-        health_text = self.small_font.render(f"Hull: {self.player.health}/{self.player.max_health}", True, self.WHITE)
-        self.screen.blit(health_text, (20, 45))
-        
-        # Health bar background
-        pygame.draw.rect(self.screen, self.GRAY, (100, 45, 100, 15))
-        
-        # Health bar fill
-        health_percentage = self.player.health / self.player.max_health
-        health_width = int(100 * health_percentage)
-        health_color = (
-            int(255 * (1 - health_percentage)),
-            int(255 * health_percentage),
-            0
-        )
-        pygame.draw.rect(self.screen, health_color, (100, 45, health_width, 15))
+        hud.add(Label((20, 45), lambda: f"Hull: {self.player.health}/{self.player.max_health}", 18, self.WHITE))
+        hud.add(Bar((100, 45), (100, 15), lambda: self.player.health / self.player.max_health,
+                    lambda fraction: (int(255 * (1 - fraction)), int(255 * fraction), 0), self.GRAY))
         
         # Shield bar
-        shield_text = self.small_font.render(f"Shield: {self.player.shield}/{self.player.max_shield}", True, self.WHITE)
-        self.screen.blit(shield_text, (20, 65))
-        
-        # Shield bar background
-        pygame.draw.rect(self.screen, self.GRAY, (100, 65, 100, 15))
-        
-        # Shield bar fill
-        shield_percentage = self.player.shield / self.player.max_shield
-        shield_width = int(100 * shield_percentage)
-        pygame.draw.rect(self.screen, self.BLUE, (100, 65, shield_width, 15))
+        hud.add(Label((20, 65), lambda: f"Shield: {self.player.shield}/{self.player.max_shield}", 18, self.WHITE))
+        hud.add(Bar((100, 65), (100, 15), lambda: self.player.shield / self.player.max_shield, self.BLUE, self.GRAY))
         
         # Cargo space
-        cargo_used = sum(self.player.cargo.values())
-        cargo_text = self.small_font.render(f"Cargo: {cargo_used}/{self.player.cargo_capacity}", True, self.WHITE)
-        self.screen.blit(cargo_text, (20, 85))
-        
-        # Cargo bar background
-        pygame.draw.rect(self.screen, self.GRAY, (100, 85, 100, 15))
-        
-        # Cargo bar fill
-        cargo_percentage = cargo_used / self.player.cargo_capacity
-        cargo_width = int(100 * cargo_percentage)
-        pygame.draw.rect(self.screen, self.YELLOW, (100, 85, cargo_width, 15))
+        hud.add(Label((20, 85), lambda: f"Cargo: {self.player.cargo.used}/{self.player.cargo.capacity}", 18,
+                      self.WHITE))
+        hud.add(Bar((100, 85), (100, 15), lambda: self.player.cargo.used / self.player.cargo.capacity,
+                    self.YELLOW, self.GRAY))
         
         # System info panel (top-right)
-        if self.player.current_system:
-            system = self.player.current_system
-            panel_rect = pygame.Rect(self.screen.get_width() - 250, 10, 240, 80)
-            pygame.draw.rect(self.screen, (0, 0, 0, 150), panel_rect)
-            pygame.draw.rect(self.screen, self.GRAY, panel_rect, 1)
-            
-            # System name
-            name_text = self.normal_font.render(system.name, True, self.WHITE)
-            self.screen.blit(name_text, (self.screen.get_width() - 240, 20))
-            
-            # System info
-            info_text = self.small_font.render(f"Type: {system.system_type} | Tech: {system.tech_level}", True, self.WHITE)
-            self.screen.blit(info_text, (self.screen.get_width() - 240, 45))
-            
-            faction_text = self.small_font.render(f"Faction: {system.faction}", True, self.WHITE)
-            self.screen.blit(faction_text, (self.screen.get_width() - 240, 65))
+        in_system = lambda: self.player.current_system is not None
+        hud.add(Static((width - 250, 10), lambda: panel((240, 80)), visible=in_system))
+        hud.add(Label((width - 240, 20), lambda: self.player.current_system.name, 24, self.WHITE, visible=in_system))
+        hud.add(Label((width - 240, 45),
+                      lambda: f"Type: {self.player.current_system.system_type} | "
+                              f"Tech: {self.player.current_system.tech_level}",
+                      18, self.WHITE, visible=in_system))
+        hud.add(Label((width - 240, 65), lambda: f"Faction: {self.player.current_system.faction}", 18, self.WHITE,
+                      visible=in_system))
         
         # Controls help (bottom-right)
-        if self.show_help:
-            help_rect = pygame.Rect(self.screen.get_width() - 250, self.screen.get_height() - 180, 240, 170)
-            pygame.draw.rect(self.screen, (0, 0, 0, 200), help_rect)
-            pygame.draw.rect(self.screen, self.GRAY, help_rect, 1)
-            
-            help_title = self.small_font.render("Controls:", True, self.YELLOW)
-            self.screen.blit(help_title, (self.screen.get_width() - 240, self.screen.get_height() - 175))
-            
-            controls = [
-                "Arrows: Steer ship",
-                "Space: Fire weapon",
-                "T: Trading interface",
-                "U: Upgrade ship (at stations)",
-                "M: Galaxy map",
-                "H: Toggle help",
-                "Esc: Menu"
-            ]
-            
+        controls = [
+            "Arrows: Steer ship",
+            "Space: Fire weapon",
+            "B: Toggle beam weapon",
+            "T: Trading interface",
+            "U: Upgrade ship (at stations)",
+            "M: Galaxy map",
+            "H: Toggle help",
+            "Esc: Menu"
+        ]
+        
+        def help_panel():
+            """Draw the controls help panel"""
+            surface = panel((240, 190))
+            surface.blit(fonts.render_text("Controls:", 18, self.YELLOW), (10, 5))
             for i, control in enumerate(controls):
-                text = self.small_font.render(control, True, self.WHITE)
-                self.screen.blit(text, (self.screen.get_width() - 240, self.screen.get_height() - 155 + i * 20))
-        else:
-            # Just show help hint
-            help_hint = self.small_font.render("Press H for controls", True, self.GRAY)
-            self.screen.blit(help_hint, (self.screen.get_width() - help_hint.get_width() - 10, self.screen.get_height() - 30))
-        
-        # Notification area (bottom-center)
-        if self.notification_text:
-            # Calculate alpha based on remaining time
-            alpha = min(255, int(255 * self.notification_timer / 3.0))
-            
-            # Create notification background
-            notif_text = self.normal_font.render(self.notification_text, True, self.WHITE)
-            notif_width = notif_text.get_width() + 20
-            notif_rect = pygame.Rect(self.screen.get_width() // 2 - notif_width // 2, 
-                                   self.screen.get_height() - 50, notif_width, 30)
-            
-            # Create a surface with alpha for the background
-            bg_surface = pygame.Surface((notif_width, 30))
-            bg_surface.fill((0, 0, 0))
-            bg_surface.set_alpha(alpha * 0.8)
-            self.screen.blit(bg_surface, (notif_rect.x, notif_rect.y))
-            
-            # Create a surface with alpha for the text
-            text_surface = pygame.Surface(notif_text.get_size(), pygame.SRCALPHA)
-            text_surface.fill((0, 0, 0, 0))
-            text_surface.blit(notif_text, (0, 0))
-            text_surface.set_alpha(alpha)
-            
-            # Draw notification
-            pygame.draw.rect(self.screen, self.GRAY, notif_rect, 1)
-            self.screen.blit(text_surface, (notif_rect.x + 10, notif_rect.y + 5))
+                surface.blit(fonts.render_text(control, 18, self.WHITE), (10, 25 + i * 20))
+            return surface
+        
+        hud.add(Static((width - 250, height - 200), help_panel, visible=lambda: self.show_help))
+        
+        # Just show help hint
+        hud.add(Label((width - 10, height - 30), lambda: "Press H for controls", 18, self.GRAY, align="right",
+                      visible=lambda: not self.show_help))
+        
+        # Notification area (bottom-center), fading out as its time runs down
+        hud.add(Label((width // 2, height - 50), lambda: self.notification_text, 24, self.WHITE,
+                      background=(0, 0, 0, 204), border=self.GRAY, padding=(10, 5), align="center",
+                      visible=lambda: bool(self.notification_text),
+                      alpha=lambda: max(0, min(255, int(255 * self.notification_timer / 3.0)))))
         
         # Trading/Upgrade prompts if near station
-        if self.player.can_trade():
-            trade_text = self.normal_font.render("Press T to trade", True, self.GREEN)
-            self.screen.blit(trade_text, (self.screen.get_width() // 2 - trade_text.get_width() // 2, 
-                                       self.screen.get_height() - 80))
-            
-            upgrade_text = self.normal_font.render("Press U to upgrade ship", True, self.CYAN)
-            self.screen.blit(upgrade_text, (self.screen.get_width() // 2 - upgrade_text.get_width() // 2, 
-                                       self.screen.get_height() - 110))
+        hud.add(Label((width // 2, height - 80), lambda: "Press T to trade", 24, self.GREEN, align="center",
+                      visible=lambda: self.player.can_trade()))
+        hud.add(Label((width // 2, height - 110), lambda: "Press U to upgrade ship", 24, self.CYAN, align="center",
+                      visible=lambda: self.player.can_trade()))
+        return hud
+    
+    def render_hud(self):
+        """Render the heads-up display during gameplay from its cached widgets"""
+        self.hud.render(self.screen)
+    
+    def render_debug_overlay(self, render_stats, projectile_stats, particle_stats):
+        """Render per-frame renderer counters (toggled with F3)"""
+        texture_stats = textures.get_stats()
+        fleet_stats = self.player.current_system.fleet.stats
+        think_stats = self.player.current_system.think_scheduler.stats
+        hud_stats = self.hud.get_stats()
+        lines = [
+            f"Draw calls: {render_stats['draw_calls']}",
+            f"Blits: {render_stats['blits']}",
+            f"Layers: {render_stats['layers']}",
+            f"Textures cold: {texture_stats['generated']} ({texture_stats['cold_ms']:.1f} ms)",
+            f"Textures warm: {texture_stats['loaded']} ({texture_stats['warm_ms']:.1f} ms)",
+            f"AI ships: {fleet_stats['ships']} (near/mid/far {'/'.join(map(str, fleet_stats['tier_ships']))})",
+            f"AI ticks: {'/'.join(map(str, fleet_stats['tier_ticks']))}",
+            f"AI thinks: {think_stats['thinks']} ({think_stats['waiting']} waiting, {think_stats['think_ms']:.2f} ms)",
+            f"Projectiles: {projectile_stats['active']} active, {projectile_stats['free']} free slots",
+            f"Particles: {particle_stats['active']}/{particle_stats['capacity']} ({particle_stats['dropped']} dropped)",
+            f"HUD widgets redrawn: {hud_stats['redrawn']}/{hud_stats['widgets']}"
+        ]
+        
+        for i, line in enumerate(lines):
+            text = fonts.render_text(line, 18, self.CYAN)
+            self.screen.blit(text, (220, 15 + i * 18))
+    
+    def draw_minimap_frame(self):
+        """Draw the minimap panel and title"""
+        surface = pygame.Surface((MINIMAP_SIZE, MINIMAP_SIZE))
+        surface.fill(self.BLACK)
+        pygame.draw.rect(surface, self.GRAY, surface.get_rect(), 1)
+        surface.blit(fonts.render_text("Local Area", 18, self.WHITE), (5, 5))
+        return surface
+    
+    def draw_minimap_layer(self, system):
+        """Draw the blips of the bodies and gates at minimap scale, relative to the system origin
+        
+        Returns the surface and the world position of its top-left corner.
+        """
+        static = [entity for entity_type in MINIMAP_STATIC_TYPES for entity in system.entities.of_type(entity_type)]
+        xs = [entity.x for entity in static]
+        ys = [entity.y for entity in static]
+        if not xs:
+            return pygame.Surface((1, 1), pygame.SRCALPHA), (0, 0)
+        
+        # Pad by the largest blip so edge blips are not cut off
+        pad = max(radius for color, radius in MINIMAP_BLIPS.values())
+        origin_x = min(xs) - pad * MINIMAP_SCALE
+        origin_y = min(ys) - pad * MINIMAP_SCALE
+        surface = pygame.Surface((int((max(xs) - origin_x) / MINIMAP_SCALE) + pad + 1,
+                                  int((max(ys) - origin_y) / MINIMAP_SCALE) + pad + 1), pygame.SRCALPHA)
+        
+        for entity in static:
+            blip_color, radius = MINIMAP_BLIPS[entity.entity_type]
+            pygame.draw.circle(surface, entity.color if blip_color is None else blip_color,
+                               (int((entity.x - origin_x) / MINIMAP_SCALE), int((entity.y - origin_y) / MINIMAP_SCALE)),
+                               radius)
+        return surface, (origin_x, origin_y)
     
     def render_minimap(self):
         """Render the minimap showing local system"""
         # Minimap panel (bottom-left)
-        map_size = 150
-        panel_rect = pygame.Rect(10, self.screen.get_height() - map_size - 10, map_size, map_size)
-        pygame.draw.rect(self.screen, (0, 0, 0, 150), panel_rect)
-        pygame.draw.rect(self.screen, self.GRAY, panel_rect, 1)
-        
-        # Minimap title
-        map_title = self.small_font.render("Local Area", True, self.WHITE)
-        self.screen.blit(map_title, (15, self.screen.get_height() - map_size - 5))
-        
-        # Calculate minimap center
-        map_center_x = 10 + map_size // 2
-        map_center_y = self.screen.get_height() - map_size // 2 - 10
-        
-        # Calculate minimap scale (how much area to show) - higher values = more zoomed out
-        map_scale = 12.0  # Increased from 5.0 for a more zoomed out view
-        
-        # Draw entities on minimap
-        if self.player.current_system:
-            for entity in self.player.current_system.entities:
-                # Calculate position relative to player
-                rel_x = entity.x - self.player.x
-                rel_y = entity.y - self.player.y
-                
-                # Scale and position on minimap
-                map_x = map_center_x + rel_x / map_scale
-                map_y = map_center_y + rel_y / map_scale
-                
-                # Check if within minimap bounds
-                if (10 <= map_x < 10 + map_size and 
-                    self.screen.get_height() - map_size - 10 <= map_y < self.screen.get_height() - 10):
-                    
-                    # Draw different colored dots based on entity type
-                    if entity.entity_type == "Planet":
-                        color = entity.color
-                        size = 5
-                    elif entity.entity_type == "SpaceStation":
-                        color = entity.color
-                        size = 4
-                    elif entity.entity_type == "WarpGate":
-                        color = (100, 150, 255)
-                        size = 3
-                    elif entity.entity_type == "Asteroid":
-                        color = (150, 150, 150)
-                        size = 1
-                    elif entity.entity_type == "EnemyShip":
-                        color = entity.color
-                        size = 2
-                    else:
-                        color = self.WHITE
-                        size = 1
-                    
-                    pygame.draw.circle(self.screen, color, (int(map_x), int(map_y)), size)
+        panel_rect = pygame.Rect(10, self.screen.get_height() - MINIMAP_SIZE - 10, MINIMAP_SIZE, MINIMAP_SIZE)
+        if self.minimap_frame is None:
+            self.minimap_frame = self.draw_minimap_frame()
+        self.screen.blit(self.minimap_frame, panel_rect.topleft)
+        
+        # Minimap center
+        map_center_x, map_center_y = panel_rect.center
+        
+        system = self.player.current_system
+        if system:
+            original_clip = self.screen.get_clip()
+            self.screen.set_clip(panel_rect)
+            
+            # Cached layer of bodies and gates, drawn once per system
+            if self.minimap_layer is None or self.minimap_layer[0] is not system:
+                self.minimap_layer = (system,) + self.draw_minimap_layer(system)
+            _, layer, (origin_x, origin_y) = self.minimap_layer
+            self.screen.blit(layer, (int(map_center_x + (origin_x - self.player.x) / MINIMAP_SCALE),
+                                     int(map_center_y + (origin_y - self.player.y) / MINIMAP_SCALE)))
+            
+            # Ships, only within radar range
+            radar_range = self.player.radar_range
+            for entity in system.spatial_index.query_radius(self.player.x, self.player.y, radar_range):
+                if entity.entity_type in MINIMAP_STATIC_TYPES:
+                    continue
+                blip = MINIMAP_BLIPS.get(entity.entity_type)
+                if blip is None:
+                    continue
+                blip_color, radius = blip
+                pygame.draw.circle(self.screen, entity.color if blip_color is None else blip_color,
+                                   (int(map_center_x + (entity.x - self.player.x) / MINIMAP_SCALE),
+                                    int(map_center_y + (entity.y - self.player.y) / MINIMAP_SCALE)), radius)
+            
+            # Radar range ring, when it ends inside the map
+            radar_radius = int(radar_range / MINIMAP_SCALE)
+            if radar_radius < MINIMAP_SIZE // 2:
+                pygame.draw.circle(self.screen, (40, 60, 40), (map_center_x, map_center_y), radar_radius, 1)
+            
+            self.screen.set_clip(original_clip)
             
             # Draw player (always in center)
             pygame.draw.circle(self.screen, self.GREEN, (map_center_x, map_center_y), 3)
@@ -656,10 +699,7 @@ class UI:
     def render_trading_interface(self):
         """Render the trading interface"""
         # Background overlay
-        overlay = pygame.Surface((self.screen.get_width(), self.screen.get_height()))
-        overlay.fill((0, 0, 0))
-        overlay.set_alpha(200)
-        self.screen.blit(overlay, (0, 0))
+        self.screen.blit(self.trading_overlay, (0, 0))
         
         # Trading panel
         panel_rect = pygame.Rect(50, 50, self.screen.get_width() - 100, self.screen.get_height() - 100)
@@ -674,103 +714,30 @@ class UI:
         else:
             title_text = "Trading"
         
-        title = self.header_font.render(title_text, True, self.WHITE)
+        title = fonts.render_text(title_text, 32, self.WHITE)
         self.screen.blit(title, (self.screen.get_width() // 2 - title.get_width() // 2, 70))
         
         # Player info
-        credits_text = self.normal_font.render(f"Credits: {self.player.credits}", True, self.WHITE)
+        credits_text = fonts.render_text(f"Credits: {self.player.credits}", 24, self.WHITE)
         self.screen.blit(credits_text, (70, 110))
         
-        cargo_text = self.normal_font.render(f"Cargo Space: {self.player.get_cargo_space_remaining()} / {self.player.cargo_capacity} units", True, self.WHITE)
+        cargo_text = fonts.render_text(f"Cargo Space: {self.player.get_cargo_space_remaining()} / {self.player.cargo.capacity} units", 24, self.WHITE)
         self.screen.blit(cargo_text, (300, 110))
         
         # Column headers
         pygame.draw.line(self.screen, self.GRAY, (70, 145), (self.screen.get_width() - 70, 145), 1)
         
-        headers = ["Commodity", "Buy Price", "Sell Price", "Available", "In Cargo", "Trend"]
-        header_widths = [0.35, 0.15, 0.15, 0.15, 0.1, 0.1]  # Proportions of total width
-        total_width = self.screen.get_width() - 140
-        
-        for i, header in enumerate(headers):
-            pos_x = 70 + sum(header_widths[:i]) * total_width
-            width = header_widths[i] * total_width
-            
-            header_text = self.small_font.render(header, True, self.YELLOW)
-            self.screen.blit(header_text, (pos_x, 125))
+        for header, column_x in zip(TRADE_HEADERS, self.trade_column_x):
+            header_text = fonts.render_text(header, 18, self.YELLOW)
+            self.screen.blit(header_text, (70 + column_x, 125))
         
         # Commodities list
         market = self.economy.get_system_market(self.player.current_system)
         
-        # Create clipping rect for scrollable area
+        # Scrollable area
         clip_rect = pygame.Rect(50, 150, self.screen.get_width() - 100, self.screen.get_height() - 300)
         pygame.draw.rect(self.screen, (20, 20, 40), clip_rect)
-        
-        # Apply clipping
-        original_clip = self.screen.get_clip()
-        self.screen.set_clip(clip_rect)
-        
-        # Draw items
-        for i, item in enumerate(market):
-            y_pos = 150 + i * 30 - self.trading_scroll_offset
-            
-            # Skip if off-screen
-            if y_pos < 150 - 30 or y_pos > self.screen.get_height() - 300 + 30:
-                continue
-            
-            # Highlight selected item
-            if i == self.selected_commodity:
-                pygame.draw.rect(self.screen, (40, 40, 80), 
-                               (70, y_pos, self.screen.get_width() - 140, 25))
-            
-            # Item details
-            commodity = item['commodity']
-            
-            # Get quantity in player's cargo
-            in_cargo = self.player.cargo.get(commodity.name, 0)
-            
-            # Get price trend
-            trend = self.economy.get_price_trend(commodity.name)
-            
-            # Columns
-            columns = [
-                commodity.name,
-                f"{item['buy_price']}",
-                f"{item['sell_price']}",
-                f"{item['quantity']}",
-                f"{in_cargo}",
-                trend
-            ]
-            
-            # Draw each column
-            for j, column in enumerate(columns):
-                pos_x = 70 + sum(header_widths[:j]) * total_width
-                width = header_widths[j] * total_width
-                
-                # Color based on content
-                if j == 0:  # Commodity name
-                    if commodity.illegal:
-                        color = self.RED  # Red for illegal goods
-                    else:
-                        color = self.WHITE
-                elif j == 1:  # Buy price
-                    color = self.YELLOW
-                elif j == 2:  # Sell price
-                    color = self.GREEN
-                elif j == 5:  # Trend
-                    if trend == "↑":
-                        color = self.GREEN
-                    elif trend == "↓":
-                        color = self.RED
-                    else:
-                        color = self.WHITE
-                else:
-                    color = self.WHITE
-                
-                text = self.small_font.render(column, True, color)
-                self.screen.blit(text, (pos_x, y_pos + 5))
-        
-        # Reset clipping
-        self.screen.set_clip(original_clip)
+        self.trading_list.render(self.screen, market, self.trading_scroll_offset)
         
         # Draw buttons
         for button in self.buttons:
@@ -778,7 +745,7 @@ class UI:
                 pygame.draw.rect(self.screen, (40, 40, 80), button['rect'])
                 pygame.draw.rect(self.screen, self.GRAY, button['rect'], 1)
                 
-                text = self.normal_font.render(button['text'], True, self.WHITE)
+                text = fonts.render_text(button['text'], 24, self.WHITE)
                 text_x = button['rect'].x + (button['rect'].width - text.get_width()) // 2
                 text_y = button['rect'].y + (button['rect'].height - text.get_height()) // 2
                 self.screen.blit(text, (text_x, text_y))
@@ -793,16 +760,43 @@ class UI:
             pygame.draw.rect(self.screen, self.GRAY, details_rect, 1)
             
             # Commodity information
-            name_text = self.normal_font.render(commodity.name, True, self.WHITE)
+            name_text = fonts.render_text(commodity.name, 24, self.WHITE)
             self.screen.blit(name_text, (80, self.screen.get_height() - 125))
             
-            category_text = self.small_font.render(f"Category: {commodity.category}", True, self.LIGHT_GRAY)
+            category_text = fonts.render_text(f"Category: {commodity.category}", 18, self.LIGHT_GRAY)
             self.screen.blit(category_text, (80, self.screen.get_height() - 100))
             
             if commodity.illegal:
-                illegal_text = self.small_font.render("ILLEGAL GOOD", True, self.RED)
+                illegal_text = fonts.render_text("ILLEGAL GOOD", 18, self.RED)
                 self.screen.blit(illegal_text, (300, self.screen.get_height() - 100))
     
+    def trade_row_key(self, index, item):
+        """Get everything a trading list row's looks depend on"""
+        commodity_name = item['commodity'].name
+        return (commodity_name, self.economy.market_version, self.player.cargo.get(commodity_name, 0),
+                index == self.selected_commodity)
+    
+    def draw_trade_row(self, index, item):
+        """Draw one row of the trading list"""
+        commodity = item['commodity']
+        surface = pygame.Surface((self.trading_list.rect.width, 25))
+        
+        # Highlight selected item
+        surface.fill((40, 40, 80) if index == self.selected_commodity else (20, 20, 40))
+        
+        trend = commodity.get_trend()
+        columns = [
+            (commodity.name, self.RED if commodity.illegal else self.WHITE),  # Red for illegal goods
+            (f"{item['buy_price']}", self.YELLOW),
+            (f"{item['sell_price']}", self.GREEN),
+            (f"{item['quantity']}", self.WHITE),
+            (f"{self.player.cargo.get(commodity.name, 0)}", self.WHITE),
+            (trend, {"↑": self.GREEN, "↓": self.RED}.get(trend, self.WHITE))
+        ]
+        for column_x, (column, color) in zip(self.trade_column_x, columns):
+            surface.blit(fonts.render_text(column, 18, color), (column_x, 5))
+        return surface
+    
     def render_upgrade_interface(self):
         """Render the ship upgrade interface"""
         # Background overlay
@@ -817,49 +811,49 @@ class UI:
         pygame.draw.rect(self.screen, self.GRAY, panel_rect, 2)
         
         # Title
-        title = self.header_font.render("Ship Upgrades", True, self.WHITE)
+        title = fonts.render_text("Ship Upgrades", 32, self.WHITE)
         self.screen.blit(title, (self.screen.get_width() // 2 - title.get_width() // 2, 70))
         
         # Credits display
-        credits_text = self.normal_font.render(f"Available Credits: {self.player.credits}", True, self.WHITE)
+        credits_text = fonts.render_text(f"Available Credits: {self.player.credits}", 24, self.WHITE)
         self.screen.blit(credits_text, (70, 110))
         
         # Current ship stats
-        stats_title = self.normal_font.render("Current Ship Statistics:", True, self.YELLOW)
+        stats_title = fonts.render_text("Current Ship Statistics:", 24, self.YELLOW)
         self.screen.blit(stats_title, (70, 150))
         
         # Engine
-        engine_level = self.normal_font.render(f"Engine Level: {self.player.engine_level}", True, self.WHITE)
+        engine_level = fonts.render_text(f"Engine Level: {self.player.engine_level}", 24, self.WHITE)
         self.screen.blit(engine_level, (70, 180))
-        engine_stats = self.small_font.render(f"Thrust: {self.player.thrust:.1f} | Max Speed: {self.player.max_speed:.1f}", True, self.LIGHT_GRAY)
+        engine_stats = fonts.render_text(f"Thrust: {self.player.thrust:.1f} | Max Speed: {self.player.max_speed:.1f}", 18, self.LIGHT_GRAY)
         self.screen.blit(engine_stats, (70, 205))
         
         # Weapons
-        weapon_level = self.normal_font.render(f"Weapon Level: {self.player.weapon_level}", True, self.WHITE)
+        weapon_level = fonts.render_text(f"Weapon Level: {self.player.weapon_level}", 24, self.WHITE)
         self.screen.blit(weapon_level, (70, 235))
-        weapon_stats = self.small_font.render(f"Damage: {self.player.weapon_damage:.1f} | Cooldown: {self.player.weapon_cooldown_max:.2f}s", True, self.LIGHT_GRAY)
+        weapon_stats = fonts.render_text(f"Damage: {self.player.weapon_damage:.1f} | Cooldown: {self.player.weapon_cooldown_max:.2f}s", 18, self.LIGHT_GRAY)
         self.screen.blit(weapon_stats, (70, 260))
         
         # Shields
-        shield_level = self.normal_font.render(f"Shield Level: {self.player.shield_level}", True, self.WHITE)
+        shield_level = fonts.render_text(f"Shield Level: {self.player.shield_level}", 24, self.WHITE)
         self.screen.blit(shield_level, (70, 290))
-        shield_stats = self.small_font.render(f"Capacity: {self.player.max_shield}", True, self.LIGHT_GRAY)
+        shield_stats = fonts.render_text(f"Capacity: {self.player.max_shield}", 18, self.LIGHT_GRAY)
         self.screen.blit(shield_stats, (70, 315))
         
         # Cargo
-        cargo_level = self.normal_font.render(f"Cargo Level: {self.player.cargo_level}", True, self.WHITE)
+        cargo_level = fonts.render_text(f"Cargo Level: {self.player.cargo_level}", 24, self.WHITE)
         self.screen.blit(cargo_level, (70, 345))
-        cargo_stats = self.small_font.render(f"Capacity: {self.player.cargo_capacity} units", True, self.LIGHT_GRAY)
+        cargo_stats = fonts.render_text(f"Capacity: {self.player.cargo.capacity} units", 18, self.LIGHT_GRAY)
         self.screen.blit(cargo_stats, (70, 370))
         
         # Sensors
-        sensor_level = self.normal_font.render(f"Sensor Level: {self.player.sensor_level}", True, self.WHITE)
+        sensor_level = fonts.render_text(f"Sensor Level: {self.player.sensor_level}", 24, self.WHITE)
         self.screen.blit(sensor_level, (70, 400))
-        sensor_stats = self.small_font.render(f"Range: {self.player.trade_range:.1f}", True, self.LIGHT_GRAY)
+        sensor_stats = fonts.render_text(f"Range: {self.player.trade_range:.1f}", 18, self.LIGHT_GRAY)
         self.screen.blit(sensor_stats, (70, 425))
         
         # Upgrade costs
-        upgrade_title = self.normal_font.render("Available Upgrades:", True, self.YELLOW)
+        upgrade_title = fonts.render_text("Available Upgrades:", 24, self.YELLOW)
         self.screen.blit(upgrade_title, (self.screen.get_width() - 400, 150))
         
         # Upgrade costs based on current level
@@ -897,7 +891,7 @@ class UI:
                 
                 # Check if max level
                 if current_level >= 5:  # Max level is 5
-                    text = self.normal_font.render(f"{button['text']} (MAX)", True, self.GRAY)
+                    text = fonts.render_text(f"{button['text']} (MAX)", 24, self.GRAY)
                     pygame.draw.rect(self.screen, (60, 60, 80), button['rect'])
                 else:
                     # Get cost for next level
@@ -905,10 +899,10 @@ class UI:
                     
                     # Check if can afford
                     if self.player.credits >= cost:
-                        text = self.normal_font.render(f"{button['text']} ({cost} cr)", True, self.WHITE)
+                        text = fonts.render_text(f"{button['text']} ({cost} cr)", 24, self.WHITE)
                         pygame.draw.rect(self.screen, (60, 60, 100), button['rect'])
                     else:
-                        text = self.normal_font.render(f"{button['text']} ({cost} cr)", True, self.GRAY)
+                        text = fonts.render_text(f"{button['text']} ({cost} cr)", 24, self.GRAY)
                         pygame.draw.rect(self.screen, (60, 60, 80), button['rect'])
                 
                 pygame.draw.rect(self.screen, self.GRAY, button['rect'], 1)
@@ -925,13 +919,13 @@ class UI:
                 pygame.draw.rect(self.screen, (60, 30, 30), button['rect'])
                 pygame.draw.rect(self.screen, self.GRAY, button['rect'], 1)
                 
-                text = self.normal_font.render(button['text'], True, self.WHITE)
+                text = fonts.render_text(button['text'], 24, self.WHITE)
                 text_x = button['rect'].x + (button['rect'].width - text.get_width()) // 2
                 text_y = button['rect'].y + (button['rect'].height - text.get_height()) // 2
                 self.screen.blit(text, (text_x, text_y))
                 
         # Upgrade benefits explanation
-        benefits_title = self.normal_font.render("Upgrade Benefits:", True, self.YELLOW)
+        benefits_title = fonts.render_text("Upgrade Benefits:", 24, self.YELLOW)
         self.screen.blit(benefits_title, (70, 470))
         
         benefits = [
@@ -943,7 +937,7 @@ class UI:
         ]
         
         for i, benefit in enumerate(benefits):
-            text = self.small_font.render(benefit, True, self.LIGHT_GRAY)
+            text = fonts.render_text(benefit, 18, self.LIGHT_GRAY)
             self.screen.blit(text, (70, 500 + i * 25))
     
     def render_galaxy_map(self):
@@ -959,7 +953,7 @@ class UI:
             pygame.draw.line(self.screen, (20, 30, 40), (0, y), (self.screen.get_width(), y))
         
         # Title
-        title = self.header_font.render("Galaxy Map", True, self.WHITE)
+        title = fonts.render_text("Galaxy Map", 32, self.WHITE)
         self.screen.blit(title, (self.screen.get_width() // 2 - title.get_width() // 2, 20))
         
         # Get all explored systems
@@ -973,7 +967,7 @@ class UI:
         pygame.draw.rect(self.screen, (0, 0, 0, 150), legend_rect)
         pygame.draw.rect(self.screen, self.GRAY, legend_rect, 1)
         
-        legend_title = self.small_font.render("Legend", True, self.WHITE)
+        legend_title = fonts.render_text("Legend", 18, self.WHITE)
         self.screen.blit(legend_title, (25, self.screen.get_height() - 195))
         
         # System types
@@ -989,17 +983,17 @@ class UI:
         y_offset = self.screen.get_height() - 175
         for system_type, color in system_types.items():
             pygame.draw.circle(self.screen, color, (35, y_offset), 5)
-            type_text = self.small_font.render(system_type, True, self.WHITE)
+            type_text = fonts.render_text(system_type, 18, self.WHITE)
             self.screen.blit(type_text, (50, y_offset - 8))
             y_offset += 20
         
         # Instructions
-        instructions = self.small_font.render("Click on a system for details", True, self.LIGHT_GRAY)
+        instructions = fonts.render_text("Click on a system for details", 18, self.LIGHT_GRAY)
         self.screen.blit(instructions, (20, self.screen.get_height() - 25))
         
         # Current system highlight
         if self.player.current_system and self.player.current_system.explored:
-            current_text = self.normal_font.render(f"Current System: {self.player.current_system.name}", True, self.WHITE)
+            current_text = fonts.render_text(f"Current System: {self.player.current_system.name}", 24, self.WHITE)
             self.screen.blit(current_text, (self.screen.get_width() // 2 - current_text.get_width() // 2, 60))
         
         # Close button
@@ -1007,7 +1001,7 @@ class UI:
         pygame.draw.rect(self.screen, (40, 40, 80), close_rect)
         pygame.draw.rect(self.screen, self.GRAY, close_rect, 1)
         
-        close_text = self.normal_font.render("Close", True, self.WHITE)
+        close_text = fonts.render_text("Close", 24, self.WHITE)
         self.screen.blit(close_text, (self.screen.get_width() - 60 - close_text.get_width() // 2, 25))
     
     def render_game_over(self):
@@ -1019,13 +1013,13 @@ class UI:
         self.screen.blit(overlay, (0, 0))
         
         # Game over message
-        game_over = self.title_font.render("GAME OVER", True, self.RED)
+        game_over = fonts.render_text("GAME OVER", 48, self.RED)
         self.screen.blit(game_over, (self.screen.get_width() // 2 - game_over.get_width() // 2, 
                                    self.screen.get_height() // 2 - 100))
         
         # Score display (would be calculated based on game progress)
         score = 10000  # Example score
-        score_text = self.header_font.render(f"Final Score: {score}", True, self.WHITE)
+        score_text = fonts.render_text(f"Final Score: {score}", 32, self.WHITE)
         self.screen.blit(score_text, (self.screen.get_width() // 2 - score_text.get_width() // 2, 
                                    self.screen.get_height() // 2 - 40))
         
@@ -1034,7 +1028,7 @@ class UI:
         pygame.draw.rect(self.screen, (40, 40, 80), restart_rect)
         pygame.draw.rect(self.screen, self.GRAY, restart_rect, 2)
         
-        restart_text = self.normal_font.render("Restart Game", True, self.WHITE)
+        restart_text = fonts.render_text("Restart Game", 24, self.WHITE)
         self.screen.blit(restart_text, (self.screen.get_width() // 2 - restart_text.get_width() // 2, 
                                       self.screen.get_height() // 2 + 30))
         
@@ -1043,6 +1037,6 @@ class UI:
         pygame.draw.rect(self.screen, (40, 40, 80), quit_rect)
         pygame.draw.rect(self.screen, self.GRAY, quit_rect, 2)
         
-        quit_text = self.normal_font.render("Quit to Menu", True, self.WHITE)
+        quit_text = fonts.render_text("Quit to Menu", 24, self.WHITE)
         self.screen.blit(quit_text, (self.screen.get_width() // 2 - quit_text.get_width() // 2, 
                                    self.screen.get_height() // 2 + 90))
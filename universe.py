@@ -2,7 +2,16 @@ import pygame
 import random
 import math
 import names
-from entities import Planet, SpaceStation, WarpGate, Asteroid, EnemyShip
+import numpy as np
+import fonts
+from renderer import LAYER_LABELS
+from spatial import SpatialHash
+from entities import Planet, SpaceStation, WarpGate, EnemyShip
+from asteroids import AsteroidField, ASTEROID_TYPES
+from fleet import Fleet
+from ai import ThinkScheduler
+from registry import EntityRegistry
+from triggers import TriggerSystem, ZONE_TRADE, ZONE_GATE, GATE_TRIGGER_RADIUS
 
 # Constants
 SCREEN_WIDTH = 1024
@@ -31,9 +40,23 @@ class StarSystem:
         # Reference to parent universe
         self.universe = universe
         
-        # Entities in this system
-        self.entities = []
-        self.warp_gates = []
+        # Entities in this system, partitioned by type
+        self.entities = EntityRegistry()
+        
+        # Spatial index over entities, kept up to date as they move
+        self.spatial_index = SpatialHash()
+        
+        # Trade and warp gate zones the player can fly into
+        self.triggers = TriggerSystem()
+        
+        # Asteroids are stored separately as one struct-of-arrays field
+        self.asteroid_field = AsteroidField()
+        
+        # Enemy ship kinematics, steered together
+        self.fleet = Fleet()
+        
+        # Enemy ship decisions, time-sliced across frames
+        self.think_scheduler = ThinkScheduler(self.fleet)
         
         # The main celestial body (planet or station)
         self.main_entity = None
@@ -87,7 +110,7 @@ class StarSystem:
             )
         
         # Add main entity to the system
-        self.entities.append(self.main_entity)
+        self.add_entity(self.main_entity)
         
         # Create warp gates at cardinal directions (N,E,S,W) only if we have a neighboring system
         gate_distance = 1200  # Distance from center to warp gates
@@ -101,8 +124,7 @@ class StarSystem:
                 "North",
                 None  # Will set the destination later once all systems are created
             )
-            self.warp_gates.append(north_gate)
-            self.entities.append(north_gate)
+            self.add_entity(north_gate)
         
         # East gate (only if not at right edge)
         if self.grid_x < self.universe.width - 1:
@@ -112,8 +134,7 @@ class StarSystem:
                 "East",
                 None
             )
-            self.warp_gates.append(east_gate)
-            self.entities.append(east_gate)
+            self.add_entity(east_gate)
         
         # South gate (only if not at bottom edge)
         if self.grid_y < self.universe.height - 1:
@@ -123,8 +144,7 @@ class StarSystem:
                 "South",
                 None
             )
-            self.warp_gates.append(south_gate)
-            self.entities.append(south_gate)
+            self.add_entity(south_gate)
         
         # West gate (only if not at left edge)
         if self.grid_x > 0:
@@ -134,42 +154,11 @@ class StarSystem:
                 "West",
                 None
             )
-            self.warp_gates.append(west_gate)
-            self.entities.append(west_gate)
+            self.add_entity(west_gate)
         
         # Add asteroids
         num_asteroids = random.randint(5, 20)
-        for _ in range(num_asteroids):
-            # Random position (avoiding center and gate paths)
-            while True:
-                # Random angle and distance from center
-                angle = random.uniform(0, 2 * math.pi)
-                distance = random.uniform(100, 350)
-                
-                # Calculate position
-                x = SCREEN_WIDTH // 2 + math.cos(angle) * distance
-                y = SCREEN_HEIGHT // 2 + math.sin(angle) * distance
-                
-                # Check if position is too close to gates (avoid main paths)
-                too_close = False
-                for gate in self.warp_gates:
-                    gate_angle = math.atan2(gate.y - SCREEN_HEIGHT // 2, gate.x - SCREEN_WIDTH // 2)
-                    angle_diff = abs((angle - gate_angle + math.pi) % (2 * math.pi) - math.pi)
-                    if angle_diff < 0.5:  # Within ~30 degrees of gate path
-                        too_close = True
-                        break
-                
-                if not too_close:
-                    break
-            
-            # Create asteroid
-            asteroid = Asteroid(
-                x, y,
-                random.randint(5, 20),  # Size
-                random.uniform(0, 2 * math.pi),  # Rotation
-                random.choice(["Iron", "Ice", "Carbon", "Precious"])  # Type
-            )
-            self.entities.append(asteroid)
+        self.generate_asteroids(num_asteroids)
         
         # Add enemy ships based on danger level
         num_enemies = random.randint(0, self.danger_level // 2)
@@ -187,7 +176,67 @@ class StarSystem:
                 random.choice(["Pirate", "Trader", "Police", "Military"]),  # Type
                 random.randint(1, self.danger_level)  # Level
             )
-            self.entities.append(enemy)
+            self.add_entity(enemy)
+    
+    def generate_asteroids(self, num_asteroids):
+        """Scatter asteroids around the center, avoiding the warp gate paths"""
+        rng = np.random.default_rng(random.getrandbits(32))
+        
+        # Directions of the gate paths from the center
+        gate_angles = np.array([math.atan2(gate.y - SCREEN_HEIGHT // 2, gate.x - SCREEN_WIDTH // 2)
+                                for gate in self.entities.of_type("WarpGate")])
+        
+        # Draw candidate positions in batches until enough are clear of the gate paths
+        angles = np.empty(0)
+        while len(angles) < num_asteroids:
+            candidates = rng.uniform(0, 2 * math.pi, num_asteroids * 2)
+            if len(gate_angles):
+                angle_diff = np.abs((candidates[:, None] - gate_angles[None, :] + math.pi) % (2 * math.pi) - math.pi)
+                candidates = candidates[(angle_diff >= 0.5).all(axis=1)]  # Keep out of ~30 degrees of gate paths
+            angles = np.concatenate((angles, candidates))
+        angles = angles[:num_asteroids]
+        
+        # Random distance from center
+        distances = rng.uniform(100, 350, num_asteroids)
+        
+        self.asteroid_field.add_many(
+            SCREEN_WIDTH // 2 + np.cos(angles) * distances,
+            SCREEN_HEIGHT // 2 + np.sin(angles) * distances,
+            rng.integers(5, 21, num_asteroids),  # Size
+            rng.uniform(0, 2 * math.pi, num_asteroids),  # Rotation
+            rng.integers(0, len(ASTEROID_TYPES), num_asteroids),  # Type
+            rng
+        )
+    
+    def add_entity(self, entity):
+        """Add an entity to this system"""
+        self.entities.add(entity)
+        self.spatial_index.insert(entity)
+        if isinstance(entity, EnemyShip):
+            self.fleet.add(entity)
+        
+        # Zones are registered once, here, rather than searched for every frame
+        if isinstance(entity, (Planet, SpaceStation)) and entity.can_trade:
+            self.triggers.add(entity, ZONE_TRADE)
+        elif isinstance(entity, WarpGate):
+            self.triggers.add(entity, ZONE_GATE, GATE_TRIGGER_RADIUS)
+    
+    def remove_entity(self, entity):
+        """Remove an entity from this system at the end of the tick (see flush_removed)"""
+        self.entities.remove(entity)
+    
+    def warm_textures(self):
+        """Generate (or load) the textures of the system's planet or station ahead of its first frame"""
+        for entity in self.entities.of_types("Planet", "SpaceStation"):
+            entity.surface
+    
+    def flush_removed(self):
+        """Apply the removals requested during this tick"""
+        for entity in self.entities.flush():
+            self.spatial_index.remove(entity)
+            self.triggers.remove(entity)
+            if isinstance(entity, EnemyShip):
+                self.fleet.remove(entity)
     
     def connect_warp_gates(self):
         """Connect warp gates to neighboring systems"""
@@ -198,7 +247,7 @@ class StarSystem:
         # North gate connects to system with grid_y - 1
         if self.grid_y > 0:
             # Find the North gate
-            for gate in self.warp_gates:
+            for gate in self.entities.of_type("WarpGate"):
                 if gate.direction == "North":
                     north_system = self.universe.get_system(self.grid_x, self.grid_y - 1)
                     gate.destination = north_system
@@ -207,7 +256,7 @@ class StarSystem:
         # East gate connects to system with grid_x + 1
         if self.grid_x < self.universe.width - 1:
             # Find the East gate
-            for gate in self.warp_gates:
+            for gate in self.entities.of_type("WarpGate"):
                 if gate.direction == "East":
                     east_system = self.universe.get_system(self.grid_x + 1, self.grid_y)
                     gate.destination = east_system
@@ -216,7 +265,7 @@ class StarSystem:
         # South gate connects to system with grid_y + 1
         if self.grid_y < self.universe.height - 1:
             # Find the South gate
-            for gate in self.warp_gates:
+            for gate in self.entities.of_type("WarpGate"):
                 if gate.direction == "South":
                     south_system = self.universe.get_system(self.grid_x, self.grid_y + 1)
                     gate.destination = south_system
@@ -225,7 +274,7 @@ class StarSystem:
         # West gate connects to system with grid_x - 1
         if self.grid_x > 0:
             # Find the West gate
-            for gate in self.warp_gates:
+            for gate in self.entities.of_type("WarpGate"):
                 if gate.direction == "West":
                     west_system = self.universe.get_system(self.grid_x - 1, self.grid_y)
                     gate.destination = west_system
@@ -233,20 +282,46 @@ class StarSystem:
     
     def update(self, delta_time, player=None):
         """Update all entities in this system"""
-        for entity in self.entities:
-            if hasattr(entity, 'update'):
-                entity.update(delta_time, player)
+        # Enemy ships move together as a fleet, then a few of them make decisions
+        self.fleet.update(delta_time, player)
+        self.think_scheduler.update(delta_time, player)
+        
+        # Bodies and gates only turn and pulse in place
+        for entity in self.entities.of_types("Planet", "SpaceStation", "WarpGate"):
+            entity.update(delta_time, player)
+        
+        # Keep the spatial index in sync with ship movement
+        for ship in self.entities.of_type("EnemyShip"):
+            self.spatial_index.update(ship)
+        
+        # Update the whole asteroid field at once
+        self.asteroid_field.update(delta_time)
     
-    def render(self, screen, player):
-        """Render all entities in this system"""
-        for entity in self.entities:
-            if hasattr(entity, 'render'):
-                entity.render(screen, player.x, player.y)
+    def render(self, render_queue, player, alpha=1.0):
+        """Submit entities near the camera (the player's interpolated position) to the render queue
+        
+        Ships and asteroids are drawn a fraction alpha of the way through their last step.
+        """
+        camera_x = player.view_x
+        camera_y = player.view_y
+        self.fleet.interpolate(alpha)
+        
+        # Only entities whose center is on screen (with some margin) are considered
+        half_width = render_queue.get_width() // 2
+        half_height = render_queue.get_height() // 2
+        visible = self.spatial_index.query_rect(
+            camera_x - half_width - 100, camera_y - half_height - 100,
+            camera_x + half_width + 100, camera_y + half_height + 100)
+        
+        for entity in visible:
+            entity.render(render_queue, camera_x, camera_y)
+        
+        # Asteroids are culled and drawn by their field
+        self.asteroid_field.render(render_queue, camera_x, camera_y, alpha)
         
         # Render system name
-        font = pygame.font.SysFont(None, 24)
-        name_text = font.render(self.name, True, (200, 200, 200))
-        screen.blit(name_text, (10, 10))
+        name_text = fonts.render_text(self.name, 24, (200, 200, 200))
+        render_queue.submit(name_text, (10, 10), LAYER_LABELS)
         
         # Render system info
         #info_text = font.render(f"Type: {self.system_type} | Faction: {self.faction} | Tech: {self.tech_level}", 
@@ -292,15 +367,15 @@ class Universe:
             return self.systems.get((x, y))
         return None
     
-    def update_current_system(self, current_system, delta_time):
+    def update_current_system(self, current_system, delta_time, player=None):
         """Update only the current system the player is in"""
         if current_system:
-            current_system.update(delta_time)
+            current_system.update(delta_time, player)
     
-    def render_current_system(self, screen, player):
+    def render_current_system(self, render_queue, player, alpha=1.0):
         """Render only the current system the player is in"""
         if player.current_system:
-            player.current_system.render(screen, player)
+            player.current_system.render(render_queue, player, alpha)
     
     def render_galaxy_map(self, screen, current_system):
         """Render the galaxy map showing all systems"""
@@ -357,6 +432,5 @@ class Universe:
                     pygame.draw.circle(screen, (255, 255, 255), (system.map_x, system.map_y), 10, 2)
                 
                 # Draw system name
-                font = pygame.font.SysFont(None, 16)
-                name_text = font.render(system.name, True, (200, 200, 200))
+                name_text = fonts.render_text(system.name, 16, (200, 200, 200))
                 screen.blit(name_text, (system.map_x - name_text.get_width() // 2, system.map_y + 10))
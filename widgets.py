@@ -0,0 +1,197 @@
+import pygame
+import fonts
+
+"""
+Retained-mode UI widgets.
+
+Each widget is bound to a function that returns the value it shows and
+keeps the surface it last drew for that value. It is only drawn again when
+the bound value changes, so a screen made of widgets costs one comparison
+and one blit per widget on a frame where nothing changed. A WidgetLayer
+composites its widgets from their cached surfaces and counts how many had
+to be redrawn.
+"""
+
+class Widget:
+    """A UI element drawn once per distinct value of what it is bound to"""
+    def __init__(self, pos, bind, draw, align="left", visible=None, alpha=None):
+        self.pos = pos
+        self.bind = bind  # Returns the value shown
+        self.draw = draw  # Returns a surface showing a value
+        self.align = align  # Which point of the surface pos is: "left", "center" or "right" of its top edge
+        self.visible = visible  # Returns whether the widget is shown (always when None)
+        self.alpha = alpha  # Returns the widget's opacity each frame (opaque when None)
+        
+        # Last value drawn and its surface
+        self.value = None
+        self.surface = None
+        self.dest = pos
+    
+    def refresh(self):
+        """Draw the widget again if its bound value changed and return whether it did"""
+        value = self.bind()
+        if self.surface is not None and value == self.value:
+            return False
+        
+        self.value = value
+        self.surface = self.draw(value)
+        
+        # Line the new surface up with the anchor
+        x, y = self.pos
+        if self.align == "center":
+            x -= self.surface.get_width() // 2
+        elif self.align == "right":
+            x -= self.surface.get_width()
+        self.dest = (x, y)
+        return True
+
+class Label(Widget):
+    """Text, optionally on a padded box with a border"""
+    def __init__(self, pos, bind, size, color, background=None, border=None, padding=(0, 0), **kwargs):
+        super().__init__(pos, bind, self.draw_text, **kwargs)
+        self.size = size
+        self.color = color
+        self.background = background
+        self.border = border
+        self.padding = padding
+    
+    def draw_text(self, value):
+        """Draw the value as text on the label's box"""
+        text = fonts.render_text(str(value), self.size, self.color)
+        if self.background is None and self.border is None:
+            # The text cache's surface is shared, so fade a copy
+            return text.copy() if self.alpha else text
+        
+        pad_x, pad_y = self.padding
+        surface = pygame.Surface((text.get_width() + pad_x * 2, text.get_height() + pad_y * 2), pygame.SRCALPHA)
+        if self.background is not None:
+            surface.fill(self.background)
+        surface.blit(text, (pad_x, pad_y))
+        if self.border is not None:
+            pygame.draw.rect(surface, self.border, surface.get_rect(), 1)
+        return surface
+
+class Bar(Widget):
+    """Horizontal bar filled to a fraction, redrawn only when the fill moves by a pixel"""
+    def __init__(self, pos, size, bind, color, background, **kwargs):
+        width = size[0]
+        super().__init__(pos, lambda: int(width * min(1, max(0, bind()))), self.draw_bar, **kwargs)
+        self.size = size
+        self.color = color  # Fill color, or a function of the filled fraction
+        self.background = background
+    
+    def draw_bar(self, value):
+        """Draw the bar filled to a width in pixels"""
+        width, height = self.size
+        surface = pygame.Surface(self.size)
+        surface.fill(self.background)
+        
+        color = self.color(value / width) if callable(self.color) else self.color
+        surface.fill(color, (0, 0, value, height))
+        return surface
+
+class Number(Widget):
+    """A caption followed by a frequently changing number drawn from cached digit glyphs"""
+    def __init__(self, pos, caption, bind, size, color, **kwargs):
+        super().__init__(pos, bind, self.draw_number, **kwargs)
+        self.caption = caption
+        self.size = size
+        self.color = color
+    
+    def draw_number(self, value):
+        """Draw the caption and the value (the digits are composed, never rasterized per value)"""
+        caption = fonts.render_text(self.caption, self.size, self.color)
+        text = str(value)
+        width, height = fonts.text_cache.number_size(text, self.size, self.color)
+        surface = pygame.Surface((caption.get_width() + width, max(caption.get_height(), height)), pygame.SRCALPHA)
+        surface.blit(caption, (0, 0))
+        fonts.blit_number(surface, text, (caption.get_width(), 0), self.size, self.color)
+        return surface
+
+class Static(Widget):
+    """Something that never changes, drawn once by a function returning its surface"""
+    def __init__(self, pos, draw, **kwargs):
+        super().__init__(pos, lambda: None, lambda value: draw(), **kwargs)
+
+class WidgetLayer:
+    """Widgets composited onto the screen from their cached surfaces, in order"""
+    def __init__(self):
+        self.widgets = []
+        self.redrawn = 0  # Widgets that had to be drawn again in the last render
+    
+    def add(self, widget):
+        """Add a widget on top of the others and return it"""
+        self.widgets.append(widget)
+        return widget
+    
+    def render(self, screen):
+        """Refresh the visible widgets and blit them all in one call"""
+        redrawn = 0
+        blits = []
+        for widget in self.widgets:
+            if widget.visible is not None and not widget.visible():
+                continue
+            
+            if widget.refresh():
+                redrawn += 1
+            if widget.alpha is not None:
+                widget.surface.set_alpha(widget.alpha())
+            blits.append((widget.surface, widget.dest))
+        
+        screen.blits(blits, doreturn=False)
+        self.redrawn = redrawn
+    
+    def get_stats(self):
+        """Get the number of widgets and how many were redrawn in the last render"""
+        return {'widgets': len(self.widgets), 'redrawn': self.redrawn}
+
+class VirtualList:
+    """Scrolling list that only draws the rows in view, each from a cached surface
+    
+    row_key(index, item) returns everything a row's looks depend on; a row is
+    drawn again by draw_row(index, item) only when its key changes. Rows that
+    scroll out of view are forgotten.
+    """
+    def __init__(self, rect, row_height, row_key, draw_row):
+        self.rect = pygame.Rect(rect)
+        self.row_height = row_height
+        self.row_key = row_key
+        self.draw_row = draw_row
+        self.rows = {}  # Row key -> surface, for the rows in view last render
+        self.items = None  # Item list the cached rows were drawn from
+        self.redrawn = 0  # Rows that had to be drawn again in the last render
+    
+    def visible_range(self, count, scroll):
+        """Get the first and one-past-last index of the rows in view"""
+        first = max(0, scroll // self.row_height)
+        last = min(count, (scroll + self.rect.height) // self.row_height + 1)
+        return first, last
+    
+    def render(self, screen, items, scroll):
+        """Blit the rows in view, scrolled down by a number of pixels"""
+        # A different list (another market, or one rebuilt) shares nothing with the cached rows
+        if items is not self.items:
+            self.items = items
+            self.rows = {}
+        
+        redrawn = 0
+        rows = {}
+        blits = []
+        first, last = self.visible_range(len(items), scroll)
+        for index in range(first, last):
+            item = items[index]
+            key = self.row_key(index, item)
+            surface = self.rows.get(key)
+            if surface is None:
+                surface = self.draw_row(index, item)
+                redrawn += 1
+            rows[key] = surface
+            blits.append((surface, (self.rect.x, self.rect.y + index * self.row_height - scroll)))
+        
+        original_clip = screen.get_clip()
+        screen.set_clip(self.rect)
+        screen.blits(blits, doreturn=False)
+        screen.set_clip(original_clip)
+        
+        self.rows = rows
+        self.redrawn = redrawn